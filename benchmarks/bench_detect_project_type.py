@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark detect_project_type against the original rglob implementation.
+
+Usage: python benchmarks/bench_detect_project_type.py [DIR ...]
+
+With no arguments every top-level directory of the workspace is classified.
+Each directory is timed with both implementations and the per-repo results
+are printed as a table.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_utils import detect_project_type
+
+
+def legacy_detect_project_type(repo_path: Path) -> str:
+    """The rglob-based classifier that detect_project_type replaced."""
+    if not repo_path.exists():
+        return "Unknown"
+
+    files = list(repo_path.rglob("*"))
+    file_names = [f.name.lower() for f in files if f.is_file()]
+
+    if any(name in file_names for name in ['requirements.txt', 'setup.py', 'pyproject.toml', '__init__.py']):
+        return "Python"
+    if any(name in file_names for name in ['package.json', 'package-lock.json', 'yarn.lock']):
+        return "Node.js"
+    if any(name in file_names for name in ['composer.json', 'index.php', '.php']):
+        return "PHP"
+    if any(name in file_names for name in ['pom.xml', 'build.gradle', '.java']):
+        return "Java"
+    if any(name in file_names for name in ['index.html', 'index.htm', '.html', '.css', '.js']):
+        return "Web"
+    if any(name in file_names for name in ['.md', 'readme', 'docs']):
+        return "Documentation"
+    return "Unknown"
+
+
+def best_of(func, path: Path, repeat: int = 5):
+    """Return (result, best wall time in seconds) over ``repeat`` runs."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main() -> None:
+    root = Path(__file__).resolve().parents[1]
+    if len(sys.argv) > 1:
+        repos = [Path(arg) for arg in sys.argv[1:]]
+    else:
+        repos = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+    print(f"{'repository':<36} {'before ms':>10} {'after ms':>10} {'speedup':>8}  type (before -> after)")
+    total_before = total_after = 0.0
+    for repo in repos:
+        old_type, before = best_of(legacy_detect_project_type, repo)
+        new_type, after = best_of(detect_project_type, repo)
+        total_before += before
+        total_after += after
+        speedup = before / after if after else float('inf')
+        print(f"{repo.name:<36} {before * 1000:>10.3f} {after * 1000:>10.3f} {speedup:>7.1f}x  {old_type} -> {new_type}")
+    print(f"{'TOTAL':<36} {total_before * 1000:>10.3f} {total_after * 1000:>10.3f} "
+          f"{total_before / total_after if total_after else 0:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
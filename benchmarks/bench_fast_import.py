@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark the fast-import initial commit against git add + git commit.
+
+Usage: python benchmarks/bench_fast_import.py [--files N] [--repeat N] [--fixtures DIR]
+
+One synthetic project with about ``--files`` files (default 100k, 40% of
+them venv/node_modules noise) is generated, and each round gives two fresh
+copies of it an initial commit: once the way the orchestrator's commit
+stage does without fast-import (``git add .`` then ``git commit``, with
+the pruned directories excluded so both commits hold the same tree) and
+once through ``fast_import``, alternating which goes first. The first
+``git status`` afterwards is timed too, since it is where an incomplete
+index would be re-hashed. Both commits must produce the same tree. Dirty
+pages are synced before each timing, and the background ``gc --auto`` that
+``git commit`` would start is disabled, so neither method pays for the
+other's after-effects.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_workspace import generate
+from workspace_fastimport import fast_import
+from workspace_utils import SKIP_DIRS
+
+
+def git(path: Path, *args: str) -> str:
+    return subprocess.run(['git', *args], cwd=path, check=True, capture_output=True, text=True).stdout
+
+
+def timed(func) -> float:
+    # Flush the previous step's dirty pages so it isn't billed to this one
+    os.sync()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def fresh_copy(template: Path, target: Path) -> Path:
+    shutil.copytree(template, target, symlinks=True)
+    git(target, 'init', '-q')
+    return target
+
+
+def add_and_commit(project: Path) -> None:
+    exclude = project / '.git' / 'info' / 'exclude'
+    exclude.write_text(''.join(f'{name}/\n' for name in sorted(SKIP_DIRS - {'.git'})), encoding='utf-8')
+    git(project, 'add', '.')
+    # 60k loose objects would start a detached gc --auto that skews later timings
+    git(project, '-c', 'gc.auto=0', 'commit', '-q', '-m', 'Initial commit')
+
+
+METHODS = {
+    'add+commit': add_and_commit,
+    'fast-import': lambda project: fast_import(project, 'Initial commit'),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark fast-import against git add + commit')
+    parser.add_argument('--files', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=2,
+                        help='Rounds; the method that goes first alternates between rounds')
+    parser.add_argument('--fixtures', default=None, help='Directory for the generated template project')
+    args = parser.parse_args()
+
+    for variable, value in (('GIT_AUTHOR_NAME', 'Benchmark'), ('GIT_AUTHOR_EMAIL', 'bench@example.com'),
+                            ('GIT_COMMITTER_NAME', 'Benchmark'), ('GIT_COMMITTER_EMAIL', 'bench@example.com')):
+        os.environ.setdefault(variable, value)
+
+    base = Path(args.fixtures or tempfile.mkdtemp(prefix='bench_fast_import_'))
+    runs = base / 'runs'
+    try:
+        print(f"🛠️  Generating a project with ~{args.files} files in {base}")
+        workspace = generate(base / 'template', 1, args.files)
+        template = next(path for path in workspace.iterdir() if path.is_dir())
+
+        best = {method: (float('inf'), float('inf')) for method in METHODS}
+        trees = {}
+        files = 0
+        for round_index in range(args.repeat):
+            order = list(METHODS) if round_index % 2 == 0 else list(reversed(METHODS))
+            for method in order:
+                project = fresh_copy(template, runs / method.replace('+', '-'))
+                commit_seconds = timed(lambda: METHODS[method](project))
+                status_seconds = timed(lambda: git(project, 'status', '--porcelain'))
+                best[method] = (min(best[method][0], commit_seconds), min(best[method][1], status_seconds))
+                trees[method] = git(project, 'rev-parse', 'HEAD^{tree}')
+                files = len(git(project, 'ls-files', '-z').split('\0')) - 1
+                shutil.rmtree(project)
+
+        print(f"\n{'method':<12} {'commit (s)':>11} {'status (s)':>11}   (best of {args.repeat})")
+        for method, (commit_seconds, status_seconds) in best.items():
+            print(f"{method:<12} {commit_seconds:>11.2f} {status_seconds:>11.2f}")
+        speedup = best['add+commit'][0] / best['fast-import'][0]
+        print(f"\n📊 {files} files committed, {speedup:.1f}x faster with fast-import")
+        same_tree = len(set(trees.values())) == 1
+        print("✅ Identical trees" if same_tree else "❌ Trees differ")
+        if not same_tree:
+            sys.exit(1)
+    finally:
+        shutil.rmtree(runs, ignore_errors=True)
+        if args.fixtures is None:
+            shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
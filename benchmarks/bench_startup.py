@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Check cold-start time of cheap workspace CLI commands against a budget.
+
+Usage: python benchmarks/bench_startup.py [--budget-ms 100] [--runs 10]
+                                          [--baseline FILE] [--save-baseline FILE]
+                                          [-- COMMAND ARGS ...]
+
+The command (default: ``scan --cached``) is run repeatedly in fresh
+interpreters. The median wall time is compared with the budget, and one
+extra run under ``-X importtime`` lists the most expensive imports. With
+``--baseline`` any module that is new or noticeably slower than the stored
+baseline is reported as a regression. Exits with status 1 when over budget
+or when regressions are found.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CLI = ROOT / 'workspace.py'
+
+
+def time_command(command, runs: int) -> float:
+    """Return the median wall time of ``command`` in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def import_times(command) -> dict:
+    """Return cumulative import time in microseconds per module for one run."""
+    result = subprocess.run(
+        [command[0], '-X', 'importtime'] + command[1:],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def regressions(current: dict, baseline: dict, tolerance_us: int) -> list:
+    """Modules that are new, or slower than the baseline by more than the tolerance."""
+    found = []
+    for module, cumulative in current.items():
+        before = baseline.get(module)
+        if before is None:
+            found.append(f"new import {module} ({cumulative} us)")
+        elif cumulative - before > tolerance_us:
+            found.append(f"{module} slower: {before} us -> {cumulative} us")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Workspace CLI startup budget check')
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help='Imports to list')
+    parser.add_argument('--baseline', help='importtime baseline JSON to compare against')
+    parser.add_argument('--save-baseline', help='Write this run\'s import times to a JSON file')
+    parser.add_argument('--tolerance-us', type=int, default=2000,
+                        help='Allowed per-module slowdown before it counts as a regression')
+    parser.add_argument('args', nargs='*', default=['scan', '--cached'])
+    args = parser.parse_args()
+
+    command = [sys.executable, str(CLI)] + args.args
+    median_ms = time_command(command, args.runs)
+    times = import_times(command)
+
+    print(f"workspace {' '.join(args.args)}: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print("slowest imports (cumulative):")
+    for module, cumulative in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {cumulative / 1000:>8.2f} ms  {module}")
+
+    failed = median_ms > args.budget_ms
+    if failed:
+        print("OVER BUDGET")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        found = regressions(times, baseline, args.tolerance_us)
+        for message in found:
+            print(f"REGRESSION: {message}")
+        failed = failed or bool(found)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(times, indent=2, sort_keys=True), encoding='utf-8')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
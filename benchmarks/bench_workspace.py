@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the workspace tooling on synthetic workspaces.
+
+Usage: python benchmarks/bench_workspace.py [--scale tiny|small|medium|large]
+                                            [--fixtures DIR] [--repeat N]
+                                            [--output FILE] [--baseline FILE]
+
+A synthetic workspace of the chosen scale is generated (and reused on later
+runs from ``--fixtures``), then scanning, classification, task-list
+generation and a migration dry-run are timed. Results are written as JSON;
+with ``--baseline`` each timing is compared with a stored run and anything
+slower than ``--threshold`` times the baseline is reported as a regression
+(exit status 1).
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import workspace_utils
+from synthetic_workspace import SCALES, generate
+from workspace_index import INDEX_FILENAME, WorkspaceIndex
+
+
+def load_migrator():
+    """Import unified-workspace/tools/migrate_projects.py as a module."""
+    path = ROOT / 'unified-workspace' / 'tools' / 'migrate_projects.py'
+    spec = importlib.util.spec_from_file_location('migrate_projects', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def workspace_cwd(path: Path, argv):
+    """Run a script's main() from ``path`` with ``argv`` and silenced output."""
+    previous_cwd, previous_argv = os.getcwd(), sys.argv
+    os.chdir(path)
+    sys.argv = argv
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(previous_cwd)
+        sys.argv = previous_argv
+
+
+def best_of(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def reset_index(workspace: Path) -> None:
+    try:
+        os.unlink(workspace / INDEX_FILENAME)
+    except FileNotFoundError:
+        pass
+
+
+def run_suite(workspace: Path, repeat: int) -> dict:
+    """Time every benchmark against ``workspace``; return seconds per benchmark."""
+    import generate_task_lists
+    from push_all_projects import ProjectManager
+
+    migrator = load_migrator()
+    repos = workspace_utils.get_project_directories(workspace)
+    results = {}
+
+    def inventory_cold():
+        workspace_utils._INVENTORY_CACHE.clear()
+        workspace_utils.get_project_directories(workspace)
+
+    results['scan.get_project_directories'] = best_of(inventory_cold, repeat)
+    results['classify.detect_project_type'] = best_of(
+        lambda: [workspace_utils.detect_project_type(path) for path in repos], repeat
+    )
+    results['classify.classify_projects'] = best_of(
+        lambda: list(workspace_utils.classify_projects(repos, ordered=False)), repeat
+    )
+
+    def index_cold():
+        reset_index(workspace)
+        with WorkspaceIndex(workspace) as index:
+            index.refresh()
+
+    def index_warm():
+        with WorkspaceIndex(workspace) as index:
+            index.refresh()
+
+    results['scan.index_refresh_cold'] = best_of(index_cold, repeat)
+    results['scan.index_refresh_warm'] = best_of(index_warm, repeat)
+    results['scan.scan_projects'] = best_of(lambda: ProjectManager(workspace).scan_projects(), repeat)
+
+    def generate_cold():
+        with workspace_cwd(workspace, ['generate_task_lists.py', '--force']):
+            generate_task_lists.main()
+
+    def generate_incremental():
+        with workspace_cwd(workspace, ['generate_task_lists.py']):
+            generate_task_lists.main()
+
+    results['generate.task_lists_force'] = best_of(generate_cold, 1)
+    results['generate.task_lists_incremental'] = best_of(generate_incremental, repeat)
+
+    def migrate_dry_run():
+        with workspace_cwd(workspace, ['migrate_projects.py', '--source', str(workspace),
+                                       '--target', str(workspace / 'unified'), '--dry-run']):
+            migrator.main()
+
+    logging.disable(logging.INFO)
+    try:
+        results['migrate.dry_run'] = best_of(migrate_dry_run, repeat)
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float) -> list:
+    """Return human-readable regressions of ``results`` against ``baseline``.
+
+    A timing regresses when it exceeds ``threshold`` times the baseline and
+    is also at least ``min_delta`` seconds slower, so sub-millisecond jitter
+    on small fixtures is not reported.
+    """
+    regressions = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before and seconds > before * threshold and seconds - before >= min_delta:
+            regressions.append(f"{name}: {before * 1000:.1f} ms -> {seconds * 1000:.1f} ms "
+                               f"({seconds / before:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Workspace tooling benchmark suite')
+    parser.add_argument('--scale', choices=SCALES, default='tiny')
+    parser.add_argument('--fixtures', default=None,
+                        help='Directory holding generated workspaces (default: a temporary directory)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help='Write results JSON here')
+    parser.add_argument('--baseline', default=None, help='Results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown factor that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='Ignore slowdowns smaller than this many milliseconds')
+    args = parser.parse_args()
+
+    repos, files = SCALES[args.scale]
+    fixtures = Path(args.fixtures) if args.fixtures else Path(tempfile.mkdtemp(prefix='workspace-bench-'))
+    start = time.perf_counter()
+    workspace = generate(fixtures / args.scale, repos, files)
+    print(f"Fixture {args.scale} ({repos} repos, {files} files) ready in "
+          f"{time.perf_counter() - start:.1f} s at {workspace}")
+
+    results = run_suite(workspace, args.repeat)
+    for name, seconds in results.items():
+        print(f"  {name:<36} {seconds * 1000:>10.1f} ms")
+
+    report = {
+        'scale': args.scale,
+        'repos': repos,
+        'files': files,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline.get('scale') != args.scale:
+            print(f"Baseline scale {baseline.get('scale')} differs from {args.scale}; not comparing")
+            return
+        regressions = compare(results, baseline['results'], args.threshold, args.min_delta_ms / 1000)
+        for message in regressions:
+            print(f"REGRESSION: {message}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Generate synthetic workspaces for the benchmark suite.
+
+A synthetic workspace has a clone_summary.json and ``repos`` project
+directories holding about ``files`` files in total. Roughly 40% of every
+project is ``venv`` / ``node_modules`` noise, mirroring real checkouts where
+vendored environments dwarf the project sources. Project names are drawn
+from the categorisation keywords so generation and migration exercise every
+category, and project types rotate through the detect_project_type markers.
+"""
+
+import json
+import os
+from pathlib import Path
+
+SCALES = {
+    'tiny': (10, 1_000),
+    'small': (100, 10_000),
+    'medium': (300, 100_000),
+    'large': (1_000, 1_000_000),
+}
+
+NAME_WORDS = [
+    'trading', 'stock', 'ai', 'ml', 'gpt', 'lstm', 'project', 'scanner', 'social',
+    'website', 'resume', 'portfolio', 'game', 'sims', 'osrs', 'content', 'help-desk',
+    'tuber', 'web', 'app', 'tool', 'template', 'misc',
+]
+
+# (marker files at the project root, source suffix)
+PROJECT_KINDS = [
+    (['setup.py', 'requirements.txt'], '.py'),
+    (['package.json'], '.js'),
+    (['composer.json'], '.php'),
+    (['pom.xml'], '.java'),
+    (['index.html'], '.css'),
+    (['README.md'], '.md'),
+    ([], '.dat'),
+]
+
+MARKER_FILE = '.synthetic_workspace.json'
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def generate(root: Path, repos: int, files: int) -> Path:
+    """Create (or reuse) a synthetic workspace under ``root`` and return it."""
+    root = Path(root)
+    marker = root / MARKER_FILE
+    spec = {'repos': repos, 'files': files}
+    if marker.exists() and json.loads(marker.read_text(encoding='utf-8')) == spec:
+        return root
+    root.mkdir(parents=True, exist_ok=True)
+
+    per_repo = max(1, files // repos)
+    names = []
+    for index in range(repos):
+        name = f"{NAME_WORDS[index % len(NAME_WORDS)]}-project-{index}"
+        names.append({'name': name, 'full_name': f"synthetic/{name}", 'private': False})
+        markers, suffix = PROJECT_KINDS[index % len(PROJECT_KINDS)]
+        repo = root / name
+        noise = int(per_repo * 0.4)
+        sources = max(1, per_repo - noise - len(markers))
+
+        for marker_name in markers:
+            (repo / marker_name).parent.mkdir(parents=True, exist_ok=True)
+            _write(os.path.join(repo, marker_name), b'{}\n')
+        for i in range(sources):
+            directory = repo / 'src' / f"pkg{i % 10}" / f"sub{i % 3}"
+            directory.mkdir(parents=True, exist_ok=True)
+            _write(os.path.join(directory, f"module_{i}{suffix}"), b"# synthetic\nvalue = %d\n" % i)
+        noise_root = repo / ('node_modules' if suffix == '.js' else os.path.join('venv', 'Lib', 'site-packages'))
+        for i in range(noise):
+            directory = noise_root / f"dep{i % 25}"
+            directory.mkdir(parents=True, exist_ok=True)
+            _write(os.path.join(directory, f"vendored_{i}.py"), b"def f():\n    return 1\n")
+
+    (root / 'clone_summary.json').write_text(
+        json.dumps({'total_repositories': repos, 'repositories': names}, indent=2), encoding='utf-8'
+    )
+    marker.write_text(json.dumps(spec), encoding='utf-8')
+    return root
@@ -6,12 +6,22 @@ creates a CODE_ARCHITECTURE_STANDARDS.md file with common guidelines for
 project structure, code quality, testing, security, and documentation.
 """
 
+import argparse
 from datetime import datetime
 from pathlib import Path
 
-from workspace_utils import get_project_directories
+from workspace_manifest import ManifestStore
+from workspace_profile import profiler
+from workspace_watch import load_projects
+from workspace_store import LINK_MODES, ContentStore
+from workspace_template import Template, keep_existing
+from workspace_writer import BatchWriter, OutputWriter, content_digest
 
-CONTENT_TEMPLATE = """# Coding & Architecture Standards
+# Manifest label recording each project's state after its standards doc was written
+MANIFEST_LABEL = 'coding_standards'
+OUTPUT_NAME = 'CODE_ARCHITECTURE_STANDARDS.md'
+
+CONTENT_TEMPLATE = Template("""# Coding & Architecture Standards
 
 ## Design Principles
 - Favor object-oriented, class-based design to encapsulate behavior and data.
@@ -44,18 +54,73 @@ CONTENT_TEMPLATE = """# Coding & Architecture Standards
 
 ---
 **Last Updated**: {date}
-"""
+""")
+# The date line alone changing does not rewrite a document
+DATE_LINES = CONTENT_TEMPLATE.line_prefixes(['date'])
 
 
 def main() -> None:
-    base_path = Path('.')
-    repositories = get_project_directories(base_path)
+    parser = argparse.ArgumentParser(description='Generate CODE_ARCHITECTURE_STANDARDS.md for all repositories')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate documents even for projects unchanged since the last run')
+    parser.add_argument('--write-jobs', type=int, default=None,
+                        help='Threads writing generated files (default: 4 per CPU, at most 32)')
+    parser.add_argument('--fsync', action='store_true',
+                        help='fsync each generated file before renaming it into place')
+    parser.add_argument('--content-store', choices=LINK_MODES, default=None,
+                        help='Link identical documents to one content-addressed blob (hardlinks share one inode, so in-place edits affect every copy)')
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    profiler.configure(args)
 
-    date = datetime.now().strftime('%Y-%m-%d')
-    for repo in repositories:
-        path = repo / 'CODE_ARCHITECTURE_STANDARDS.md'
-        path.write_text(CONTENT_TEMPLATE.format(date=date), encoding='utf-8')
-        print(f"Created CODE_ARCHITECTURE_STANDARDS.md for {repo.name}")
+    base_path = Path('.')
+    with profiler.span('scan'):
+        repositories = [record['path'] for record in load_projects(base_path)]
+
+    # Every project gets the same document, so render it once
+    content = CONTENT_TEMPLATE.render({'date': datetime.now().strftime('%Y-%m-%d')})
+    # Editing the template regenerates every document, editing a document does not
+    inputs = content_digest(CONTENT_TEMPLATE.source.encode('utf-8'))
+    store = ContentStore(base_path, link=args.content_store) if args.content_store else None
+    with ManifestStore(base_path) as manifests, \
+            BatchWriter(jobs=args.write_jobs, fsync=args.fsync) as batch, \
+            OutputWriter(base_path, conn=manifests.conn, batch=batch, store=store) as writer:
+        pending = []
+        for repo in repositories:
+            with profiler.span('manifest.check', repo.name):
+                unchanged = not args.force and not manifests.needs_update(
+                    repo.name, MANIFEST_LABEL, repo, exclude=(OUTPUT_NAME,), inputs=inputs,
+                )
+                unchanged = unchanged and (repo / OUTPUT_NAME).exists()
+            if unchanged:
+                print(f"Skipped {repo.name} (unchanged since last run)")
+                continue
+            with profiler.span('write', repo.name):
+                try:
+                    existing = (repo / OUTPUT_NAME).read_text(encoding='utf-8', errors='replace')
+                except FileNotFoundError:
+                    existing = None
+                written = writer.write(repo / OUTPUT_NAME, keep_existing(content, existing, DATE_LINES))
+            pending.append(repo)
+            if written:
+                print(f"Created {OUTPUT_NAME} for {repo.name}")
+            else:
+                print(f"Unchanged {OUTPUT_NAME} for {repo.name}")
+        with profiler.span('write.flush'):
+            writer.flush()
+        for repo in pending:
+            with profiler.span('manifest.update', repo.name):
+                manifests.update(repo.name, repo)
+                manifests.mark(repo.name, MANIFEST_LABEL, inputs)
+        print(f"Files: {writer.summary()}")
+        if batch.batches:
+            print(f"Writes: {batch.summary()}")
+        if store is not None:
+            run_manifest = store.save_run()
+            print(f"Content store: {store.summary()}")
+            if run_manifest:
+                print(f"Run manifest: {run_manifest}")
+    profiler.report(args)
 
 
 if __name__ == '__main__':
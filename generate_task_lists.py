@@ -6,10 +6,26 @@ This script creates comprehensive TASK_LIST.md files for all actual repositories
 in the workspace, focusing on beta readiness with environment setup guidance.
 """
 
+import argparse
+import json
+import re
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from workspace_utils import get_project_directories, detect_project_type
+from workspace_classifier import Classifier
+from workspace_manifest import ManifestStore
+from workspace_profile import profiler
+from workspace_progress import ProgressAggregator, percent
+from workspace_store import LINK_MODES, ContentStore
+from workspace_template import Template, keep_existing
+from workspace_watch import load_projects
+from workspace_writer import BatchWriter, OutputWriter, content_digest
+
+# Manifest label recording each project's state after its task list was written
+MANIFEST_LABEL = 'task_lists'
+
+# A markdown checkbox item: prefix, mark, and the rest of the line
+CHECKBOX_LINE = re.compile(r'^(\s*[-*+]\s+\[)([ xX])(\].*)$')
 
 # Repository categories and their characteristics
 REPOSITORY_CATEGORIES = {
@@ -56,30 +72,21 @@ REPOSITORY_CATEGORIES = {
     }
 }
 
-def categorize_repository(repo_name):
-    """Categorize repository based on name and keywords"""
-    repo_lower = repo_name.lower()
-    
-    for category, config in REPOSITORY_CATEGORIES.items():
-        for keyword in config['keywords']:
-            if keyword in repo_lower:
-                return category, config
-    
-    return 'other', REPOSITORY_CATEGORIES['other']
+# Keyword rules compiled once; the first matching category wins
+CLASSIFIER = Classifier(
+    [(category, config['keywords']) for category, config in REPOSITORY_CATEGORIES.items()],
+    default='other',
+)
 
-def create_beta_ready_task_list(repo_name, category, config, project_type):
-    """Create comprehensive beta-ready task list"""
-    
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    return f"""# {repo_name.replace('-', ' ').title()} - Beta Ready Task List
+# Documents are compiled once at import; rendering only fills the slots
+TASK_LIST_TEMPLATE = Template("""# {title} - Beta Ready Task List
 
 ## 🎯 **Project Overview**
 
 **Repository**: `{repo_name}`  
-**Category**: {category.replace('-', ' ').title()}  
+**Category**: {category_title}  
 **Project Type**: {project_type}  
-**Priority**: {config['priority']}  
+**Priority**: {priority}  
 **Status**: 📋 Beta Preparation  
 **Last Updated**: {today}
 
@@ -370,21 +377,18 @@ def create_beta_ready_task_list(repo_name, category, config, project_type):
 ---
 
 **Last Updated**: {today}  
-**Next Review**: {(datetime.now().replace(day=datetime.now().day + 7)).strftime("%Y-%m-%d")}  
-**Priority**: {config['priority']}  
+**Next Review**: {next_review}  
+**Priority**: {priority}  
 **Estimated Beta Completion**: 2-4 weeks  
-**Beta Focus**: {config['beta_focus']}
-"""
+**Beta Focus**: {beta_focus}
+""")
 
-def create_master_task_list():
-    """Create a master task list overview"""
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    return f"""# Master Task List - All Repositories
+MASTER_TEMPLATE = Template("""# Master Task List - All Repositories
 
 ## 🎯 **Overview**
 
-**Total Repositories**: {len([d for d in Path('.').iterdir() if d.is_dir() and not d.name.startswith('.')])}  
+**Total Repositories**: {total_repositories}  
+**Tasks Complete**: {tasks_complete}  
 **Last Updated**: {today}  
 **Status**: Beta Preparation Phase
 
@@ -444,6 +448,7 @@ def create_master_task_list():
 
 ## 📈 **Progress Tracking**
 
+{progress}
 ### **Repository Status**
 - [ ] Environment setup complete
 - [ ] Core features implemented
@@ -485,53 +490,249 @@ def create_master_task_list():
 ---
 
 **Last Updated**: {today}  
-**Next Review**: {(datetime.now().replace(day=datetime.now().day + 7)).strftime("%Y-%m-%d")}  
+**Next Review**: {next_review}  
 **Phase**: Beta Preparation  
 **Goal**: All repositories beta-ready within 4 weeks
-"""
+""")
+
+# Lines whose only change from run to run is the date
+DATE_FIELDS = ('today', 'next_review')
+TASK_LIST_DATE_LINES = TASK_LIST_TEMPLATE.line_prefixes(DATE_FIELDS)
+MASTER_DATE_LINES = MASTER_TEMPLATE.line_prefixes(DATE_FIELDS)
+
+def read_existing(path):
+    """Text of a previously generated document, or None if there is none"""
+    try:
+        return path.read_text(encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        return None
+
+def categorize_repository(repo_name):
+    """Categorize repository based on name and keywords"""
+    category = CLASSIFIER.classify(repo_name)
+    return category, REPOSITORY_CATEGORIES[category]
+
+def task_list_inputs(repository):
+    """Digest of what a project's task list is rendered from besides its files"""
+    category, config = categorize_repository(repository['name'])
+    key = [TASK_LIST_TEMPLATE.source, category, config, repository['type']]
+    return content_digest(json.dumps(key, sort_keys=True).encode('utf-8'))
+
+def render_dates(now=None):
+    """Dates shared by every document of one run"""
+    now = now or datetime.now()
+    return {
+        'today': now.strftime("%Y-%m-%d"),
+        'next_review': (now + timedelta(days=7)).strftime("%Y-%m-%d"),
+    }
+
+def task_list_values(repo_name, category, config, project_type, dates=None):
+    """Slot values of one project's task list"""
+    return {
+        **(dates or render_dates()),
+        'title': repo_name.replace('-', ' ').title(),
+        'repo_name': repo_name,
+        'category_title': category.replace('-', ' ').title(),
+        'project_type': project_type,
+        'priority': config['priority'],
+        'beta_focus': config['beta_focus'],
+    }
+
+def create_beta_ready_task_list(repo_name, category, config, project_type, dates=None):
+    """Create comprehensive beta-ready task list"""
+    return TASK_LIST_TEMPLATE.render(task_list_values(repo_name, category, config, project_type, dates))
+
+def render_task_lists(repositories, dates=None):
+    """Render task lists in batch, yielding ``(repository, category, content)`` one at a time"""
+    dates = dates or render_dates()
+    repositories = list(repositories)
+    with profiler.span('classify'):
+        categories = CLASSIFIER.classify_many(repository['name'] for repository in repositories)
+    documents = TASK_LIST_TEMPLATE.render_many(
+        task_list_values(repository['name'], category, REPOSITORY_CATEGORIES[category], repository['type'], dates)
+        for repository, category in zip(repositories, categories)
+    )
+    for repository, category in zip(repositories, categories):
+        with profiler.span('render', repository['name']):
+            content = next(documents)
+        yield repository, category, content
+
+def checkbox_items(lines):
+    """Yield ``(line index, key, match)`` per checkbox item, keyed by heading, text and occurrence"""
+    seen = {}
+    heading = ''
+    for index, line in enumerate(lines):
+        text = line.rstrip('\n')
+        if text.startswith('#'):
+            heading = text
+            continue
+        match = CHECKBOX_LINE.match(text)
+        if match:
+            item = (heading, match.group(1) + match.group(3))
+            seen[item] = seen.get(item, 0) + 1
+            yield index, item + (seen[item],), match
+
+def keep_checkbox_state(content, existing):
+    """Carry the checkbox marks of an existing task list over to a regenerated one
+
+    Items still present under the same heading keep the mark the user gave
+    them; new items take the template's default.
+    """
+    states = {key: match.group(2) for _, key, match in checkbox_items(existing.splitlines())}
+    lines = content.splitlines(keepends=True)
+    for index, key, match in checkbox_items(lines):
+        mark = states.get(key)
+        if mark is not None and mark != match.group(2):
+            ending = lines[index][len(lines[index].rstrip('\n')):]
+            lines[index] = match.group(1) + mark + match.group(3) + ending
+    return ''.join(lines)
+
+def render_progress(progress):
+    """Markdown tables of checkbox progress per task list and per section"""
+    lines = [
+        "### **Live Progress**",
+        f"{len(progress['files'])} task lists, {progress['done']}/{progress['total']} tasks complete",
+        "",
+        "| Task List | Done | Total | Progress |",
+        "|---|---:|---:|---:|",
+    ]
+    for directory, result in progress['files'].items():
+        lines.append(f"| `{directory}` | {result['done']} | {result['total']} | "
+                     f"{percent(result['done'], result['total'])} |")
+    lines += ["", "| Section | Done | Total | Progress |", "|---|---:|---:|---:|"]
+    for section, (done, total) in sorted(progress['sections'].items(), key=lambda item: -item[1][1]):
+        lines.append(f"| {section or '(no section)'} | {done} | {total} | {percent(done, total)} |")
+    return "\n".join(lines) + "\n"
+
+def create_master_task_list(total_repositories=None, dates=None, progress=None):
+    """Create a master task list overview"""
+    if total_repositories is None:
+        total_repositories = len([d for d in Path('.').iterdir() if d.is_dir() and not d.name.startswith('.')])
+    if progress is None:
+        with ProgressAggregator(Path('.')) as aggregator:
+            progress = aggregator.aggregate()
+    return MASTER_TEMPLATE.render({
+        **(dates or render_dates()),
+        'total_repositories': total_repositories,
+        'tasks_complete': f"{progress['done']}/{progress['total']} ({percent(progress['done'], progress['total'])})",
+        'progress': render_progress(progress),
+    })
 
 def main():
     """Generate task lists for all actual repositories"""
+    parser = argparse.ArgumentParser(description='Generate TASK_LIST.md for all repositories')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Worker processes for project classification (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                       help='Regenerate task lists even for projects unchanged since the last run')
+    parser.add_argument('--write-jobs', type=int, default=None,
+                       help='Threads writing generated files (default: 4 per CPU, at most 32)')
+    parser.add_argument('--fsync', action='store_true',
+                       help='fsync each generated file before renaming it into place')
+    parser.add_argument('--content-store', choices=LINK_MODES, default=None,
+                       help='Link identical documents to one content-addressed blob (hardlinks share one inode, so in-place edits affect every copy)')
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    profiler.configure(args)
+
     base_path = Path(".")
     
-    # Get all directories (repositories)
-    repositories = get_project_directories(base_path)
+    # Get all repositories with their detected types (watcher daemon or index)
+    with profiler.span('scan'):
+        repositories = load_projects(base_path, jobs=args.jobs)
     
     print(f"🔍 Found {len(repositories)} repositories")
     
-    # Create task lists for each repository
-    for repo_path in repositories:
-        repo_name = repo_path.name
+    manifests = ManifestStore(base_path)
+    batch = BatchWriter(jobs=args.write_jobs, fsync=args.fsync)
+    store = ContentStore(base_path, link=args.content_store) if args.content_store else None
+    writer = OutputWriter(base_path, conn=manifests.conn, batch=batch, store=store)
+    skipped = 0
+    pending = []
+    inputs = {}
+    
+    # Select repositories whose task list needs regenerating
+    for repository in repositories:
+        repo_name = repository['name']
         
         # Skip if it's not a project directory
         if repo_name in ['node_modules', 'venv', 'env', '__pycache__', '.git']:
             continue
             
-        # Categorize repository
-        category, config = categorize_repository(repo_name)
-
-        # Detect project type
-        project_type = detect_project_type(repo_path)
+        # Skip projects whose content (other than the task list itself) and
+        # rendering inputs haven't changed since the last run
+        with profiler.span('manifest.check', repo_name):
+            inputs[repo_name] = task_list_inputs(repository)
+            unchanged = not args.force and not manifests.needs_update(
+                repo_name, MANIFEST_LABEL, repository['path'],
+                exclude=('TASK_LIST.md',), inputs=inputs[repo_name],
+            )
+            unchanged = unchanged and (repository['path'] / 'TASK_LIST.md').exists()
+        if unchanged:
+            skipped += 1
+            continue
+        pending.append(repository)
+    
+    # Render task lists one at a time and queue their writes on the thread pool
+    dates = render_dates()
+    for repository, category, task_list_content in render_task_lists(pending, dates):
+        repo_name = repository['name']
+        task_list_path = repository['path'] / "TASK_LIST.md"
         
-        # Generate task list content
-        task_list_content = create_beta_ready_task_list(repo_name, category, config, project_type)
+        # Regenerating must not undo the boxes already ticked in the task list,
+        # nor rewrite a task list whose only change would be its dates
+        existing = read_existing(task_list_path)
+        if existing is not None:
+            task_list_content = keep_checkbox_state(task_list_content, existing)
+            task_list_content = keep_existing(task_list_content, existing, TASK_LIST_DATE_LINES)
         
-        # Write task list file
-        task_list_path = repo_path / "TASK_LIST.md"
-        with open(task_list_path, 'w', encoding='utf-8') as f:
-            f.write(task_list_content)
+        with profiler.span('write', repo_name):
+            written = writer.write(task_list_path, task_list_content)
         
-        print(f"✅ Created TASK_LIST.md for {repo_name} ({category}, {project_type})")
+        if written:
+            print(f"✅ Created TASK_LIST.md for {repo_name} ({category}, {repository['type']})")
+        else:
+            print(f"ℹ️  TASK_LIST.md already up to date for {repo_name}")
+    
+    with profiler.span('write.flush'):
+        writer.flush()
+    
+    # Create master task list from the real state of every task list on disk
+    with profiler.span('progress'):
+        with ProgressAggregator(base_path, conn=manifests.conn) as aggregator:
+            progress = aggregator.aggregate()
+    with profiler.span('render', 'MASTER'):
+        master_content = create_master_task_list(len(repositories), dates, progress)
+        master_content = keep_existing(master_content, read_existing(Path("MASTER_TASK_LIST.md")), MASTER_DATE_LINES)
+    with profiler.span('write', 'MASTER'):
+        writer.write(Path("MASTER_TASK_LIST.md"), master_content)
+    writer.flush()
     
-    # Create master task list
-    master_content = create_master_task_list()
-    with open("MASTER_TASK_LIST.md", 'w', encoding='utf-8') as f:
-        f.write(master_content)
+    # Record each project's state including its new task list
+    for repository in pending:
+        with profiler.span('manifest.update', repository['name']):
+            manifests.update(repository['name'], repository['path'])
+            manifests.mark(repository['name'], MANIFEST_LABEL, inputs[repository['name']])
+    writer.close()
+    batch.close()
+    manifests.close()
     
     print(f"\n🎉 Task list generation complete!")
-    print(f"📋 Generated task lists for {len(repositories)} repositories")
-    print(f"📊 Updated MASTER_TASK_LIST.md")
+    print(f"📋 Generated task lists for {len(repositories) - skipped} repositories")
+    if skipped:
+        print(f"⏭️  Skipped {skipped} unchanged repositories (use --force to regenerate)")
+    print(f"📝 Files: {writer.summary()}")
+    if batch.batches:
+        print(f"💾 Writes: {batch.summary()}")
+    if store is not None:
+        run_manifest = store.save_run()
+        print(f"🗃️  Content store: {store.summary()}")
+        if run_manifest:
+            print(f"🗃️  Run manifest: {run_manifest}")
+    print(f"📊 Updated MASTER_TASK_LIST.md: {progress['done']}/{progress['total']} tasks complete "
+          f"across {len(progress['files'])} task lists ({aggregator.rescanned} re-read)")
     print(f"🚀 All repositories ready for beta preparation!")
+    profiler.report(args)
 
 if __name__ == "__main__":
     main()
@@ -10,141 +10,110 @@ It provides functionality to:
 4. Manage project dependencies and setup
 """
 
-import os
-import subprocess
-import json
+import argparse
+import inspect
+import time
 from pathlib import Path
 from datetime import datetime
 
-from workspace_utils import get_project_directories, detect_project_type
+from workspace_gitstate import find_git_dir, read_git_state, read_remote_url
+from workspace_journal import PushJournal
+from workspace_manifest import ManifestStore
+from workspace_orchestrator import DEFAULT_REMOTE_URL, STAGES, GitOrchestrator
+from workspace_profile import profiler
+from workspace_state import CONFIG_FILENAME, ProjectStateStore
+from workspace_watch import load_projects
+from workspace_writer import BatchWriter, content_digest
+
+# Manifest label recording each project's state after it was last processed
+MANIFEST_LABEL = 'push'
+# Files this script writes into each project
+GENERATED_FILES = ('setup.py', 'README.md')
 
 class ProjectManager:
-    def __init__(self, base_path="."):
+    def __init__(self, base_path=".", jobs=None, force=False, write_jobs=None, fsync=False, push=False,
+                 stage_limits=None, stage_timeouts=None, remote_url=DEFAULT_REMOTE_URL, fail_fast=False,
+                 fast_import=False, journal=False, journal_restart=False, retries=None, backoff=1.0):
         self.base_path = Path(base_path)
+        self.jobs = jobs
+        self.force = force
+        self.push = push
+        self.stage_limits = stage_limits or {}
+        self.stage_timeouts = stage_timeouts or {}
+        self.remote_url = remote_url
+        self.fail_fast = fail_fast
+        self.fast_import = fast_import
+        self.journal = journal
+        self.journal_restart = journal_restart
+        self.retries = retries
+        self.backoff = backoff
         self.projects = []
-        self.config_file = "project_config.json"
+        self.config_file = CONFIG_FILENAME
+        # Per-project rows in the workspace index; see open_state()
+        self.state = None
+        # Generated files are queued here; call self.writer.flush() before relying on them
+        self.writer = BatchWriter(jobs=write_jobs, fsync=fsync)
         
     def scan_projects(self):
         """Scan for all project directories"""
         projects = []
-        for item in get_project_directories(self.base_path):
-            name = item.name
+        for record in load_projects(self.base_path, jobs=self.jobs):
+            name = record['name']
+            item = record['path']
             if any(skip in name.lower() for skip in ['backup', 'node_modules', 'venv', 'env']):
                 continue
+            # Git state comes from parsing .git; git runs only when that is ambiguous
+            with profiler.span('scan.git', name):
+                git = read_git_state(item)
             projects.append({
                 'name': name,
                 'path': item,
-                'type': detect_project_type(item),
-                'has_git': (item / '.git').exists(),
+                'type': record['type'],
+                'has_git': git['is_repo'],
+                'branch': git['branch'],
+                'has_remote': git['has_remote'],
+                'dirty': git['dirty'],
+                'remote': git['remote'],
                 'has_task_list': (item / 'TASK_LIST.md').exists()
             })
         self.projects = projects
         return projects
     
-    def create_project_config(self):
-        """Create configuration for all projects"""
-        config = {
-            'last_updated': datetime.now().isoformat(),
-            'total_projects': len(self.projects),
-            'projects': {}
-        }
-        
-        for project in self.projects:
-            config['projects'][project['name']] = {
-                'type': project['type'],
-                'has_git': project['has_git'],
-                'has_task_list': project['has_task_list'],
-                'remote_url': None,
-                'status': 'pending'
-            }
-        
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
-        
-        print(f"✅ Created project configuration: {self.config_file}")
-        return config
+    def open_state(self):
+        """Return the project state store, opening it on first use"""
+        if self.state is None:
+            self.state = ProjectStateStore(self.base_path.resolve())
+        return self.state
     
-    def initialize_git_repository(self, project_path, project_name):
-        """Initialize git repository for a project"""
-        try:
-            # Change to project directory
-            os.chdir(project_path)
-            
-            # Initialize git if not already done
-            if not (project_path / '.git').exists():
-                subprocess.run(['git', 'init'], check=True)
-                print(f"✅ Initialized git repository for {project_name}")
-            
-            # Add all files (force if needed)
-            try:
-                subprocess.run(['git', 'add', '.'], check=True)
-            except subprocess.CalledProcessError:
-                # Try with force flag if files are ignored
-                subprocess.run(['git', 'add', '-f', '.'], check=True)
-            
-            # Check if there are changes to commit
-            result = subprocess.run(['git', 'status', '--porcelain'], 
-                                  capture_output=True, text=True, check=True)
-            
-            if result.stdout.strip():
-                # Commit changes
-                subprocess.run(['git', 'commit', '-m', f'Initial commit for {project_name}'], check=True)
-                print(f"✅ Committed changes for {project_name}")
-            else:
-                print(f"ℹ️  No changes to commit for {project_name}")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error initializing git for {project_name}: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ Unexpected error for {project_name}: {e}")
-            return False
+    def create_project_config(self):
+        """Record the scanned projects in the state store and return the config document"""
+        state = self.open_state()
+        state.sync(self.projects)
+        print(f"✅ Recorded {len(self.projects)} projects in the state store")
+        return state.to_config()
     
-    def setup_remote_repository(self, project_path, project_name):
-        """Set up remote repository for a project"""
-        try:
-            os.chdir(project_path)
-            
-            # Check if remote already exists
-            result = subprocess.run(['git', 'remote', '-v'], 
-                                  capture_output=True, text=True, check=True)
-            
-            if not result.stdout.strip():
-                # Create remote URL (you can customize this)
-                remote_url = f"https://github.com/Dadudekc/{project_name}.git"
-                
-                # Add remote
-                subprocess.run(['git', 'remote', 'add', 'origin', remote_url], check=True)
-                print(f"✅ Added remote origin for {project_name}: {remote_url}")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error setting up remote for {project_name}: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ Unexpected error for {project_name}: {e}")
-            return False
+    def export_project_config(self):
+        """Write project_config.json from the state store for tools that still read it"""
+        return self.open_state().export_json(Path(self.config_file))
     
-    def push_project(self, project_path, project_name):
-        """Push project to remote repository"""
-        try:
-            os.chdir(project_path)
-            
-            # Push to remote
-            subprocess.run(['git', 'push', '-u', 'origin', 'main'], check=True)
-            print(f"✅ Successfully pushed {project_name} to remote repository")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Error pushing {project_name}: {e}")
-            return False
-        except Exception as e:
-            print(f"❌ Unexpected error pushing {project_name}: {e}")
-            return False
+    def run_git_pipelines(self, projects, push=False, on_result=None, journal=None):
+        """Run the commit, remote and (optionally) push stages for every project.
+        
+        Stages run on the asyncio orchestrator with per-stage concurrency
+        limits and timeouts; ``--jobs`` sets the commit limit. Transient push
+        failures are retried with backoff, and with a ``journal`` stages
+        already completed in a resumed run are skipped. Returns the
+        per-project result dicts in completion order, calling ``on_result``
+        with each one as it finishes.
+        """
+        limits = {'commit': self.jobs} if self.jobs else {}
+        limits.update(self.stage_limits)
+        orchestrator = GitOrchestrator(limits=limits, timeouts=self.stage_timeouts,
+                                       remote_url=self.remote_url, push=push, fail_fast=self.fail_fast,
+                                       fast_import=self.fast_import,
+                                       retries=None if self.retries is None else {'push': self.retries},
+                                       backoff=self.backoff, journal=journal)
+        return orchestrator.run_all(projects, on_result)
     
     def create_setup_script(self, project_path, project_name, project_type):
         """Create setup script for the project"""
@@ -269,11 +238,8 @@ echo "✅ {project_name} setup complete!"
 echo "📖 Check TASK_LIST.md for next steps"
 '''
 
-        with open(setup_script, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        # Make executable
-        os.chmod(setup_script, 0o755)
+        # Queue the write; the script is made executable when it lands
+        self.writer.submit(setup_script, content, mode=0o755)
         print(f"✅ Created setup script for {project_name}")
     
     def create_readme(self, project_path, project_name, project_type):
@@ -346,8 +312,7 @@ This project is part of the Dadudekc repository collection. See `TASK_LIST.md` f
 **Last Updated**: {datetime.now().strftime("%Y-%m-%d")}
 """
             
-            with open(readme_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self.writer.submit(readme_file, content)
             
             print(f"✅ Created README.md for {project_name}")
     
@@ -373,45 +338,165 @@ This project is part of the Dadudekc repository collection. See `TASK_LIST.md` f
         else:
             return "./setup.sh"
     
+    def generator_inputs(self, project):
+        """Digest of what the generated files of a project are rendered from"""
+        source = inspect.getsource(self.create_setup_script) + inspect.getsource(self.create_readme)
+        return content_digest(f"{source}\0{project['type']}".encode('utf-8'))
+    
     def process_all_projects(self):
         """Process all projects"""
         print("🔍 Scanning projects...")
-        self.scan_projects()
+        with profiler.span('scan'):
+            self.scan_projects()
         
         print(f"📊 Found {len(self.projects)} projects")
         
         # Create configuration
-        self.create_project_config()
+        with profiler.span('config'):
+            self.create_project_config()
+        
+        manifests = ManifestStore(self.base_path.resolve())
+        pending = []
+        inputs = {}
         
-        # Process each project
+        # Generate setup scripts and READMEs, written in batch on the thread pool
         for project in self.projects:
-            print(f"\n🔄 Processing {project['name']} ({project['type']})...")
-            
-            # Create setup script
-            self.create_setup_script(project['path'], project['name'], project['type'])
-            
-            # Create README
-            self.create_readme(project['path'], project['name'], project['type'])
-            
-            # Initialize git repository
-            if not project['has_git']:
-                self.initialize_git_repository(project['path'], project['name'])
+            name = project['name']
+            # Skip projects whose content hasn't changed since the last run
+            with profiler.span('manifest.check', name):
+                inputs[name] = self.generator_inputs(project)
+                unchanged = not self.force and not manifests.needs_update(name, MANIFEST_LABEL, inputs=inputs[name])
+                # Edits to the generated files alone are committed, not overwritten
+                regenerate = self.force or not (project['path'] / 'setup.py').exists() or manifests.changed_since(
+                    name, MANIFEST_LABEL, exclude=GENERATED_FILES, inputs=inputs[name])
+            if unchanged:
+                continue
+            pending.append(project)
             
-            # Setup remote repository
-            self.setup_remote_repository(project['path'], project['name'])
+            print(f"\n🔄 Processing {name} ({project['type']})...")
             
-            # Push to remote (optional - uncomment if you want to push all)
-            # self.push_project(project['path'], project['name'])
+            with profiler.span('write', name):
+                if regenerate:
+                    self.create_setup_script(project['path'], name, project['type'])
+                self.create_readme(project['path'], name, project['type'])
+        
+        with profiler.span('write.flush'):
+            batch = self.writer.flush()
+        if batch:
+            print(f"\n💾 Wrote {self.writer.summary()}")
+        
+        # Commit, configure remotes and optionally push, several projects at a time,
+        # now that every generated file is on disk
+        failed = []
+        
+        def report(result):
+            name = result['name']
+            print(f"\n🔧 {name} ({result['seconds']:.2f}s)")
+            for line in result['log']:
+                print(line)
+            if not result['ok']:
+                print(f"❌ {result['stage'] or 'git'} failed for {name}: {result['error']}")
+                failed.append(result)
+                state.set_status(name, 'failed', error=f"{result['stage'] or 'git'}: {result['error']}")
+                return
+            git_dir = find_git_dir(paths[name])
+            # The remote stage succeeded, so the project has a remote now
+            state.set_status(name, 'pushed' if self.push else 'committed', has_remote=True,
+                             remote=read_remote_url(git_dir) if git_dir is not None else None)
+            # Only successful projects are marked, so failures are retried next run
+            with profiler.span('manifest.update', name):
+                manifests.update(name)
+                manifests.mark(name, MANIFEST_LABEL, inputs[name])
         
+        # Journaled runs resume where an interrupted or failed run stopped
+        journal = None
+        if self.journal:
+            journal = PushJournal(self.base_path.resolve(), conn=manifests.conn, restart=self.journal_restart)
+            if journal.resumed:
+                print(f"\n📒 Resuming {journal.summary()}")
+        
+        state = self.open_state()
+        paths = {project['name']: project['path'] for project in pending}
+        start = time.perf_counter()
+        self.run_git_pipelines(pending, push=self.push, on_result=report, journal=journal)
+        
+        if journal is not None:
+            finished = journal.finish()
+            print(f"\n📒 {journal.summary()}" + ("" if finished else "; rerun with --journal to resume"))
+            journal.close()
+        manifests.close()
+        self.export_project_config()
+        self.state.close()
+        self.state = None
+        
+        skipped = len(self.projects) - len(pending)
         print(f"\n🎉 Project processing complete!")
-        print(f"📋 Processed {len(self.projects)} projects")
-        print(f"📊 Configuration saved to {self.config_file}")
+        print(f"📋 Processed {len(pending)} projects (git stages took {time.perf_counter() - start:.2f}s)")
+        if failed:
+            print(f"❌ {len(failed)} projects failed: {', '.join(result['name'] for result in failed)}")
+        if skipped:
+            print(f"⏭️  Skipped {skipped} projects unchanged since the last run (use --force to reprocess)")
+        print(f"📊 Project state saved to the workspace index and exported to {self.config_file}")
         print(f"🚀 Each project is now ready for individual development and deployment")
 
+def parse_stage_options(parser, values, convert):
+    """Turn repeated STAGE=VALUE options into a dict"""
+    options = {}
+    for value in values:
+        stage, _, number = value.partition('=')
+        if stage not in STAGES:
+            parser.error(f"unknown git stage {stage!r}; expected one of {', '.join(STAGES)}")
+        try:
+            options[stage] = convert(number)
+        except ValueError:
+            parser.error(f"invalid value in {value!r}")
+    return options
+
 def main():
     """Main function"""
-    manager = ProjectManager()
+    parser = argparse.ArgumentParser(description='Manage and push all projects')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Parallel workers for project classification and the per-project git pipeline')
+    parser.add_argument('--push', action='store_true',
+                       help='Also push each project to its origin remote')
+    parser.add_argument('--stage-limit', action='append', default=[], metavar='STAGE=N',
+                       help=f"Concurrency limit for one git stage ({', '.join(STAGES)}); repeatable")
+    parser.add_argument('--stage-timeout', action='append', default=[], metavar='STAGE=SECONDS',
+                       help='Timeout for one git stage; repeatable')
+    parser.add_argument('--remote-url', default=DEFAULT_REMOTE_URL,
+                       help='Origin URL for projects without one; {name} is the project name')
+    parser.add_argument('--fail-fast', action='store_true',
+                       help='Cancel remaining git work after the first failure')
+    parser.add_argument('--retries', type=int, default=None,
+                       help='Retries for transient push failures (default: 3)')
+    parser.add_argument('--backoff', type=float, default=1.0,
+                       help='Initial retry delay in seconds, doubled per attempt with jitter')
+    parser.add_argument('--journal', action='store_true',
+                       help='Record stage completion and resume an unfinished run, skipping completed work')
+    parser.add_argument('--journal-restart', action='store_true',
+                       help='With --journal, abandon an unfinished run and start a new one')
+    parser.add_argument('--fast-import', action='store_true',
+                       help='Create first commits by streaming the tree into git fast-import')
+    parser.add_argument('--force', action='store_true',
+                       help='Process projects even if unchanged since the last run')
+    parser.add_argument('--write-jobs', type=int, default=None,
+                       help='Threads writing generated files (default: 4 per CPU, at most 32)')
+    parser.add_argument('--fsync', action='store_true',
+                       help='fsync each generated file before renaming it into place')
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    profiler.configure(args)
+
+    manager = ProjectManager(jobs=args.jobs, force=args.force, write_jobs=args.write_jobs, fsync=args.fsync,
+                             push=args.push,
+                             stage_limits=parse_stage_options(parser, args.stage_limit, int),
+                             stage_timeouts=parse_stage_options(parser, args.stage_timeout, float),
+                             remote_url=args.remote_url, fail_fast=args.fail_fast,
+                             fast_import=args.fast_import, journal=args.journal or args.journal_restart,
+                             journal_restart=args.journal_restart, retries=args.retries, backoff=args.backoff)
     manager.process_all_projects()
+    manager.writer.close()
+    profiler.report(args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,96 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import generate_task_lists
+
+
+def make_workspace(root, names):
+    root.joinpath("clone_summary.json").write_text(
+        json.dumps({"repositories": [{"name": name} for name in names]}), encoding="utf-8"
+    )
+    for name in names:
+        (root / name).mkdir()
+        (root / name / "main.py").write_text("print(1)\n", encoding="utf-8")
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["generate_task_lists.py", *args])
+    generate_task_lists.main()
+
+
+def checked(path):
+    return path.read_text(encoding="utf-8").count("- [x]")
+
+
+def test_rerun_keeps_ticked_boxes(tmp_path, monkeypatch):
+    make_workspace(tmp_path, ["alpha", "beta"])
+    monkeypatch.chdir(tmp_path)
+    run_main(monkeypatch)
+    task_list = tmp_path / "alpha" / "TASK_LIST.md"
+    before = checked(task_list)
+
+    text = task_list.read_text(encoding="utf-8")
+    task_list.write_text(text.replace("- [ ] **Environment Setup**", "- [x] **Environment Setup**", 1),
+                         encoding="utf-8")
+    # A project change forces alpha's task list to be regenerated too
+    (tmp_path / "alpha" / "package.json").write_text("{}", encoding="utf-8")
+    run_main(monkeypatch)
+    run_main(monkeypatch, "--force")
+
+    assert checked(task_list) == before + 1
+    assert "- [x] **Environment Setup**" in task_list.read_text(encoding="utf-8")
+    master = (tmp_path / "MASTER_TASK_LIST.md").read_text(encoding="utf-8")
+    assert f"**Tasks Complete**: {2 * before + 1}/" in master
+
+
+def test_regenerates_on_template_change_not_on_task_list_edit(tmp_path, monkeypatch):
+    make_workspace(tmp_path, ["alpha"])
+    monkeypatch.chdir(tmp_path)
+    run_main(monkeypatch)
+    task_list = tmp_path / "alpha" / "TASK_LIST.md"
+    task_list.write_text("# my own notes\n", encoding="utf-8")
+    run_main(monkeypatch)
+    assert task_list.read_text(encoding="utf-8") == "# my own notes\n"
+    task_list.unlink()
+    run_main(monkeypatch)
+    assert task_list.exists()
+
+    template = generate_task_lists.Template(generate_task_lists.TASK_LIST_TEMPLATE.source + "\nextra\n")
+    monkeypatch.setattr(generate_task_lists, "TASK_LIST_TEMPLATE", template)
+    run_main(monkeypatch)
+    assert task_list.read_text(encoding="utf-8").endswith("\nextra\n")
+
+
+def test_forced_rerun_on_a_later_day_keeps_files(tmp_path, monkeypatch):
+    make_workspace(tmp_path, ["alpha"])
+    monkeypatch.chdir(tmp_path)
+    render_dates = generate_task_lists.render_dates
+    monkeypatch.setattr(generate_task_lists, "render_dates", lambda: render_dates(datetime(2024, 1, 1)))
+    run_main(monkeypatch)
+    outputs = [tmp_path / "alpha" / "TASK_LIST.md", tmp_path / "MASTER_TASK_LIST.md"]
+    before = [path.read_text(encoding="utf-8") for path in outputs]
+    stats = [path.stat().st_mtime_ns for path in outputs]
+
+    monkeypatch.setattr(generate_task_lists, "render_dates", lambda: render_dates(datetime(2024, 1, 2)))
+    run_main(monkeypatch, "--force")
+    assert [path.read_text(encoding="utf-8") for path in outputs] == before
+    assert [path.stat().st_mtime_ns for path in outputs] == stats
+
+    # A real change brings the new dates along
+    text = outputs[0].read_text(encoding="utf-8")
+    outputs[0].write_text(text.replace("- [ ]", "- [x]", 1), encoding="utf-8")
+    run_main(monkeypatch)
+    master = outputs[1].read_text(encoding="utf-8")
+    assert "**Last Updated**: 2024-01-02" in master
+
+
+def test_keep_checkbox_state_matches_items_per_heading():
+    existing = "## A\n- [x] one\n- [ ] two\n## B\n- [x] one\n- [x] gone\n"
+    regenerated = "## A\n- [ ] one\n- [ ] two\n- [ ] new\n## B\n- [ ] one\n"
+    assert generate_task_lists.keep_checkbox_state(regenerated, existing) == \
+        "## A\n- [x] one\n- [ ] two\n- [ ] new\n## B\n- [x] one\n"
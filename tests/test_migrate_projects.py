@@ -0,0 +1,19 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MIGRATOR = ROOT / "unified-workspace" / "tools" / "migrate_projects.py"
+
+
+def test_migrator_imports_without_the_workspace_on_the_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "path", [entry for entry in sys.path if Path(entry or ".").resolve() != ROOT])
+    monkeypatch.delitem(sys.modules, "workspace_classifier", raising=False)
+
+    spec = importlib.util.spec_from_file_location("migrate_projects", MIGRATOR)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    migrator = module.ProjectMigrator(tmp_path, tmp_path / "unified")
+    assert migrator.categorize_project("stock-trading-bot") == "trading"
@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from push_all_projects import ProjectManager
+from workspace_state import ProjectStateStore
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+
+
+def make_project(root, name, remote=None):
+    path = root / name
+    path.mkdir()
+    (path / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    if remote is not None:
+        subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+        subprocess.run(["git", "remote", "add", "origin", str(remote)], cwd=path, check=True)
+    return {"name": name, "path": path, "type": "Python", "has_git": remote is not None}
+
+
+def test_git_pipelines_push_to_local_bare_remotes(tmp_path, git_identity):
+    cwd = Path.cwd()
+    remotes = tmp_path / "remotes"
+    projects = []
+    for index in range(4):
+        remote = remotes / f"p{index}.git"
+        subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+        project = make_project(tmp_path, f"p{index}", remote)
+        subprocess.run(["git", "add", "."], cwd=project["path"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "init"], cwd=project["path"], check=True)
+        projects.append(project)
+    fresh = make_project(tmp_path, "fresh")
+    broken = make_project(tmp_path, "broken", remotes / "missing.git")
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", "x"], cwd=broken["path"], check=True)
+
+    manager = ProjectManager(tmp_path, jobs=3)
+    results = {result["name"]: result for result in manager.run_git_pipelines(projects + [broken], push=True)}
+    assert Path.cwd() == cwd
+    assert all(results[project["name"]]["ok"] for project in projects)
+    for index in range(4):
+        log = subprocess.run(["git", "log", "--oneline"], cwd=remotes / f"p{index}.git",
+                             capture_output=True, text=True, check=True)
+        assert "init" in log.stdout
+    assert not results["broken"]["ok"]
+    assert results["broken"]["stage"] == "push"
+
+    [result] = list(manager.run_git_pipelines([fresh]))
+    assert result["ok"], result["error"]
+    assert (fresh["path"] / ".git").is_dir()
+    assert any("Committed" in line for line in result["log"])
+
+
+def test_process_all_projects_records_state(tmp_path, monkeypatch, git_identity):
+    remotes = tmp_path / "remotes"
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    for name in ("alpha", "beta"):
+        (workspace / name).mkdir()
+        (workspace / name / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    (workspace / "clone_summary.json").write_text(
+        json.dumps({"repositories": [{"name": "alpha"}, {"name": "beta"}]}), encoding="utf-8")
+    subprocess.run(["git", "init", "-q", "--bare", str(remotes / "alpha.git")], check=True)
+    # beta's remote is missing, so its push fails
+    monkeypatch.chdir(workspace)
+
+    manager = ProjectManager(workspace, push=True, remote_url=str(remotes / "{name}.git"), retries=0)
+    manager.process_all_projects()
+    manager.writer.close()
+
+    with ProjectStateStore(workspace) as state:
+        alpha, beta = state.get("alpha"), state.get("beta")
+        assert (alpha["status"], alpha["remote"]) == ("pushed", str(remotes / "alpha.git"))
+        assert beta["status"] == "failed" and beta["error"].startswith("push:")
+        assert [row["name"] for row in state.query(status="failed")] == ["beta"]
+    config = json.loads((workspace / "project_config.json").read_text(encoding="utf-8"))
+    assert config["projects"]["alpha"]["status"] == "pushed"
+
+    # A rerun after editing a generated file keeps the edit rather than regenerating it
+    (workspace / "alpha" / "setup.py").write_text("# customised\n", encoding="utf-8")
+    manager = ProjectManager(workspace, remote_url=str(remotes / "{name}.git"))
+    manager.process_all_projects()
+    manager.writer.close()
+    assert (workspace / "alpha" / "setup.py").read_text(encoding="utf-8") == "# customised\n"
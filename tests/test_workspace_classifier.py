@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import generate_task_lists
+from workspace_classifier import Classifier
+
+
+def test_first_category_wins_regardless_of_position():
+    classifier = Classifier(
+        [("trading", ["trading", "robot"]), ("dev", ["bot", "scanner"]), ("web", ["site"])],
+        default="other",
+        exact={"site-bot": "web"},
+    )
+    # "bot" (dev) starts inside "robot" (trading); the higher-priority rule still wins.
+    assert classifier.classify("My-Robot") == "trading"
+    assert classifier.classify("scanner-trading") == "trading"
+    assert classifier.classify("bot-site") == "dev"
+    assert classifier.classify("site-bot") == "web"
+    assert classifier.classify("unrelated") == "other"
+    assert classifier.classify_many(["bot", "zzz", "bot"]) == ["dev", "other", "dev"]
+
+
+def test_task_list_categories():
+    assert generate_task_lists.categorize_repository("TradingRobotPlug")[0] == "trading"
+    assert generate_task_lists.categorize_repository("gpt_automation")[0] == "ai-ml"
+    assert generate_task_lists.categorize_repository("zzz")[0] == "other"
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROBE = """
+import sys
+sys.path.insert(0, {root!r})
+sys.argv = ['workspace', 'scan', '--cached', '--json']
+import workspace
+workspace.main()
+heavy = ['concurrent.futures', 'ctypes', 'socketserver', 'generate_task_lists',
+         'push_all_projects', 'workspace_watch', 'requests', 'aiohttp']
+print([name for name in heavy if name in sys.modules])
+"""
+
+
+def test_scan_cached_imports_only_what_it_needs(tmp_path):
+    (tmp_path / "clone_summary.json").write_text(json.dumps({"repositories": []}), encoding="utf-8")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=str(ROOT))],
+        cwd=tmp_path, capture_output=True, text=True, check=True,
+    )
+    projects, loaded = result.stdout.strip().rsplit("\n", 1)
+    assert json.loads(projects) == []
+    assert loaded == "[]"
+
+
+def test_shared_utils_does_not_import_api_clients():
+    probe = (
+        "import sys; sys.path.insert(0, {root!r}); import shared.utils as utils; "
+        "print('shared.utils.api_client' in sys.modules, 'APIClient' in utils.__all__)"
+    ).format(root=str(ROOT / "unified-workspace"))
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "True"]
@@ -0,0 +1,43 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import workspace_dupes
+from workspace_dupes import DuplicateFinder, hardlink_group, summarize
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_staged_detection_and_hardlinking(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace_dupes, "PARTIAL_SIZE", 4)
+    write(tmp_path / "alpha" / "lib.py", b"same-content")
+    write(tmp_path / "beta" / "venv" / "lib.py", b"same-content")
+    write(tmp_path / "beta" / "near.py", b"same-contenX")  # same size and prefix
+    write(tmp_path / "beta" / "other.py", b"different!!!")
+    os.link(tmp_path / "alpha" / "lib.py", tmp_path / "alpha" / "alias.py")
+
+    with DuplicateFinder(tmp_path, jobs=2) as finder:
+        assert finder.scan([tmp_path / "alpha", tmp_path / "beta"]) == 5
+        groups = list(finder.groups())
+
+    assert groups == [[
+        (str(tmp_path / "alpha" / "alias.py"), "alpha", 12),
+        (str(tmp_path / "beta" / "venv" / "lib.py"), "beta", 12),
+    ]]
+    assert summarize(groups) == {
+        "groups": 1,
+        "reclaimable_bytes": 12,
+        "projects": {"beta": {"duplicate_files": 1, "reclaimable_bytes": 12}},
+    }
+
+    assert hardlink_group(groups[0]) == 1
+    assert os.stat(tmp_path / "beta" / "venv" / "lib.py").st_ino == os.stat(tmp_path / "alpha" / "lib.py").st_ino
+    with DuplicateFinder(tmp_path) as finder:
+        finder.scan([tmp_path])
+        assert list(finder.groups()) == []
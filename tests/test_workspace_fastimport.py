@@ -0,0 +1,117 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_fastimport import FastImportUnsupported, fast_import
+from workspace_gitstate import read_git_state
+from workspace_orchestrator import GitOrchestrator
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+
+
+def git(path, *args):
+    return subprocess.run(["git", *args], cwd=path, check=True, capture_output=True, text=True).stdout
+
+
+def make_tree(path):
+    files = {
+        "main.py": "print('hi')\n",
+        "pkg/__init__.py": "",
+        "pkg/deep/data.bin": "x" * 3_000_000,
+        'odd "name".txt': "quoted\n",
+        "debug.log": "ignored\n",
+        "venv/lib/site.py": "pruned\n",
+        "node_modules/left-pad/index.js": "pruned\n",
+        ".gitignore": "*.log\n",
+    }
+    past = time.time() - 60
+    for name, content in files.items():
+        target = path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        os.utime(target, (past, past))
+    os.chmod(path / "main.py", 0o755)
+    os.symlink("main.py", path / "link.py")
+    git(path, "init", "-q")
+    return path
+
+
+def test_fast_import_matches_add_and_commit(tmp_path, git_identity):
+    imported = make_tree(tmp_path / "imported")
+    added = tmp_path / "added"
+    shutil.copytree(imported, added, symlinks=True)
+    (added / ".git" / "info" / "exclude").write_text("venv/\nnode_modules/\n", encoding="utf-8")
+    git(added, "add", ".")
+    git(added, "commit", "-q", "-m", "Initial commit")
+
+    summary = fast_import(imported, "Initial commit")
+
+    assert summary["files"] == 6
+    assert git(imported, "rev-parse", "HEAD^{tree}") == git(added, "rev-parse", "HEAD^{tree}")
+    assert "venv/lib/site.py" not in git(imported, "ls-files")
+    # The written index is complete: clean without git re-hashing anything
+    assert git(imported, "status", "--porcelain") == ""
+    state = read_git_state(imported, fallback=False)
+    assert (state["dirty"], state["source"]) == (False, "files")
+
+
+def test_fast_import_refuses_existing_history(tmp_path, git_identity):
+    repo = make_tree(tmp_path / "p")
+    git(repo, "add", "main.py")
+    with pytest.raises(FastImportUnsupported):
+        fast_import(repo, "Initial commit")
+    git(repo, "commit", "-q", "-m", "first")
+    with pytest.raises(FastImportUnsupported):
+        fast_import(repo, "Initial commit")
+
+
+def test_orchestrator_commit_stage_uses_fast_import(tmp_path, git_identity):
+    projects = []
+    for index in range(3):
+        path = tmp_path / f"p{index}"
+        path.mkdir()
+        (path / "main.py").write_text(f"print({index})\n", encoding="utf-8")
+        projects.append({"name": f"p{index}", "path": path})
+
+    results = GitOrchestrator(remote_url=str(tmp_path / "{name}.git"), fast_import=True).run_all(projects)
+
+    assert all(result["ok"] for result in results)
+    for project in projects:
+        assert git(project["path"], "ls-files") == "main.py\n"
+        assert git(project["path"], "log", "--format=%s") == f"Initial commit for {project['name']}\n"
+        assert git(project["path"], "status", "--porcelain") == ""
+
+
+@pytest.mark.parametrize("setup", [
+    lambda repo: git(repo, "config", "core.autocrlf", "true"),
+    lambda repo: git(repo, "config", "core.eol", "crlf"),
+    lambda repo: git(repo, "config", "core.excludesFile", str(repo / "excludes")),
+    lambda repo: (repo / "pkg" / ".gitattributes").write_text("*.py text=auto\n", encoding="utf-8"),
+])
+def test_fast_import_refuses_content_conversion(tmp_path, git_identity, setup):
+    repo = make_tree(tmp_path / "p")
+    (repo / "crlf.txt").write_bytes(b"a\r\nb\r\n")
+    setup(repo)
+    with pytest.raises(FastImportUnsupported):
+        fast_import(repo, "Initial commit")
+    assert git(repo, "rev-list", "--all") == ""
+
+
+def test_fast_import_allows_autocrlf_false(tmp_path, git_identity):
+    repo = make_tree(tmp_path / "p")
+    git(repo, "config", "core.autocrlf", "false")
+    assert fast_import(repo, "Initial commit")["files"] == 6
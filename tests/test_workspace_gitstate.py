@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_gitstate import read_git_state, read_index
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+
+
+def git(path, *args):
+    return subprocess.run(["git", *args], cwd=path, check=True, capture_output=True, text=True).stdout
+
+
+def make_repo(path, files):
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    past = time.time() - 60
+    for name, content in files.items():
+        target = path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content, encoding="utf-8")
+        # Older than the index, so entries are not racily clean
+        os.utime(target, (past, past))
+    git(path, "add", ".")
+    git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+def git_dirty(path):
+    return bool(git(path, "status", "--porcelain").strip())
+
+
+def test_non_repository(tmp_path):
+    state = read_git_state(tmp_path)
+    assert state["is_repo"] is False
+    assert state["source"] == "files"
+
+
+def test_clean_repository_needs_no_git(tmp_path, git_identity):
+    repo = make_repo(tmp_path / "p", {"main.py": "print(1)\n", "pkg/mod.py": "x = 1\n",
+                                      ".gitignore": "*.log\nbuild/\n"})
+    (repo / "debug.log").write_text("ignored\n", encoding="utf-8")
+    (repo / "build").mkdir()
+    (repo / "build" / "out.txt").write_text("ignored\n", encoding="utf-8")
+
+    state = read_git_state(repo, fallback=False)
+    assert state == {"is_repo": True, "branch": "main", "head": git(repo, "rev-parse", "HEAD").strip(),
+                     "has_remote": False, "remote": None, "dirty": False, "source": "files"}
+    assert git_dirty(repo) is False
+
+
+def test_packed_objects_refs_and_index_v4(tmp_path, git_identity):
+    repo = make_repo(tmp_path / "p", {"a.txt": "a\n", "deep/nested/b.txt": "b\n"})
+    git(repo, "gc", "-q")
+    git(repo, "pack-refs", "--all")
+    git(repo, "update-index", "--index-version", "4")
+    assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+    assert {entry[0] for entry in read_index(repo / ".git")["entries"]} == {"a.txt", "deep/nested/b.txt"}
+
+    state = read_git_state(repo, fallback=False)
+    assert (state["branch"], state["dirty"], state["source"]) == ("main", False, "files")
+
+
+@pytest.mark.parametrize("change", ["modify", "delete", "stage", "untracked", "touch"])
+def test_dirty_state_matches_git(tmp_path, git_identity, change):
+    repo = make_repo(tmp_path / "p", {"main.py": "print(1)\n", "other.py": "y = 2\n"})
+    if change == "modify":
+        (repo / "main.py").write_text("print(12)\n", encoding="utf-8")
+    elif change == "delete":
+        (repo / "other.py").unlink()
+    elif change == "stage":
+        (repo / "new.py").write_text("z = 3\n", encoding="utf-8")
+        git(repo, "add", "new.py")
+    elif change == "untracked":
+        (repo / "new.py").write_text("z = 3\n", encoding="utf-8")
+    elif change == "touch":
+        # Same size, new mtime: only git can tell whether the content changed
+        os.utime(repo / "main.py")
+
+    state = read_git_state(repo)
+    assert state["dirty"] == git_dirty(repo)
+    # git add invalidates the cache-tree, so staged changes also need git
+    expected_source = "git" if change in ("stage", "untracked", "touch") else "files"
+    assert state["source"] == expected_source
+
+
+def test_detached_head_and_remote(tmp_path, git_identity):
+    repo = make_repo(tmp_path / "p", {"main.py": "print(1)\n"})
+    git(repo, "remote", "add", "origin", "https://example.com/p.git")
+    head = git(repo, "rev-parse", "HEAD").strip()
+    git(repo, "checkout", "-q", "--detach")
+
+    state = read_git_state(repo, fallback=False)
+    assert (state["branch"], state["head"], state["has_remote"]) == (None, head, True)
+    assert state["remote"] == "https://example.com/p.git"
+
+
+def test_empty_repository(tmp_path, git_identity):
+    repo = tmp_path / "p"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "trunk")
+    state = read_git_state(repo, fallback=False)
+    assert (state["branch"], state["head"], state["dirty"]) == ("trunk", None, False)
+
+
+@pytest.mark.parametrize("file_mode", ["true", "false"])
+def test_exec_bit_follows_core_filemode(tmp_path, git_identity, file_mode):
+    repo = make_repo(tmp_path / "p", {"main.py": "print(1)\n"})
+    git(repo, "config", "core.fileMode", file_mode)
+    os.chmod(repo / "main.py", 0o755)
+
+    state = read_git_state(repo)
+    assert state["dirty"] is git_dirty(repo) is (file_mode == "true")
+    assert state["source"] == "files"
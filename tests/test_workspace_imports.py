@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_imports import ImportGraph, resolve_imports
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_resolve_relative_imports():
+    imports = [("config", 1, ["get_setting"]), ("", 2, ["helpers"]), ("os", 0, [])]
+    assert resolve_imports("shared/utils/api_client.py", imports) == {
+        "shared.utils.config",
+        "shared.utils.config.get_setting",
+        "shared",
+        "shared.helpers",
+        "os",
+    }
+    assert resolve_imports("src/pkg/__init__.py", [("core", 1, ["Engine"])]) == {
+        "pkg.core",
+        "pkg.core.Engine",
+    }
+
+
+def test_graph_queries_and_incremental_reindex(tmp_path):
+    write(tmp_path / "lib" / "shared" / "utils" / "__init__.py", "from .api_client import APIClient\n")
+    write(tmp_path / "lib" / "shared" / "utils" / "api_client.py", "import json\n")
+    write(tmp_path / "app" / "main.py", "from shared.utils import api_client\n")
+    write(tmp_path / "app" / "other.py", "import os\n")
+    projects = [{"name": "lib", "path": tmp_path / "lib"}, {"name": "app", "path": tmp_path / "app"}]
+
+    with ImportGraph(tmp_path, jobs=1) as graph:
+        assert graph.index(projects) == {"lib": 2, "app": 2}
+        assert graph.importers("shared.utils.api_client") == [
+            ("app", "main.py"),
+            ("lib", "shared/utils/__init__.py"),
+        ]
+        assert graph.dependencies() == {"app": {"lib"}}
+        assert graph.dependents("lib") == {"app"}
+
+        assert graph.index(projects) == {}
+        write(tmp_path / "app" / "other.py", "import shared\n")
+        assert graph.index(projects) == {"app": 1}
+        assert ("app", "other.py") in graph.importers("shared")
+
+
+def test_own_modules_are_not_cross_project_edges(tmp_path):
+    for name in ("alpha", "beta"):
+        write(tmp_path / name / "utils.py", "def helper():\n    pass\n")
+        write(tmp_path / name / "main.py", "import utils\n")
+    write(tmp_path / "gamma" / "main.py", "import utils\n")
+    projects = [{"name": name, "path": tmp_path / name} for name in ("alpha", "beta", "gamma")]
+
+    with ImportGraph(tmp_path, jobs=1) as graph:
+        graph.index(projects)
+        # gamma has no utils of its own, so its import may come from either
+        assert graph.dependencies() == {"gamma": {"alpha", "beta"}}
+        assert graph.dependents("alpha") == {"gamma"}
@@ -0,0 +1,53 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_index import WorkspaceIndex
+
+
+def make_workspace(root, names):
+    root.joinpath("clone_summary.json").write_text(
+        json.dumps({"repositories": [{"name": name} for name in names]}), encoding="utf-8"
+    )
+    for name in names:
+        package = root / name / "pkg"
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("x = 1\n", encoding="utf-8")
+
+
+def test_refresh_records_projects(tmp_path):
+    make_workspace(tmp_path, ["alpha", "beta"])
+    with WorkspaceIndex(tmp_path) as index:
+        records = index.refresh()
+    assert [r["name"] for r in records] == ["alpha", "beta"]
+    assert records[0]["type"] == "Python"
+    assert records[0]["file_count"] == 1
+    assert records[0]["total_size"] == 6
+
+
+def test_refresh_picks_up_changed_directories(tmp_path):
+    make_workspace(tmp_path, ["alpha"])
+    with WorkspaceIndex(tmp_path) as index:
+        index.refresh()
+    (tmp_path / "alpha" / "package.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "alpha" / "pkg" / "__init__.py").unlink()
+    with WorkspaceIndex(tmp_path) as index:
+        (record,) = index.refresh()
+    assert record["type"] == "Node.js"
+    assert record["file_count"] == 1
+
+
+def test_project_cloned_later_shows_up(tmp_path):
+    make_workspace(tmp_path, ["alpha", "beta"])
+    (tmp_path / "beta" / "pkg" / "__init__.py").unlink()
+    (tmp_path / "beta" / "pkg").rmdir()
+    (tmp_path / "beta").rmdir()
+    with WorkspaceIndex(tmp_path) as index:
+        assert index.project_names() == ["alpha"]
+    # Cloned after the inventory was cached; clone_summary.json is untouched
+    (tmp_path / "beta").mkdir()
+    with WorkspaceIndex(tmp_path) as index:
+        assert index.project_names() == ["alpha", "beta"]
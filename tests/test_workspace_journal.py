@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_journal import PushJournal
+from workspace_orchestrator import GitCommandError, GitOrchestrator, backoff_delay, is_transient
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+
+
+def make_projects(root, count):
+    projects = []
+    for index in range(count):
+        path = root / f"p{index}"
+        path.mkdir(parents=True)
+        (path / "main.py").write_text(f"print({index})\n", encoding="utf-8")
+        projects.append({"name": f"p{index}", "path": path})
+    return projects
+
+
+def make_remote(remotes, name, transient_failures=0):
+    """A bare remote whose pre-receive hook fails like a flaky server the first N pushes."""
+    remote = remotes / f"{name}.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    if transient_failures:
+        hook = remote / "hooks" / "pre-receive"
+        hook.write_text(
+            "#!/bin/sh\n"
+            "count=$(cat \"$GIT_DIR/attempts\" 2>/dev/null || echo 0)\n"
+            "echo $((count + 1)) > \"$GIT_DIR/attempts\"\n"
+            f"if [ \"$count\" -lt {transient_failures} ]; then\n"
+            "  echo 'error: RPC failed; HTTP 503 curl 22' >&2\n"
+            "  exit 1\n"
+            "fi\n",
+            encoding="utf-8",
+        )
+        os.chmod(hook, 0o755)
+    return remote
+
+
+def remote_head(remote):
+    return subprocess.run(["git", "rev-parse", "HEAD"], cwd=remote, capture_output=True, text=True).stdout.strip()
+
+
+def test_transient_push_failures_are_retried(tmp_path, git_identity):
+    remotes = tmp_path / "remotes"
+    projects = make_projects(tmp_path / "work", 2)
+    make_remote(remotes, "p0", transient_failures=2)
+    make_remote(remotes, "p1")
+
+    with PushJournal(tmp_path) as journal:
+        orchestrator = GitOrchestrator(remote_url=str(remotes / "{name}.git"), push=True,
+                                       backoff=0.01, journal=journal)
+        results = {result["name"]: result for result in orchestrator.run_all(projects)}
+
+        assert all(result["ok"] for result in results.values())
+        assert results["p0"]["attempts"]["push"] == 3
+        assert results["p1"]["attempts"]["push"] == 1
+        assert any(line.startswith("🔁 push failed for p0") for line in results["p0"]["log"])
+        assert journal.is_complete("p0", ("init", "commit", "remote", "push"))
+        assert journal.finish()
+    assert remote_head(remotes / "p0.git")
+
+
+def test_rerun_resumes_from_the_failed_stage(tmp_path, git_identity):
+    remotes = tmp_path / "remotes"
+    projects = make_projects(tmp_path / "work", 3)
+    make_remote(remotes, "p0")
+    make_remote(remotes, "p1")
+    # p2's remote does not exist yet: a permanent failure, not retried
+
+    with PushJournal(tmp_path) as journal:
+        orchestrator = GitOrchestrator(remote_url=str(remotes / "{name}.git"), push=True,
+                                       backoff=0.01, journal=journal)
+        results = {result["name"]: result for result in orchestrator.run_all(projects)}
+        assert [name for name, result in results.items() if not result["ok"]] == ["p2"]
+        assert results["p2"]["attempts"]["push"] == 1
+        assert [(failure["project"], failure["stage"]) for failure in journal.failures()] == [("p2", "push")]
+        assert not journal.finish()
+        first_run = journal.run_id
+
+    make_remote(remotes, "p2")
+    with PushJournal(tmp_path) as journal:
+        assert journal.resumed and journal.run_id == first_run
+        orchestrator = GitOrchestrator(remote_url=str(remotes / "{name}.git"), push=True,
+                                       backoff=0.01, journal=journal)
+        results = {result["name"]: result for result in orchestrator.run_all(projects)}
+
+        assert all(result["ok"] for result in results.values())
+        # Completed projects run no stage at all; p2 only retries its push
+        assert results["p0"]["stages"] == {} and results["p0"]["skipped"] == ["commit", "remote", "push"]
+        assert list(results["p2"]["stages"]) == ["push"]
+        assert journal.finish()
+    assert remote_head(remotes / "p2.git")
+
+    with PushJournal(tmp_path) as journal:
+        assert not journal.resumed and journal.run_id != first_run
+
+
+def test_restart_abandons_unfinished_run(tmp_path):
+    with PushJournal(tmp_path) as journal:
+        journal.failed("p0", "push", "boom")
+        first_run = journal.run_id
+    with PushJournal(tmp_path, restart=True) as journal:
+        assert not journal.resumed and journal.run_id != first_run
+        assert journal.completed("p0") == set()
+
+
+def test_backoff_and_transient_classification():
+    for attempt in range(1, 8):
+        delay = backoff_delay(attempt, 1.0, 10.0)
+        ceiling = min(10.0, 2 ** (attempt - 1))
+        assert ceiling / 2 <= delay <= ceiling
+    assert is_transient(GitCommandError(("push",), 128, "fatal: unable to access: Could not resolve host: github.com"))
+    assert not is_transient(GitCommandError(("push",), 1, "! [rejected] main -> main (non-fast-forward)"))
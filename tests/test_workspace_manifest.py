@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import workspace_manifest
+from workspace_manifest import ManifestStore, hash_file
+
+
+def test_changes_since_mark(tmp_path):
+    project = tmp_path / "alpha"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "main.py").write_text("print('hi')\n", encoding="utf-8")
+    (project / "README.md").write_text("alpha\n", encoding="utf-8")
+    (project / "venv").mkdir()
+    (project / "venv" / "ignored.py").write_text("", encoding="utf-8")
+
+    with ManifestStore(tmp_path) as store:
+        assert store.update("alpha") == 2
+        assert store.changed_since("alpha", "push")
+        store.mark("alpha", "push")
+        assert not store.changed_since("alpha", "push")
+
+        # Rewriting identical bytes only costs a re-hash, not a change.
+        (project / "README.md").write_text("alpha\n", encoding="utf-8")
+        assert not store.needs_update("alpha", "push")
+
+        (project / "src" / "main.py").write_text("print('bye')\n", encoding="utf-8")
+        (project / "README.md").unlink()
+        (project / "setup.py").write_text("", encoding="utf-8")
+        assert store.update("alpha") == 2
+        assert store.changes("alpha", "push") == {
+            "added": ["setup.py"],
+            "removed": ["README.md"],
+            "modified": ["src/main.py"],
+        }
+        assert store.changed_since("alpha", "push")
+
+
+def test_excluded_outputs_and_inputs(tmp_path):
+    project = tmp_path / "alpha"
+    project.mkdir()
+    (project / "main.py").write_text("print(1)\n", encoding="utf-8")
+    (project / "TASK_LIST.md").write_text("- [ ] one\n", encoding="utf-8")
+
+    with ManifestStore(tmp_path) as store:
+        store.update("alpha")
+        store.mark("alpha", "tasks", inputs="v1")
+        check = dict(exclude=("TASK_LIST.md",), inputs="v1")
+
+        # Edits to the generated file itself are not a change, its removal neither
+        (project / "TASK_LIST.md").write_text("- [x] one\n", encoding="utf-8")
+        assert not store.needs_update("alpha", "tasks", **check)
+        (project / "TASK_LIST.md").unlink()
+        assert not store.needs_update("alpha", "tasks", **check)
+        assert store.changed_since("alpha", "tasks")
+
+        assert store.changed_since("alpha", "tasks", exclude=("TASK_LIST.md",), inputs="v2")
+        (project / "main.py").write_text("print(2)\n", encoding="utf-8")
+        assert store.needs_update("alpha", "tasks", **check)
+
+
+def test_large_files_hash_like_small_ones(tmp_path, monkeypatch):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"x" * 5000)
+    small = hash_file(str(path))
+    monkeypatch.setattr(workspace_manifest, "MMAP_THRESHOLD", 1024)
+    monkeypatch.setattr(workspace_manifest, "CHUNK_SIZE", 1000)
+    assert hash_file(str(path)) == small
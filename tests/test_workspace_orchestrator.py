@@ -0,0 +1,131 @@
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_orchestrator import GitOrchestrator, run_git
+
+
+class FakeStages(GitOrchestrator):
+    """Stages that sleep instead of running git, recording concurrency."""
+
+    def __init__(self, fail=(), **kwargs):
+        super().__init__(**kwargs)
+        self.fail = set(fail)
+        self.running = {"commit": 0, "remote": 0, "push": 0}
+        self.peak = dict(self.running)
+        self.overlap = False
+
+    async def _stage(self, stage, project, delay):
+        self.running[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.running[stage])
+        if stage == "commit" and self.running["push"]:
+            self.overlap = True
+        try:
+            await asyncio.sleep(delay)
+            if (project["name"], stage) in self.fail:
+                raise RuntimeError(f"{stage} broke")
+        finally:
+            self.running[stage] -= 1
+
+    async def _commit(self, project, log):
+        await self._stage("commit", project, 0.01)
+
+    async def _remote(self, project, log):
+        await self._stage("remote", project, 0)
+
+    async def _push(self, project, log):
+        await self._stage("push", project, 0.05)
+
+
+def projects(count):
+    return [{"name": f"p{index}", "path": Path(f"p{index}")} for index in range(count)]
+
+
+def test_stage_limits_and_pipelining():
+    orchestrator = FakeStages(limits={"commit": 1, "push": 2}, push=True)
+    results = orchestrator.run_all(projects(6))
+    assert len(results) == 6 and all(result["ok"] for result in results)
+    assert orchestrator.peak["commit"] == 1
+    assert orchestrator.peak["push"] == 2
+    assert orchestrator.overlap
+
+
+def test_fail_fast_cancels_remaining_projects():
+    orchestrator = FakeStages(limits={"commit": 1}, push=True, fail_fast=True, fail={("p0", "commit")})
+    seen = []
+    results = orchestrator.run_all(projects(5), on_result=seen.append)
+    assert results == seen
+    by_name = {result["name"]: result for result in results}
+    assert set(by_name) == {f"p{index}" for index in range(5)}
+    assert by_name["p0"]["stage"] == "commit" and "broke" in by_name["p0"]["error"]
+    assert any(result["error"] == "cancelled" for result in results)
+
+
+def test_stage_timeout_kills_git(tmp_path):
+    class Hanging(GitOrchestrator):
+        async def _commit(self, project, log):
+            await run_git(project["path"], "-c", "alias.hang=!sleep 5", "hang")
+
+    start = time.perf_counter()
+    [result] = Hanging(timeouts={"commit": 0.2}).run_all([{"name": "slow", "path": tmp_path}])
+    assert time.perf_counter() - start < 3
+    assert not result["ok"]
+    assert result["stage"] == "commit" and "timed out" in result["error"]
+
+
+def test_pushes_to_local_bare_remotes(tmp_path, monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+    remotes = tmp_path / "remotes"
+    items = []
+    for index in range(3):
+        subprocess.run(["git", "init", "-q", "--bare", str(remotes / f"p{index}.git")], check=True)
+        path = tmp_path / f"p{index}"
+        path.mkdir()
+        (path / "README.md").write_text(f"p{index}\n", encoding="utf-8")
+        items.append({"name": f"p{index}", "path": path})
+
+    orchestrator = GitOrchestrator(remote_url=str(remotes / "{name}.git"), push=True)
+    results = orchestrator.run_all(items)
+    assert all(result["ok"] for result in results), results
+    assert set(results[0]["stages"]) == {"commit", "remote", "push"}
+    for index in range(3):
+        refs = subprocess.run(["git", "for-each-ref"], cwd=remotes / f"p{index}.git",
+                              capture_output=True, text=True, check=True)
+        assert "refs/heads/" in refs.stdout
+
+
+def test_existing_repository_history_is_left_alone(tmp_path, monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+    path = tmp_path / "proj"
+    path.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    (path / "main.py").write_text("print(1)\n", encoding="utf-8")
+    (path / ".gitignore").write_text("secret.txt\n", encoding="utf-8")
+    subprocess.run(["git", "add", "."], cwd=path, check=True)
+    subprocess.run(["git", "commit", "-qm", "real history"], cwd=path, check=True)
+    # Uncommitted work in progress and an ignored file
+    (path / "main.py").write_text("print(2)\n", encoding="utf-8")
+    (path / "secret.txt").write_text("token\n", encoding="utf-8")
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True).stdout
+
+    [result] = GitOrchestrator(remote_url=str(tmp_path / "{name}.git")).run_all(
+        [{"name": "proj", "path": path, "has_git": True}])
+
+    assert result["ok"], result
+    assert list(result["stages"]) == ["remote"]
+    assert subprocess.run(["git", "rev-parse", "HEAD"], cwd=path, capture_output=True, text=True).stdout == head
+    status = subprocess.run(["git", "status", "--porcelain"], cwd=path, capture_output=True, text=True).stdout
+    assert status.splitlines() == [" M main.py"]
@@ -0,0 +1,43 @@
+import json
+import sys
+from argparse import Namespace
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_profile import Profiler
+
+
+def test_disabled_spans_record_nothing():
+    profiler = Profiler()
+    first = profiler.span("scan")
+    with first, profiler.span("write", "alpha"):
+        pass
+    assert first is profiler.span("render")
+    assert profiler.events == []
+
+
+def test_summary_trace_and_cprofile(tmp_path, capsys, monkeypatch):
+    profiler = Profiler()
+    args = Namespace(profile=True, profile_phase="render",
+                     profile_trace=str(tmp_path / "trace.json"))
+    profiler.configure(args)
+    with profiler.span("scan"):
+        pass
+    for name in ("alpha", "beta"):
+        with profiler.span("render", name):
+            sum(range(1000))
+
+    rows = {row["phase"]: row for row in profiler.summary()}
+    assert rows["render"]["count"] == 2
+    assert rows["scan"]["count"] == 1
+
+    monkeypatch.chdir(tmp_path)
+    profiler.report(args)
+    trace = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))
+    events = trace["traceEvents"]
+    assert {event["name"] for event in events} == {"scan", "render alpha", "render beta"}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert (tmp_path / "profile_render.prof").exists()
+    assert "render" in capsys.readouterr().out
@@ -0,0 +1,46 @@
+import os
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_progress import ProgressAggregator, scan_checkboxes
+
+
+def test_scan_checkboxes_counts_per_section(tmp_path):
+    path = tmp_path / "TASK_LIST.md"
+    path.write_text(
+        "# Title\n- [x] before any section\n"
+        "## 🚀 **Goals**\n### **Sub**\n- [ ] a\n  - [X] nested\n* [x] star\n"
+        "## Done\n- [x] b\nnot - [ ] a checkbox\n",
+        encoding="utf-8",
+    )
+    assert scan_checkboxes(str(path)) == {"": [1, 1], "🚀 Goals": [2, 3], "Done": [1, 1]}
+
+
+def test_aggregate_finds_nested_lists_and_rereads_only_changes(tmp_path):
+    nested = tmp_path / "trading-platform" / "services" / "api"
+    nested.mkdir(parents=True)
+    (nested / "TASK_LIST.md").write_text("## Work\n- [x] one\n- [ ] two\n", encoding="utf-8")
+    (tmp_path / "alpha").mkdir()
+    alpha = tmp_path / "alpha" / "TASK_LIST.md"
+    alpha.write_text("## Work\n- [ ] three\n", encoding="utf-8")
+    (tmp_path / "alpha" / "node_modules").mkdir()
+    (tmp_path / "alpha" / "node_modules" / "TASK_LIST.md").write_text("- [ ] ignored\n", encoding="utf-8")
+
+    with ProgressAggregator(tmp_path) as aggregator:
+        progress = aggregator.aggregate()
+        assert aggregator.rescanned == 2
+        assert list(progress["files"]) == ["alpha", "trading-platform/services/api"]
+        assert (progress["done"], progress["total"]) == (1, 3)
+        assert progress["sections"] == {"Work": [1, 3]}
+
+        assert aggregator.aggregate() == progress
+        assert aggregator.rescanned == 0
+
+        alpha.write_text("## Work\n- [x] three\n", encoding="utf-8")
+        os.utime(alpha, ns=(1, 1))
+        progress = aggregator.aggregate()
+        assert aggregator.rescanned == 1
+        assert progress["files"]["alpha"]["done"] == 1
@@ -0,0 +1,147 @@
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_split import HistorySplitter, parse_commit, push_splits
+
+
+@pytest.fixture
+def git_identity(monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Workspace Test")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "test@example.com")
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def commit(repo, files, message):
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            git(repo, "rm", "-rq", name)
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        git(repo, "add", name)
+    git(repo, "commit", "-qm", message)
+
+
+@pytest.fixture
+def monorepo(tmp_path, git_identity):
+    repo = tmp_path / "mono"
+    repo.mkdir()
+    git(repo, "init", "-q", "-b", "main")
+    commit(repo, {"a/main.py": "a1\n", "README.md": "mono\n"}, "add a")
+    commit(repo, {"b/index.js": "b1\n"}, "add b")
+    commit(repo, {"a/main.py": "a2\n", "group/c/lib.py": "c1\n"}, "change a, add c")
+    commit(repo, {"README.md": "mono 2\n"}, "root only")
+    commit(repo, {"b/index.js": "b2\n", "a/util.py": "u\n"}, "change a and b")
+    return repo
+
+
+def split_log(repo, project):
+    return git(repo, "log", "--format=%s", f"refs/split/{project}").splitlines()
+
+
+def test_single_pass_split_matches_each_subtree(monorepo, tmp_path):
+    with HistorySplitter(monorepo, ["a", "b", "group/c"], db_path=tmp_path / "index.sqlite") as splitter:
+        tips = splitter.run()
+        assert splitter.walked == 5
+
+    assert split_log(monorepo, "a") == ["change a and b", "change a, add c", "add a"]
+    assert split_log(monorepo, "b") == ["change a and b", "add b"]
+    assert split_log(monorepo, "group/c") == ["change a, add c"]
+    for project, tip in tips.items():
+        assert git(monorepo, "rev-parse", f"{tip}^{{tree}}") == git(monorepo, "rev-parse", f"HEAD:{project}")
+    # Authorship and dates carry over, and the objects are valid
+    assert git(monorepo, "log", "-1", "--format=%an %at", tips["a"]) == git(monorepo, "log", "-1", "--format=%an %at")
+    git(monorepo, "fsck", "--strict")
+
+
+def test_incremental_run_walks_only_new_commits(monorepo, tmp_path):
+    with HistorySplitter(monorepo, ["a", "b"], db_path=tmp_path / "index.sqlite") as splitter:
+        splitter.run()
+
+    git(monorepo, "checkout", "-qb", "feature")
+    commit(monorepo, {"a/feature.py": "f\n"}, "feature on a")
+    git(monorepo, "checkout", "-q", "main")
+    commit(monorepo, {"b/index.js": "b3\n"}, "change b again")
+    git(monorepo, "merge", "-q", "--no-edit", "feature")
+    commit(monorepo, {"b": None}, "drop b")
+
+    with HistorySplitter(monorepo, ["a", "b", "group/c"], db_path=tmp_path / "index.sqlite") as splitter:
+        tips = splitter.run()
+        # a and b continue from the last split; group/c is new and needs the full history
+        assert splitter.walked == 4 + 9
+
+    with HistorySplitter(monorepo, ["a", "b", "group/c"], db_path=tmp_path / "fresh.sqlite") as fresh:
+        assert fresh.run() == tips
+
+    # Neither project changed on both sides of the merge, so no split merge commit is needed
+    assert split_log(monorepo, "a") == ["feature on a", "change a and b", "change a, add c", "add a"]
+    # b's history is kept where it stopped once the directory was removed
+    assert split_log(monorepo, "b")[0] == "change b again"
+
+    with HistorySplitter(monorepo, ["a", "b", "group/c"], db_path=tmp_path / "index.sqlite") as splitter:
+        assert splitter.run() == tips
+        assert splitter.walked == 0 and splitter.created == 0
+
+
+def test_signatures_are_dropped_and_split_is_pushed(monorepo, tmp_path):
+    tree, headers, message = parse_commit(
+        b"tree 1111\nparent 2222\nauthor A <a> 1 +0000\ncommitter C <c> 1 +0000\n"
+        b"gpgsig -----BEGIN PGP SIGNATURE-----\n sig\n -----END PGP SIGNATURE-----\n\nmessage\n"
+    )
+    assert (tree, headers, message) == ("1111", [b"author A <a> 1 +0000", b"committer C <c> 1 +0000"], b"message\n")
+
+    with HistorySplitter(monorepo, ["a", "group/c"], db_path=tmp_path / "index.sqlite") as splitter:
+        tips = splitter.run()
+    remotes = tmp_path / "remotes"
+    for name in ("a", "c"):
+        subprocess.run(["git", "init", "-q", "--bare", str(remotes / f"{name}.git")], check=True)
+
+    errors = asyncio.run(push_splits(monorepo, tips, str(remotes / "{name}.git"), backoff=0.01))
+    assert errors == {}
+    assert git(remotes / "a.git", "rev-parse", "main") == tips["a"]
+    assert git(remotes / "c.git", "rev-parse", "main") == tips["group/c"]
+
+
+def test_merge_changing_a_project_on_both_sides_is_kept(monorepo, tmp_path):
+    git(monorepo, "checkout", "-qb", "feature")
+    commit(monorepo, {"a/feature.py": "f\n"}, "feature on a")
+    git(monorepo, "checkout", "-q", "main")
+    commit(monorepo, {"a/main.py": "a3\n"}, "change a on main")
+    git(monorepo, "merge", "-q", "--no-edit", "feature")
+
+    with HistorySplitter(monorepo, ["a"], db_path=tmp_path / "index.sqlite") as splitter:
+        tip = splitter.run()["a"]
+    assert len(git(monorepo, "log", "-1", "--format=%P", tip).split()) == 2
+    assert git(monorepo, "rev-parse", f"{tip}^{{tree}}") == git(monorepo, "rev-parse", "HEAD:a")
+
+
+def test_project_split_less_often_walks_from_its_own_tip(monorepo, tmp_path):
+    db_path = tmp_path / "index.sqlite"
+    with HistorySplitter(monorepo, ["a", "b"], db_path=db_path) as splitter:
+        splitter.run()
+    commit(monorepo, {"b/index.js": "b3\n"}, "change b")
+    with HistorySplitter(monorepo, ["a"], db_path=db_path) as splitter:
+        splitter.run()
+    commit(monorepo, {"a/main.py": "a3\n"}, "change a")
+
+    with HistorySplitter(monorepo, ["a", "b"], db_path=db_path) as splitter:
+        tips = splitter.run()
+        # a resumes after "change b", b after "change a and b"
+        assert splitter.walked == 1 + 2
+    assert split_log(monorepo, "b")[:2] == ["change b", "change a and b"]
+
+    with HistorySplitter(monorepo, ["a", "b"], db_path=tmp_path / "fresh.sqlite") as fresh:
+        assert fresh.run() == tips
@@ -0,0 +1,97 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_state import ProjectStateStore
+
+
+def scanned(name, type_="Python", has_git=False, remote=None, has_remote=False):
+    return {"name": name, "path": f"/ws/{name}", "type": type_, "has_git": has_git,
+            "has_task_list": True, "branch": "main" if has_git else None, "dirty": None,
+            "has_remote": None if has_remote is None else has_remote or remote is not None, "remote": remote}
+
+
+def test_sync_query_and_status_survive_rescans(tmp_path):
+    with ProjectStateStore(tmp_path) as store:
+        store.sync([scanned("a"), scanned("b", has_git=True), scanned("c", "Node.js"), scanned("gone")])
+        assert store.set_status("b", "pushed", has_remote=True, remote="https://example.com/b.git")
+        assert not store.set_status("missing", "failed")
+
+        # The scan could not decide about b's remotes (config includes): keep what was recorded
+        store.sync([scanned("a"), scanned("b", has_git=True, has_remote=None), scanned("c", "Node.js")])
+
+        assert [row["name"] for row in store.query(type="Python", has_git=False)] == ["a"]
+        assert store.get("gone") is None
+        b = store.get("b")
+        assert (b["status"], b["remote"], b["has_git"]) == ("pushed", "https://example.com/b.git", True)
+        assert b["has_remote"] is True
+        assert store.counts("status") == {"pending": 2, "pushed": 1}
+        assert [row["name"] for row in store.query(remote="https://example.com/b.git")] == ["b"]
+        with pytest.raises(ValueError):
+            store.update("a", status="bogus")
+        with pytest.raises(ValueError):
+            store.update("a", path="/elsewhere")
+
+
+def test_parallel_workers_update_single_rows(tmp_path):
+    names = [f"p{index}" for index in range(40)]
+    with ProjectStateStore(tmp_path) as store:
+        store.sync([scanned(name) for name in names])
+    errors = []
+
+    def worker(offset):
+        try:
+            # Each worker has its own connection, as parallel push workers would
+            with ProjectStateStore(tmp_path, timeout=10) as own:
+                for index in range(offset, len(names), 4):
+                    own.set_status(names[index], "committed")
+                    own.set_status(names[index], "pushed", remote=f"origin-{index}")
+                    own.update("p0", error=f"touched by {offset}")
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with ProjectStateStore(tmp_path) as store:
+        assert store.counts("status") == {"pushed": 40}
+        assert {row["remote"] for row in store.query()} == {f"origin-{index}" for index in range(40)}
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_export_keeps_project_config_layout(tmp_path):
+    with ProjectStateStore(tmp_path) as store:
+        store.sync([scanned("a"), scanned("b", has_git=True, remote="https://example.com/b.git")])
+        store.set_status("b", "pushed")
+        store.export_json(tmp_path / "project_config.json")
+
+    config = json.loads((tmp_path / "project_config.json").read_text(encoding="utf-8"))
+    assert config["total_projects"] == 2
+    assert config["projects"]["a"]["status"] == "pending"
+    assert config["projects"]["b"] == {
+        "type": "Python", "has_git": True, "branch": "main", "has_remote": True, "dirty": None,
+        "has_task_list": True, "remote_url": "https://example.com/b.git", "status": "pushed",
+    }
+
+
+def test_has_remote_is_scanned_separately_from_origin(tmp_path):
+    with ProjectStateStore(tmp_path) as store:
+        # An "upstream" remote but no origin URL
+        store.sync([scanned("a", has_git=True, has_remote=True),
+                    scanned("b", has_git=True, remote="https://example.com/b.git")])
+        assert store.to_config()["projects"]["a"]["has_remote"] is True
+
+        # b's remote was removed: the rescan decides, so the old URL is dropped
+        store.sync([scanned("a", has_git=True, has_remote=True), scanned("b", has_git=True)])
+        b = store.to_config()["projects"]["b"]
+        assert (b["has_remote"], b["remote_url"]) == (False, None)
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import workspace_stats
+from workspace_stats import WorkspaceStats, count_lines
+
+
+def test_count_lines_handles_missing_trailing_newline(tmp_path, monkeypatch):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"a\nb\nc")
+    assert count_lines(str(path)) == 3
+    path.write_bytes(b"")
+    assert count_lines(str(path)) == 0
+    path.write_bytes(b"x\n" * 5000)
+    monkeypatch.setattr(workspace_stats, "MMAP_THRESHOLD", 1024)
+    monkeypatch.setattr(workspace_stats, "COUNT_CHUNK", 999)
+    assert count_lines(str(path)) == 5000
+
+
+def test_project_stats_per_language_and_cached(tmp_path):
+    project = tmp_path / "alpha"
+    (project / "node_modules").mkdir(parents=True)
+    (project / "node_modules" / "dep.js").write_text("x\n", encoding="utf-8")
+    (project / "main.py").write_text("import os\n\nprint(os.name)\n", encoding="utf-8")
+    (project / "README.md").write_text("# Alpha\n", encoding="utf-8")
+    (project / "logo.png").write_bytes(b"\x89PNG\n\n")
+
+    with WorkspaceStats(tmp_path) as stats:
+        result = stats.project_stats("alpha")
+        assert result["files"] == 3
+        assert result["lines"] == 4
+        assert result["languages"]["Python"] == {"files": 1, "bytes": 26, "lines": 3}
+        assert result["languages"]["Other"] == {"files": 1, "bytes": 6, "lines": 0}
+        assert stats.project_stats("alpha") == result
+
+        (project / "README.md").write_text("# Alpha\n\nMore.\n", encoding="utf-8")
+        assert stats.project_stats("alpha")["languages"]["Markdown"]["lines"] == 3
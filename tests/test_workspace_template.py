@@ -0,0 +1,49 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import generate_task_lists
+from workspace_template import Template, keep_existing
+
+
+def test_template_fills_slots_and_keeps_literal_braces():
+    template = Template("# {title}\n{{not a slot}} {title} / {count}\n")
+    assert template.fields == {"title", "count"}
+    assert template.render({"title": "Alpha", "count": 3}) == "# Alpha\n{not a slot} Alpha / 3\n"
+    rendered = template.render_many([{"title": "A", "count": 1}, {"title": "B", "count": 2}])
+    assert list(rendered) == ["# A\n{not a slot} A / 1\n", "# B\n{not a slot} B / 2\n"]
+    with pytest.raises(ValueError):
+        Template("{value:>10}")
+
+
+def test_keep_existing_ignores_only_masked_lines():
+    template = Template("# {title}\n**Updated**: {date}\n{date}\n")
+    assert template.line_prefixes(["date"]) == ("**Updated**: ", "")
+    prefixes = template.line_prefixes(["date"])
+    old = template.render({"title": "A", "date": "2024-01-01"})
+    assert old == "# A\n**Updated**: 2024-01-01\n2024-01-01\n"
+    same = "# A\n**Updated**: 2024-02-01\n2024-01-01\n"
+    assert keep_existing(same, old, prefixes) is old
+    # The unmasked copy of the date, or any other line, still counts
+    assert keep_existing(template.render({"title": "A", "date": "2024-02-01"}), old, prefixes) != old
+    assert keep_existing("# B\n**Updated**: 2024-02-01\n2024-01-01\n", old, prefixes).startswith("# B")
+    assert keep_existing(old, None, prefixes) == old
+
+
+def test_task_list_rendering_uses_shared_dates():
+    dates = generate_task_lists.render_dates(datetime(2024, 1, 28))
+    assert dates == {"today": "2024-01-28", "next_review": "2024-02-04"}
+    repositories = [{"name": "trading-bot", "type": "Python", "path": Path("trading-bot")}]
+    [(repository, category, content)] = generate_task_lists.render_task_lists(repositories, dates)
+    assert category == "trading"
+    assert content.startswith("# Trading Bot - Beta Ready Task List\n")
+    assert "**Project Type**: Python" in content
+    assert "**Next Review**: 2024-02-04" in content
+    progress = {"files": {}, "sections": {}, "done": 0, "total": 0}
+    master = generate_task_lists.create_master_task_list(12, dates, progress)
+    assert "**Total Repositories**: 12" in master
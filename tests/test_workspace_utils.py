@@ -0,0 +1,81 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_utils import (
+    classify_projects,
+    detect_project_type,
+    get_project_directories,
+    iter_inventory,
+    load_inventory,
+)
+
+
+def make_files(root, *names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+
+
+def test_manifest_decides_type(tmp_path):
+    make_files(tmp_path, "package.json", "lib/tool.py")
+    assert detect_project_type(tmp_path) == "Node.js"
+
+
+def test_extensions_are_matched_by_suffix(tmp_path):
+    make_files(tmp_path, "public/index.php", "notes.md")
+    assert detect_project_type(tmp_path) == "PHP"
+    make_files(tmp_path / "web", "site/app.js")
+    assert detect_project_type(tmp_path / "web") == "Web"
+
+
+def test_skipped_directories_are_ignored(tmp_path):
+    make_files(
+        tmp_path,
+        "README.md",
+        "venv/Lib/site-packages/pip/setup.py",
+        "node_modules/left-pad/package.json",
+    )
+    assert detect_project_type(tmp_path) == "Documentation"
+
+
+def test_missing_path_is_unknown(tmp_path):
+    assert detect_project_type(tmp_path / "missing") == "Unknown"
+
+
+def test_classify_projects_ordered_and_unordered(tmp_path):
+    make_files(tmp_path, "py/setup.py", "node/package.json", "docs/README.md")
+    paths = [tmp_path / "py", tmp_path / "node", tmp_path / "docs"]
+    expected = [(paths[0], "Python"), (paths[1], "Node.js"), (paths[2], "Documentation")]
+    assert list(classify_projects(paths, jobs=2)) == expected
+    assert sorted(classify_projects(paths, jobs=2, ordered=False)) == sorted(expected)
+    assert list(classify_projects(paths, jobs=1)) == expected
+
+
+def test_iter_inventory_streams_repositories(tmp_path):
+    inventory = {
+        "timestamp": "2025-08-06 12:29:36",
+        "total_repositories": 1234,
+        "repositories": [{"name": f"repo-{i}", "private": False} for i in range(50)],
+        "failed": [{"name": "broken", "error": "x, ] }"}],
+    }
+    config_path = tmp_path / "clone_summary.json"
+    config_path.write_text(json.dumps(inventory, indent=2), encoding="utf-8")
+    for chunk_size in (1, 7, 1 << 16):
+        assert list(iter_inventory(config_path, chunk_size)) == inventory["repositories"]
+
+
+def test_get_project_directories_uses_cached_inventory(tmp_path):
+    config_path = tmp_path / "clone_summary.json"
+    config_path.write_text(
+        json.dumps({"repositories": [{"name": "alpha"}, {"name": "missing"}, {"name": "file"}]}),
+        encoding="utf-8",
+    )
+    (tmp_path / "alpha").mkdir()
+    (tmp_path / "file").write_text("", encoding="utf-8")
+    assert get_project_directories(tmp_path) == [tmp_path / "alpha"]
+    assert load_inventory(config_path) is load_inventory(config_path)
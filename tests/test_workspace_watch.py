@@ -0,0 +1,71 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_watch import WorkspaceWatcher, load_projects, query_daemon
+
+
+def make_workspace(root):
+    root.joinpath("clone_summary.json").write_text(
+        json.dumps({"repositories": [{"name": "alpha"}]}), encoding="utf-8"
+    )
+    (root / "alpha" / "docs").mkdir(parents=True)
+    (root / "alpha" / "docs" / "intro.md").write_text("hi", encoding="utf-8")
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_load_projects_without_daemon_uses_index(tmp_path):
+    make_workspace(tmp_path)
+    assert query_daemon(tmp_path) is None
+    (record,) = load_projects(tmp_path)
+    assert record["name"] == "alpha"
+    assert record["type"] == "Documentation"
+
+
+def test_watcher_serves_incremental_updates(tmp_path):
+    make_workspace(tmp_path)
+    watcher = WorkspaceWatcher(tmp_path, debounce=0.05, interval=0.1)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        assert wait_for(lambda: query_daemon(tmp_path, "ping") is not None)
+        (tmp_path / "alpha" / "docs" / "api").mkdir()
+        (tmp_path / "alpha" / "docs" / "api" / "setup.py").write_text("", encoding="utf-8")
+        assert wait_for(lambda: load_projects(tmp_path)[0]["type"] == "Python")
+        assert load_projects(tmp_path)[0]["file_count"] == 2
+    finally:
+        watcher.stop()
+        thread.join()
+    assert query_daemon(tmp_path) is None
+
+
+def test_watcher_picks_up_a_listed_project_cloned_later(tmp_path):
+    make_workspace(tmp_path)
+    tmp_path.joinpath("clone_summary.json").write_text(
+        json.dumps({"repositories": [{"name": "alpha"}, {"name": "beta"}]}), encoding="utf-8"
+    )
+    watcher = WorkspaceWatcher(tmp_path, debounce=0.05, interval=0.1)
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        assert wait_for(lambda: query_daemon(tmp_path, "ping") is not None)
+        assert [record["name"] for record in load_projects(tmp_path)] == ["alpha"]
+        (tmp_path / "beta").mkdir()
+        (tmp_path / "beta" / "main.py").write_text("", encoding="utf-8")
+        assert wait_for(lambda: [record["name"] for record in load_projects(tmp_path)] == ["alpha", "beta"])
+    finally:
+        watcher.stop()
+        thread.join()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the workspace root is on the Python path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from workspace_store import ContentStore
+from workspace_writer import BatchWriter, OutputWriter, atomic_write
+
+
+def test_write_skips_identical_content(tmp_path):
+    target = tmp_path / "TASK_LIST.md"
+    with OutputWriter(tmp_path) as writer:
+        assert writer.write(target, "# Tasks\n")
+        mtime = target.stat().st_mtime_ns
+        assert not writer.write(target, "# Tasks\n")
+        assert target.stat().st_mtime_ns == mtime
+        assert writer.write(target, "# Tasks\n- [ ] more\n")
+        assert writer.summary() == "wrote 2 files, skipped 1 unchanged"
+
+    # A fresh writer with no cached digest compares against the file on disk.
+    with OutputWriter(tmp_path) as writer:
+        assert not writer.write(target, "# Tasks\n- [ ] more\n")
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_atomic_write_keeps_mode(tmp_path):
+    target = tmp_path / "setup.py"
+    atomic_write(target, b"print(1)\n", mode=0o755)
+    assert target.stat().st_mode & 0o777 == 0o755
+    atomic_write(target, b"print(2)\n")
+    assert target.read_bytes() == b"print(2)\n"
+    assert target.stat().st_mode & 0o777 == 0o755
+
+
+def test_batch_writer_queues_and_flushes(tmp_path):
+    with BatchWriter(jobs=4, max_pending=3) as batch:
+        with OutputWriter(tmp_path, batch=batch) as writer:
+            for index in range(5):
+                assert writer.write(tmp_path / f"doc{index}.md", f"doc {index}\n")
+            writer.flush()
+            assert (tmp_path / "doc4.md").read_text(encoding="utf-8") == "doc 4\n"
+            assert not writer.write(tmp_path / "doc0.md", "doc 0\n")
+        batch.submit(tmp_path / "run.sh", "#!/bin/sh\n", mode=0o755)
+    assert [entry["files"] for entry in batch.batches] == [3, 2, 1]
+    assert sum(entry["bytes"] for entry in batch.batches) == 5 * 6 + 10
+    assert (tmp_path / "run.sh").stat().st_mode & 0o777 == 0o755
+
+
+def test_batch_writer_reraises_failures(tmp_path):
+    batch = BatchWriter(jobs=2)
+    batch.submit(tmp_path / "ok.md", "ok\n")
+    batch.submit(tmp_path / "missing" / "bad.md", "bad\n")
+    with pytest.raises(FileNotFoundError):
+        batch.close()
+    assert (tmp_path / "ok.md").exists()
+
+
+def test_content_store_links_identical_documents(tmp_path):
+    repos = [tmp_path / name for name in ("alpha", "beta", "gamma")]
+    for repo in repos:
+        repo.mkdir()
+    store = ContentStore(tmp_path, link="hardlink")
+    with OutputWriter(tmp_path, store=store) as writer:
+        for repo in repos:
+            assert writer.write(repo / "STANDARDS.md", "# Standards\n")
+        assert not writer.write(repos[0] / "STANDARDS.md", "# Standards\n")
+    assert store.blobs_written == 1
+    assert repos[0].joinpath("STANDARDS.md").stat().st_ino == repos[2].joinpath("STANDARDS.md").stat().st_ino
+
+    # An in-place edit through one hardlink must not be reused as the blob.
+    with open(repos[1] / "STANDARDS.md", "w", encoding="utf-8") as f:
+        f.write("# Edited\n")
+    store = ContentStore(tmp_path, link="hardlink")
+    with OutputWriter(tmp_path, store=store) as writer:
+        assert writer.write(repos[1] / "STANDARDS.md", "# Standards\n")
+    assert repos[1].joinpath("STANDARDS.md").read_text(encoding="utf-8") == "# Standards\n"
+    assert store.blobs_written == 1
+
+    manifest = json.loads(store.save_run().read_text(encoding="utf-8"))
+    assert manifest["blobs"] == 1
+    assert manifest["documents"] == {"beta/STANDARDS.md": store.documents["beta/STANDARDS.md"]}
+
+
+def test_content_store_reflink_falls_back_to_copy(tmp_path):
+    store = ContentStore(tmp_path, link="reflink")
+    store.write(tmp_path / "a.md", b"same\n")
+    store.write(tmp_path / "b.md", b"same\n")
+    assert store.linked + store.copied == 2
+    assert (tmp_path / "b.md").read_bytes() == b"same\n"
+
+
+def test_content_store_copies_without_fcntl(tmp_path, monkeypatch):
+    # As on Windows: importing fcntl fails, reflink is reported unsupported
+    monkeypatch.setitem(sys.modules, "fcntl", None)
+    store = ContentStore(tmp_path, link="reflink")
+    store.write(tmp_path / "a.md", b"same\n")
+    store.write(tmp_path / "b.md", b"same\n")
+    assert (store.linked, store.copied) == (0, 2)
+    assert (tmp_path / "b.md").read_bytes() == b"same\n"
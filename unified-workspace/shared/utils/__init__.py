@@ -1,12 +1,25 @@
-"""Utility modules for the unified workspace."""
-from .config import get_setting, get_workspace_root
-from .logger import setup_logger
-from .api_client import APIClient, AsyncAPIClient
-
-__all__ = [
-    "get_setting",
-    "get_workspace_root",
-    "setup_logger",
-    "APIClient",
-    "AsyncAPIClient",
-]
+"""Utility modules for the unified workspace.
+
+Exports are resolved on first access so that reading a setting does not
+import ``requests`` and ``aiohttp`` for the API clients.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "get_setting": ".config",
+    "get_workspace_root": ".config",
+    "setup_logger": ".logger",
+    "APIClient": ".api_client",
+    "AsyncAPIClient": ".api_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
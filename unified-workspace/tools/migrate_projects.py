@@ -11,8 +11,24 @@ import shutil
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List
 import argparse
+import sys
+
+# The shared classifier lives at the workspace root, whatever the entry point
+WORKSPACE_ROOT = str(Path(__file__).resolve().parents[2])
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.append(WORKSPACE_ROOT)
+from workspace_classifier import Classifier
+
+# Name patterns for projects missing from the category lists, in priority order
+CATEGORY_KEYWORDS = [
+    ('trading', ['trading', 'stock', 'finance', 'robinhood', 'alpaca']),
+    ('ai-ml', ['ai', 'ml', 'machine', 'neural', 'debugger']),
+    ('web-apps', ['web', 'app', 'site', 'platform', 'forge', 'vault']),
+    ('tools', ['tool', 'scanner', 'utility', 'bot']),
+    ('personal', ['resume', 'personal', 'template', 'content']),
+]
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +44,11 @@ class ProjectMigrator:
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
         self.project_categories = self._define_categories()
+        exact = {}
+        for category, projects in self.project_categories.items():
+            for project in projects:
+                exact.setdefault(project, category)
+        self.classifier = Classifier(CATEGORY_KEYWORDS, default='tools', exact=exact)
         
     def _define_categories(self) -> Dict[str, List[str]]:
         """Define project categories and their associated projects."""
@@ -113,23 +134,7 @@ class ProjectMigrator:
     
     def categorize_project(self, project_name: str) -> str:
         """Determine the category for a given project."""
-        for category, projects in self.project_categories.items():
-            if project_name in projects:
-                return category
-        
-        # Default categorization based on project name patterns
-        if any(keyword in project_name.lower() for keyword in ['trading', 'stock', 'finance', 'robinhood', 'alpaca']):
-            return 'trading'
-        elif any(keyword in project_name.lower() for keyword in ['ai', 'ml', 'machine', 'neural', 'debugger']):
-            return 'ai-ml'
-        elif any(keyword in project_name.lower() for keyword in ['web', 'app', 'site', 'platform', 'forge', 'vault']):
-            return 'web-apps'
-        elif any(keyword in project_name.lower() for keyword in ['tool', 'scanner', 'utility', 'bot']):
-            return 'tools'
-        elif any(keyword in project_name.lower() for keyword in ['resume', 'personal', 'template', 'content']):
-            return 'personal'
-        else:
-            return 'tools'  # Default category
+        return self.classifier.classify(project_name)
     
     def migrate_project(self, project_name: str, source_path: Path, category: str):
         """Migrate a single project to the unified workspace."""
@@ -221,9 +226,9 @@ This project uses the unified workspace environment. See the main workspace READ
             'by_category': {}
         }
         
-        for project_name in source_projects:
+        categories = self.classifier.classify_many(source_projects)
+        for project_name, category in zip(source_projects, categories):
             source_path = self.source_dir / project_name
-            category = self.categorize_project(project_name)
             
             logger.info(f"Processing {project_name} -> {category}")
             
@@ -341,8 +346,7 @@ def main():
             projects = [item.name for item in source_dir.iterdir() 
                        if item.is_dir() and not item.name.startswith('.')]
             print("Projects that would be migrated:")
-            for project in projects:
-                category = migrator.categorize_project(project)
+            for project, category in zip(projects, migrator.classifier.classify_many(projects)):
                 print(f"  {project} -> projects/{category}/")
     else:
         migrator.migrate_all_projects()
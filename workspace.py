@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Single entry point for the workspace management scripts.
+
+Usage: python workspace.py <command> [options]
+
+Each subcommand's modules are imported only when that subcommand runs, so
+cheap commands such as ``workspace scan --cached`` start in a few tens of
+milliseconds (see benchmarks/bench_startup.py for the budget check). The
+remaining arguments are handed to the underlying script unchanged.
+"""
+
+import sys
+from pathlib import Path
+
+WORKSPACE_ROOT = Path(__file__).resolve().parent
+
+# command -> (module or script path, function, help)
+COMMANDS = {
+    'scan': (None, None, 'List projects with type, file count and size'),
+    'tasks': ('generate_task_lists', 'main', 'Generate TASK_LIST.md files'),
+    'standards': ('generate_coding_standards', 'main', 'Generate CODE_ARCHITECTURE_STANDARDS.md files'),
+    'push': ('push_all_projects', 'main', 'Prepare, commit and push every project'),
+    'migrate': ('unified-workspace/tools/migrate_projects.py', None, 'Migrate projects into the unified workspace'),
+    'setup': ('unified-workspace/setup.py', None, 'Set up the unified workspace environment'),
+    'watch': ('workspace_watch', 'main', 'Run the metadata watcher daemon'),
+    'stats': ('workspace_stats', 'main', 'Report lines and bytes per language per project'),
+    'imports': ('workspace_imports', 'main', 'Index and query cross-project imports'),
+    'dupes': ('workspace_dupes', 'main', 'Find duplicate files across projects'),
+    'progress': ('workspace_progress', 'main', 'Report checkbox progress across all task lists'),
+    'state': ('workspace_state', 'main', 'Query and update per-project state'),
+    'split': ('workspace_split', 'main', 'Split the monorepo history into per-project histories'),
+}
+
+
+def print_usage() -> None:
+    print("usage: workspace <command> [options]\n\ncommands:")
+    for name, (_, _, help_text) in COMMANDS.items():
+        print(f"  {name:<10} {help_text}")
+
+
+def scan(argv) -> None:
+    """List projects, from the index alone with ``--cached``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='workspace scan', description=COMMANDS['scan'][2])
+    parser.add_argument('--cached', action='store_true',
+                        help='Read the workspace index without touching the filesystem')
+    parser.add_argument('--json', action='store_true', help='Emit JSON')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Worker processes for project classification (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    if args.cached:
+        from workspace_index import WorkspaceIndex
+        with WorkspaceIndex(Path('.')) as index:
+            projects = index.projects()
+    else:
+        from workspace_watch import load_projects
+        projects = load_projects(Path('.'), jobs=args.jobs)
+
+    if args.json:
+        import json
+        print(json.dumps([dict(project, path=str(project['path'])) for project in projects], indent=2))
+        return
+    for project in projects:
+        print(f"{project['name']:<36} {project['type']:<14} "
+              f"{project['file_count']:>8} files {project['total_size']:>12} bytes")
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"workspace: unknown command {command!r}\n", file=sys.stderr)
+        print_usage()
+        sys.exit(2)
+    if command == 'scan':
+        scan(rest)
+        return
+
+    target, function, _ = COMMANDS[command]
+    sys.argv = [f'workspace {command}'] + rest
+    if target.endswith('.py'):
+        import runpy
+        script = WORKSPACE_ROOT / target
+        sys.path.insert(0, str(script.parent))
+        runpy.run_path(str(script), run_name='__main__')
+        return
+    import importlib
+    getattr(importlib.import_module(target), function)()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Keyword-based repository classification compiled into one regex.
+
+A ``Classifier`` takes ordered ``(category, keywords)`` rules: a name belongs
+to the first category with a keyword occurring anywhere in the lower-cased
+name, else to ``default``. An optional ``exact`` mapping of names to
+categories is consulted first. All keywords are compiled once into a
+single lookahead alternation ordered by category priority, so a name is
+scanned in one pass instead of once per keyword, and the task-list
+generator and the migrator share one matching implementation.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+
+class Classifier:
+    """Maps repository names to categories using precompiled keyword rules."""
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]], default: str,
+                 exact: Optional[Mapping[str, str]] = None) -> None:
+        self.default = default
+        self.exact = dict(exact or {})
+        self._categories: List[str] = []
+        self._priority: Dict[str, int] = {}
+        for category, keywords in rules:
+            self._categories.append(category)
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), len(self._categories) - 1)
+        # At each position the alternation takes the first keyword matching
+        # there, so listing keywords by category priority reports the best
+        # keyword starting at every position.
+        ordered = sorted(self._priority, key=self._priority.__getitem__)
+        self._pattern = re.compile('(?=(%s))' % '|'.join(map(re.escape, ordered))) if ordered else None
+
+    def classify(self, name: str) -> str:
+        """Return the category of one repository name."""
+        category = self.exact.get(name)
+        if category is not None:
+            return category
+        if self._pattern is None:
+            return self.default
+        best = len(self._categories)
+        for match in self._pattern.finditer(name.lower()):
+            priority = self._priority[match.group(1)]
+            if priority < best:
+                best = priority
+                if best == 0:
+                    break
+        return self._categories[best] if best < len(self._categories) else self.default
+
+    def classify_many(self, names: Iterable[str]) -> List[str]:
+        """Classify a batch of names in one pass, in input order."""
+        seen: Dict[str, str] = {}
+        classify = self.classify
+        result = []
+        for name in names:
+            category = seen.get(name)
+            if category is None:
+                category = seen[name] = classify(name)
+            result.append(category)
+        return result
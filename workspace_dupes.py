@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Find duplicate files across workspace projects.
+
+Candidates are narrowed in stages: files are bucketed by size, then same-size
+files are compared by a hash of their first block, and only files whose
+partial hashes collide are hashed in full (memory-mapped for large files, on
+a thread pool). File metadata is spilled to a temporary SQLite database and
+processed one size bucket at a time, so memory stays bounded by the largest
+bucket rather than the number of files.
+
+Files that are already hardlinks of each other are not counted twice. With
+``--hardlink`` each redundant copy is atomically replaced by a hardlink to
+the first copy of its group.
+
+Usage: python workspace_dupes.py [--root DIR ...] [--hardlink] [--json]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+
+from workspace_manifest import hash_file
+from workspace_utils import SKIP_DIRS
+
+PARTIAL_SIZE = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE files (
+    path TEXT NOT NULL,
+    project TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL
+);
+CREATE INDEX files_size ON files (size);
+"""
+
+
+def partial_hash(path: str, length: int = PARTIAL_SIZE) -> str:
+    """Return the BLAKE2b digest of the first ``length`` bytes of a file."""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+class DuplicateFinder:
+    """Staged size / partial-hash / full-hash duplicate detection."""
+
+    def __init__(
+        self,
+        base_path: Path = Path('.'),
+        prune: Iterable[str] = ('.git',),
+        jobs: Optional[int] = None,
+        min_size: int = 1,
+    ) -> None:
+        self.base_path = Path(base_path)
+        self.prune = frozenset(prune)
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.min_size = min_size
+        # An empty filename gives a private on-disk database deleted on close.
+        self.conn = sqlite3.connect('')
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'DuplicateFinder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def scan(self, roots: Iterable[Path]) -> int:
+        """Record every regular file under ``roots``; return the file count."""
+        count = 0
+        batch = []
+        for root in roots:
+            project = Path(root).name
+            pending = [os.fspath(root)]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if entry.name not in self.prune:
+                                        pending.append(entry.path)
+                                    continue
+                                if not entry.is_file(follow_symlinks=False):
+                                    continue
+                                stat = entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+                            if stat.st_size < self.min_size:
+                                continue
+                            batch.append((entry.path, project, stat.st_size, stat.st_dev, stat.st_ino))
+                            if len(batch) >= 10000:
+                                count += self._flush(batch)
+                except OSError:
+                    continue
+        count += self._flush(batch)
+        return count
+
+    def _flush(self, batch: List[Tuple]) -> int:
+        self.conn.executemany(
+            "INSERT INTO files (path, project, size, dev, ino) VALUES (?, ?, ?, ?, ?)", batch
+        )
+        flushed = len(batch)
+        batch.clear()
+        return flushed
+
+    def groups(self) -> Iterator[List[Tuple[str, str, int]]]:
+        """Yield groups of identical files as ``(path, project, size)`` lists."""
+        sizes = [row[0] for row in self.conn.execute(
+            "SELECT size FROM files GROUP BY size HAVING COUNT(*) > 1 ORDER BY size DESC"
+        )]
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for size in sizes:
+                rows = self.conn.execute(
+                    "SELECT path, project, dev, ino FROM files WHERE size = ? ORDER BY path", (size,)
+                ).fetchall()
+                # Hardlinks of one inode are a single copy on disk.
+                unique = list({(dev, ino): (path, project) for path, project, dev, ino in reversed(rows)}.values())
+                if len(unique) < 2:
+                    continue
+                candidates = [unique]
+                if size > PARTIAL_SIZE:
+                    candidates = self._split(executor, partial_hash, candidates)
+                for group in self._split(executor, hash_file, candidates):
+                    yield sorted((path, project, size) for path, project in group)
+
+    @staticmethod
+    def _split(executor, hasher, candidates: List[List[Tuple[str, str]]]) -> List[List[Tuple[str, str]]]:
+        """Split each candidate list by ``hasher``, keeping groups of two or more."""
+        result = []
+        for files in candidates:
+            buckets: Dict[str, List[Tuple[str, str]]] = {}
+            digests = executor.map(_safe_hash, [hasher] * len(files), [path for path, _ in files])
+            for item, digest in zip(files, digests):
+                if digest is not None:
+                    buckets.setdefault(digest, []).append(item)
+            result.extend(group for group in buckets.values() if len(group) > 1)
+        return result
+
+
+def _safe_hash(hasher, path: str) -> Optional[str]:
+    try:
+        return hasher(path)
+    except OSError:
+        return None
+
+
+def summarize(groups: Iterable[List[Tuple[str, str, int]]]) -> Dict:
+    """Aggregate duplicate groups into reclaimable bytes per project.
+
+    The first path of each group is the copy that is kept; every other copy
+    counts as reclaimable for the project it lives in.
+    """
+    projects: Dict[str, Dict[str, int]] = {}
+    group_count = 0
+    for group in groups:
+        group_count += 1
+        for _, project, size in group[1:]:
+            totals = projects.setdefault(project, {'duplicate_files': 0, 'reclaimable_bytes': 0})
+            totals['duplicate_files'] += 1
+            totals['reclaimable_bytes'] += size
+    return {
+        'groups': group_count,
+        'reclaimable_bytes': sum(totals['reclaimable_bytes'] for totals in projects.values()),
+        'projects': dict(sorted(projects.items(), key=lambda item: -item[1]['reclaimable_bytes'])),
+    }
+
+
+def hardlink_group(group: List[Tuple[str, str, int]]) -> int:
+    """Replace every copy after the first with a hardlink to it; return links made."""
+    keep = group[0][0]
+    keep_dev = os.stat(keep).st_dev
+    linked = 0
+    for path, _, _ in group[1:]:
+        try:
+            if os.stat(path).st_dev != keep_dev:
+                continue
+            temp_path = f"{path}.dupelink"
+            os.link(keep, temp_path)
+            os.replace(temp_path, path)
+        except OSError:
+            continue
+        linked += 1
+    return linked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Find duplicate files across workspace projects')
+    parser.add_argument('--root', action='append', default=None,
+                        help='Directory to scan (repeatable; default: every top-level directory)')
+    parser.add_argument('--prune-skip-dirs', action='store_true',
+                        help='Also skip venv, node_modules and __pycache__ directories')
+    parser.add_argument('--min-size', type=int, default=1, help='Ignore files smaller than this')
+    parser.add_argument('--jobs', type=int, default=None, help='Hashing threads')
+    parser.add_argument('--hardlink', action='store_true',
+                        help='Replace duplicate copies with hardlinks to the kept copy')
+    parser.add_argument('--json', action='store_true', help='Emit the report as JSON')
+    args = parser.parse_args()
+
+    base_path = Path('.')
+    if args.root:
+        roots = [Path(root) for root in args.root]
+    else:
+        roots = sorted(p for p in base_path.iterdir() if p.is_dir() and not p.name.startswith('.'))
+    prune = SKIP_DIRS if args.prune_skip_dirs else ('.git',)
+
+    linked = 0
+    with DuplicateFinder(base_path, prune=prune, jobs=args.jobs, min_size=args.min_size) as finder:
+        scanned = finder.scan(roots)
+
+        def each_group():
+            nonlocal linked
+            for group in finder.groups():
+                if args.hardlink:
+                    linked += hardlink_group(group)
+                yield group
+
+        report = summarize(each_group())
+    report['files_scanned'] = scanned
+    report['hardlinked'] = linked
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Scanned {scanned} files: {report['groups']} duplicate groups, "
+          f"{report['reclaimable_bytes']} reclaimable bytes")
+    for project, totals in report['projects'].items():
+        print(f"  {project:<36} {totals['duplicate_files']:>8} files {totals['reclaimable_bytes']:>12} bytes")
+    if args.hardlink:
+        print(f"Replaced {linked} duplicate files with hardlinks")
+
+
+if __name__ == '__main__':
+    main()
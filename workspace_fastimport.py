@@ -0,0 +1,337 @@
+"""Initial commits through ``git fast-import`` instead of ``git add`` + ``git commit``.
+
+``git add .`` hashes every file into its own zlib-compressed loose object
+and ``git commit`` then re-reads the index; on a tree with 100k files that
+is 100k small object writes plus a second scan. ``ImportStream`` instead
+walks the project once, reading each file in large chunks, and streams it
+inline into one fast-import commit, which lands as a single packfile. While
+the bytes go past it also computes each blob's id and keeps the file's
+stat data, so afterwards it writes a fully populated index (with its
+cache-tree) and ``git status`` is immediately clean without re-hashing the
+tree. Pruned directory names are added to ``info/exclude`` so later
+``git add .`` runs keep leaving them out.
+
+The walk prunes ``SKIP_DIRS`` (``venv``, ``node_modules``, ...) like the rest
+of the workspace tooling and honours ``.gitignore`` files,
+``info/exclude`` and the default global excludes file the way ``git add .``
+would. File contents are streamed byte for byte, so only the first commit
+of a repository is imported this way; anything the stream cannot reproduce
+exactly (existing history or index, line-ending conversion, attributes
+files, a configured ``core.excludesFile``, negated ignore patterns, nested
+repositories) raises ``FastImportUnsupported`` so the caller can use the
+ordinary add/commit path.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import hashlib
+import os
+import struct
+import subprocess
+import time
+
+from workspace_gitstate import Ambiguous, IgnoreRules, common_dir, find_git_dir, read_head, read_index
+from workspace_utils import SKIP_DIRS
+
+CHUNK_SIZE = 1 << 20
+
+# fast-import sets up and frees a zlib stream (~256 KiB) per object; with
+# glibc's default trim threshold every free hands that memory back to the
+# kernel, and page-faulting it in again made the import ~6x slower
+_MALLOC_TRIM_THRESHOLD = str(256 << 20)
+
+_ENTRY = struct.Struct('>10I20sH')
+
+
+class FastImportUnsupported(Exception):
+    """The project cannot be imported exactly; use git add/commit instead."""
+
+
+def _quote_path(path: bytes) -> bytes:
+    """C-style quote a path when fast-import cannot take it verbatim."""
+    if not path.startswith(b'"') and b'\n' not in path:
+        return path
+    return b'"' + path.replace(b'\\', b'\\\\').replace(b'"', b'\\"').replace(b'\n', b'\\n') + b'"'
+
+
+def import_ref(path: Path) -> str:
+    """Return the ref to import into, or raise FastImportUnsupported.
+
+    Only repositories without commits and with an empty index qualify,
+    and only if ``check_conversion`` finds nothing that changes contents.
+    """
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        raise FastImportUnsupported("not a git repository")
+    branch, head = read_head(git_dir)
+    if head is not None:
+        raise FastImportUnsupported("repository already has commits")
+    if branch is None:
+        raise FastImportUnsupported("HEAD is detached")
+    try:
+        if read_index(git_dir)['entries']:
+            raise FastImportUnsupported("index is not empty")
+    except Ambiguous as e:
+        raise FastImportUnsupported(str(e))
+    check_conversion(path)
+    return branch if branch.startswith('refs/') else f'refs/heads/{branch}'
+
+
+# Settings under which git add would store something other than the raw bytes
+# (autocrlf, eol, attributes) or leave out files the walk would include
+_CONVERSION_SETTINGS = r'^core\.(autocrlf|eol|attributesfile|excludesfile)$'
+
+
+def check_conversion(path: Path) -> None:
+    """Raise FastImportUnsupported if git add would not store files as they are on disk.
+
+    ``.gitattributes`` files inside the tree are found by the walk itself.
+    """
+    result = subprocess.run(['git', 'config', '--get-regexp', _CONVERSION_SETTINGS], cwd=path,
+                            capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(' ')
+        if key != 'core.autocrlf' or value.lower() not in ('false', 'no', 'off', '0'):
+            raise FastImportUnsupported(f"{key} is set")
+    config_home = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config')
+    for attributes in (config_home / 'git' / 'attributes',
+                       common_dir(find_git_dir(path)) / 'info' / 'attributes'):
+        if attributes.is_file():
+            raise FastImportUnsupported(f"attributes file {attributes}")
+
+
+def git_ident(path: Path, kind: str) -> str:
+    """``Name <email> timestamp tz`` for ``kind`` 'AUTHOR' or 'COMMITTER', as git would use."""
+    result = subprocess.run(['git', 'var', f'GIT_{kind}_IDENT'], cwd=path,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def fast_import_env() -> Dict[str, str]:
+    """The environment to run ``git fast-import`` with."""
+    env = dict(os.environ)
+    env.setdefault('MALLOC_TRIM_THRESHOLD_', _MALLOC_TRIM_THRESHOLD)
+    return env
+
+
+class ImportStream:
+    """Produces the fast-import stream for one project and the matching index.
+
+    Iterate ``chunks()`` into ``git fast-import --done``; once it exits
+    successfully call ``finish()``. ``files`` and ``bytes`` count what
+    was imported.
+    """
+
+    def __init__(self, path: Path, ref: str, message: str, author: str, committer: str) -> None:
+        self.path = Path(path)
+        self.ref = ref
+        self.message = message.encode('utf-8')
+        self.author = author.encode('utf-8')
+        self.committer = committer.encode('utf-8')
+        # (path, stat result, mode, blob id)
+        self.entries: List[Tuple[bytes, os.stat_result, int, bytes]] = []
+        self.files = 0
+        self.bytes = 0
+        self.pruned = set()
+
+    def _ignore_rules(self) -> IgnoreRules:
+        rules = IgnoreRules()
+        config_home = Path(os.environ.get('XDG_CONFIG_HOME') or Path.home() / '.config')
+        rules.add_file(config_home / 'git' / 'ignore', '')
+        rules.add_file(common_dir(find_git_dir(self.path)) / 'info' / 'exclude', '')
+        return rules
+
+    def _walk(self) -> Iterator[Tuple[bytes, str, os.DirEntry]]:
+        """Yield ``(relpath, abspath, entry)`` for every file git add would stage."""
+        try:
+            rules = self._ignore_rules()
+            pending = ['']
+            while pending:
+                relative = pending.pop()
+                directory = os.path.join(self.path, relative) if relative else os.fspath(self.path)
+                rules.add_file(Path(directory) / '.gitignore', relative)
+                with os.scandir(directory) as entries:
+                    for entry in sorted(entries, key=lambda entry: entry.name):
+                        relpath = f"{relative}/{entry.name}" if relative else entry.name
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if entry.name == '.gitattributes':
+                            raise FastImportUnsupported(f"attributes file {relpath}")
+                        if is_dir and entry.name in SKIP_DIRS:
+                            self.pruned.add(entry.name)
+                            continue
+                        if rules.ignored(relpath, is_dir):
+                            continue
+                        if is_dir:
+                            if os.path.lexists(os.path.join(entry.path, '.git')):
+                                raise FastImportUnsupported(f"nested repository {relpath}")
+                            pending.append(relpath)
+                        elif entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                            yield os.fsencode(relpath), entry.path, entry
+        except Ambiguous as e:
+            raise FastImportUnsupported(str(e))
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield the fast-import stream in pieces of roughly CHUNK_SIZE bytes."""
+        buffer = bytearray()
+        buffer += b'commit %s\nauthor %s\ncommitter %s\ndata %d\n%s\n' % (
+            self.ref.encode('utf-8'), self.author, self.committer, len(self.message), self.message)
+        for relpath, abspath, entry in self._walk():
+            if entry.is_symlink():
+                info = os.lstat(abspath)
+                data = os.fsencode(os.readlink(abspath))
+                mode = 0o120000
+                blob = hashlib.sha1(b'blob %d\0' % len(data))
+                blob.update(data)
+                buffer += b'M 120000 inline %s\ndata %d\n' % (_quote_path(relpath), len(data))
+                buffer += data
+                buffer += b'\n'
+            else:
+                with open(abspath, 'rb') as f:
+                    info = os.fstat(f.fileno())
+                    mode = 0o100755 if info.st_mode & 0o100 else 0o100644
+                    remaining = info.st_size
+                    blob = hashlib.sha1(b'blob %d\0' % remaining)
+                    buffer += b'M %o inline %s\ndata %d\n' % (mode, _quote_path(relpath), remaining)
+                    while remaining:
+                        data = f.read(min(CHUNK_SIZE, remaining))
+                        if not data:
+                            raise OSError(f"{abspath} shrank while it was being imported")
+                        blob.update(data)
+                        buffer += data
+                        remaining -= len(data)
+                        if len(buffer) >= CHUNK_SIZE:
+                            yield bytes(buffer)
+                            buffer.clear()
+                    buffer += b'\n'
+            self.entries.append((relpath, info, mode, blob.digest()))
+            self.files += 1
+            self.bytes += info.st_size
+            if len(buffer) >= CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        if not self.entries:
+            raise FastImportUnsupported("nothing to commit")
+        buffer += b'done\n'
+        yield bytes(buffer)
+
+    def _tree_extension(self) -> Tuple[bytes, bytes]:
+        """Build the TREE index extension; returns ``(extension, root tree id)``."""
+        # Nested {name: subtree-or-(mode, blob id)} built from the sorted entries
+        root: Dict = {}
+        for relpath, _, mode, blob in self.entries:
+            *dirs, name = relpath.split(b'/')
+            node = root
+            for part in dirs:
+                node = node.setdefault(part, {})
+            node[name] = (mode, blob)
+
+        records = []
+
+        def build(node: Dict, prefix: bytes) -> Tuple[bytes, int]:
+            body = bytearray()
+            record = len(records)
+            records.append(None)
+            count = 0
+            subtrees = 0
+            # Git orders tree entries as if directory names ended in '/'
+            for name in sorted(node, key=lambda name: name + b'/' if isinstance(node[name], dict) else name):
+                child = node[name]
+                if isinstance(child, dict):
+                    tree_id, child_count = build(child, name)
+                    body += b'40000 %s\0%s' % (name, tree_id)
+                    count += child_count
+                    subtrees += 1
+                else:
+                    body += b'%o %s\0%s' % (child[0], name, child[1])
+                    count += 1
+            tree_id = hashlib.sha1(b'tree %d\0' % len(body) + bytes(body)).digest()
+            records[record] = b'%s\0%d %d\n%s' % (prefix, count, subtrees, tree_id)
+            return tree_id, count
+
+        root_id, _ = build(root, b'')
+        return b''.join(records), root_id
+
+    def write_index(self, git_dir: Optional[Path] = None) -> str:
+        """Write a v2 index matching the imported commit; returns the root tree id."""
+        git_dir = git_dir or find_git_dir(self.path)
+        self.entries.sort(key=lambda entry: entry[0])
+        extension, root_id = self._tree_extension()
+        # Entries modified within the index's own timestamp granularity are
+        # smudged (size 0) so git re-checks their content, as git itself does
+        racy_after = time.time_ns() - 1_000_000_000
+        data = bytearray(b'DIRC' + struct.pack('>II', 2, len(self.entries)))
+        for relpath, info, mode, blob in self.entries:
+            size = info.st_size & 0xffffffff
+            if info.st_mtime_ns >= racy_after:
+                size = 0
+            start = len(data)
+            data += _ENTRY.pack(
+                info.st_ctime_ns // 1_000_000_000 & 0xffffffff, info.st_ctime_ns % 1_000_000_000,
+                info.st_mtime_ns // 1_000_000_000 & 0xffffffff, info.st_mtime_ns % 1_000_000_000,
+                info.st_dev & 0xffffffff, info.st_ino & 0xffffffff, mode,
+                info.st_uid & 0xffffffff, info.st_gid & 0xffffffff, size,
+                blob, min(len(relpath), 0xfff),
+            )
+            data += relpath
+            data += b'\0' * (8 - (len(data) - start) % 8)
+        data += b'TREE' + struct.pack('>I', len(extension)) + extension
+        data += hashlib.sha1(data).digest()
+
+        lock = git_dir / 'index.lock'
+        with open(lock, 'xb') as f:
+            f.write(data)
+        os.replace(lock, git_dir / 'index')
+        return root_id.hex()
+
+    def exclude_pruned(self, git_dir: Optional[Path] = None) -> None:
+        """Add the pruned directory names to ``info/exclude``."""
+        git_dir = git_dir or find_git_dir(self.path)
+        exclude = common_dir(git_dir) / 'info' / 'exclude'
+        try:
+            existing = exclude.read_text(encoding='utf-8').splitlines()
+        except FileNotFoundError:
+            existing = []
+        missing = [f'{name}/' for name in sorted(self.pruned) if f'{name}/' not in existing]
+        if missing:
+            exclude.parent.mkdir(parents=True, exist_ok=True)
+            with open(exclude, 'a', encoding='utf-8') as f:
+                f.write(''.join(f'{line}\n' for line in missing))
+
+    def finish(self) -> str:
+        """Write the index and exclude rules after a successful import; returns the tree id."""
+        git_dir = find_git_dir(self.path)
+        self.exclude_pruned(git_dir)
+        return self.write_index(git_dir)
+
+    def summary(self) -> Dict:
+        return {'files': self.files, 'bytes': self.bytes}
+
+
+def fast_import(path: Path, message: str) -> Dict:
+    """Import the working tree of a repository without commits as its first commit.
+
+    Returns ``{'files', 'bytes'}``; raises FastImportUnsupported when the
+    add/commit path must be used and CalledProcessError if fast-import fails.
+    """
+    path = Path(path)
+    ref = import_ref(path)
+    stream = ImportStream(path, ref, message, git_ident(path, 'AUTHOR'), git_ident(path, 'COMMITTER'))
+    args = ['git', 'fast-import', '--quiet', '--done']
+    process = subprocess.Popen(args, cwd=path, env=fast_import_env(), stdin=subprocess.PIPE,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        for chunk in stream.chunks():
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except BrokenPipeError:
+        pass  # fast-import died; its exit status and stderr say why
+    except BaseException:
+        # Without 'done' fast-import aborts and leaves no ref behind
+        process.kill()
+        process.wait()
+        raise
+    stderr = process.stderr.read()
+    if process.wait():
+        raise subprocess.CalledProcessError(process.returncode, args, stderr=stderr.decode('utf-8', 'replace'))
+    stream.finish()
+    return stream.summary()
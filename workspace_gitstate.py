@@ -0,0 +1,513 @@
+"""Read git repository state without spawning git.
+
+``read_git_state`` answers "is this a repo", "current branch", "has a
+remote" and "is the worktree dirty" by parsing ``.git`` directly: HEAD,
+loose refs and packed-refs, the config file and the index. A worktree is
+clean when
+
+* every index entry's file still has the recorded size and mtime (racily
+  clean entries, newer than the index itself, are ambiguous),
+* the index's cache-tree root matches the tree of the HEAD commit, i.e.
+  nothing is staged (the commit is read from a loose object or, when
+  stored undeltified, a pack), and
+* walking the worktree finds no file that is neither tracked nor ignored
+  by the ``.gitignore`` / ``info/exclude`` rules.
+
+Whenever the answer cannot be decided this way (size-preserving edits,
+racy entries, an invalidated cache-tree, deltified commits, negated
+ignore patterns, submodules, split or sparse indexes, untracked files
+that global excludes might cover, ...) the reader falls back to
+``git status --porcelain`` for that one repository. Definite answers never
+spawn a process.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import re
+import struct
+import subprocess
+import zlib
+
+_ENTRY = struct.Struct('>10I20sH')
+_GITLINK = 0o160000
+_ASSUME_VALID = 0x8000
+_EXTENDED = 0x4000
+_SKIP_WORKTREE = 0x4000
+_INTENT_TO_ADD = 0x2000
+
+
+class Ambiguous(Exception):
+    """The on-disk state cannot be decided without running git."""
+
+
+def find_git_dir(path: Path) -> Optional[Path]:
+    """Return the git directory of a worktree, following ``.git`` files."""
+    dot_git = Path(path) / '.git'
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+        if content.startswith('gitdir:'):
+            git_dir = Path(content[len('gitdir:'):].strip())
+            return git_dir if git_dir.is_absolute() else (Path(path) / git_dir).resolve()
+    return None
+
+
+def common_dir(git_dir: Path) -> Path:
+    """The directory holding refs, objects and config (differs for linked worktrees)."""
+    try:
+        common = (git_dir / 'commondir').read_text(encoding='utf-8').strip()
+    except OSError:
+        return git_dir
+    return (git_dir / common).resolve()
+
+
+def read_ref(git_dir: Path, ref: str, depth: int = 0) -> Optional[str]:
+    """Resolve a ref (following symbolic refs) to a hex object id, or None."""
+    if depth > 5:
+        raise Ambiguous(f"symbolic ref loop at {ref}")
+    for base in (git_dir, common_dir(git_dir)):
+        try:
+            value = (base / ref).read_text(encoding='utf-8').strip()
+        except (OSError, UnicodeDecodeError):
+            continue
+        if value.startswith('ref:'):
+            return read_ref(git_dir, value[4:].strip(), depth + 1)
+        return value or None
+    try:
+        with open(common_dir(git_dir) / 'packed-refs', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith(('#', '^')):
+                    continue
+                sha, _, name = line.rstrip('\n').partition(' ')
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def read_head(git_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+    """Return ``(branch, commit)``; branch is None when HEAD is detached."""
+    head = (git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+    if head.startswith('ref:'):
+        ref = head[4:].strip()
+        branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+        return branch, read_ref(git_dir, ref)
+    return None, head or None
+
+
+def read_config_remotes(git_dir: Path) -> Optional[bool]:
+    """True if the repository config declares a remote; None if includes make it unknowable."""
+    try:
+        text = (common_dir(git_dir) / 'config').read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return False
+    if re.search(r'^\s*\[\s*remote\s+"', text, re.MULTILINE | re.IGNORECASE):
+        return True
+    if re.search(r'^\s*\[\s*include(if)?\b', text, re.MULTILINE | re.IGNORECASE):
+        return None
+    return False
+
+
+def read_remote_url(git_dir: Path, remote: str = 'origin') -> Optional[str]:
+    """The ``url`` of one remote from the repository config, or None."""
+    try:
+        lines = (common_dir(git_dir) / 'config').read_text(encoding='utf-8', errors='replace').splitlines()
+    except OSError:
+        return None
+    section = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith('['):
+            section = line
+            continue
+        if section is None or not re.fullmatch(r'\[\s*remote\s+"%s"\s*\]' % re.escape(remote), section, re.IGNORECASE):
+            continue
+        key, _, value = line.partition('=')
+        if key.strip().lower() == 'url':
+            return value.strip().strip('"')
+    return None
+
+
+def _config_value(git_dir: Path, pattern: str) -> bool:
+    try:
+        text = (common_dir(git_dir) / 'config').read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return False
+    return re.search(pattern, text, re.MULTILINE | re.IGNORECASE) is not None
+
+
+def read_index(git_dir: Path) -> Dict:
+    """Parse ``git_dir/index`` into entries and the cache-tree root.
+
+    Returns ``{'entries': [(path, mtime_s, mtime_ns, mode, size, flags, extended)],
+    'tree': root tree hex or None, 'mtime_ns': index file mtime}``.
+    """
+    path = git_dir / 'index'
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+    except FileNotFoundError:
+        return {'entries': [], 'tree': None, 'mtime_ns': 0}
+    if len(data) < 32 or data[:4] != b'DIRC':
+        raise Ambiguous("unrecognised index")
+    version, count = struct.unpack_from('>II', data, 4)
+    if version not in (2, 3, 4):
+        raise Ambiguous(f"index version {version}")
+    pos = 12
+    entries = []
+    previous = b''
+    for _ in range(count):
+        (_, _, mtime_s, mtime_ns_part, _, _, mode, _, _, size, _, flags) = _ENTRY.unpack_from(data, pos)
+        start = pos
+        pos += _ENTRY.size
+        extended = 0
+        if flags & _EXTENDED:
+            if version < 3:
+                raise Ambiguous("extended flags in a v2 index")
+            (extended,) = struct.unpack_from('>H', data, pos)
+            pos += 2
+        if version == 4:
+            byte = data[pos]
+            pos += 1
+            strip = byte & 0x7f
+            while byte & 0x80:
+                byte = data[pos]
+                pos += 1
+                strip = ((strip + 1) << 7) | (byte & 0x7f)
+            end = data.index(b'\0', pos)
+            name = previous[:len(previous) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            end = data.index(b'\0', pos)
+            name = data[pos:end]
+            # Entries are NUL-padded to a multiple of eight bytes
+            pos = start + ((end - start + 8) & ~7)
+        previous = name
+        entries.append((name.decode('utf-8', 'surrogateescape'), mtime_s, mtime_ns_part,
+                        mode, size, flags, extended))
+
+    tree = None
+    while pos + 8 <= len(data) - 20:
+        signature = data[pos:pos + 4]
+        (length,) = struct.unpack_from('>I', data, pos + 4)
+        body = data[pos + 8:pos + 8 + length]
+        if signature == b'TREE':
+            nul = body.index(b'\0')
+            newline = body.index(b'\n', nul)
+            entry_count = int(body[nul + 1:newline].split(b' ')[0])
+            if body[:nul] == b'' and entry_count >= 0:
+                tree = body[newline + 1:newline + 21].hex()
+        elif signature in (b'link', b'sdir'):
+            raise Ambiguous("split or sparse index")
+        pos += 8 + length
+    return {'entries': entries, 'tree': tree, 'mtime_ns': mtime_ns}
+
+
+def _object_dirs(git_dir: Path) -> List[Path]:
+    objects = common_dir(git_dir) / 'objects'
+    dirs = [objects]
+    try:
+        with open(objects / 'info' / 'alternates', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    alternate = Path(line)
+                    dirs.append(alternate if alternate.is_absolute() else (objects / alternate).resolve())
+    except OSError:
+        pass
+    return dirs
+
+
+def _read_packed_commit(pack_idx: Path, sha: bytes) -> Optional[bytes]:
+    """Return the inflated commit from a pack, None if absent; Ambiguous if deltified."""
+    with open(pack_idx, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'\xfftOc' or struct.unpack_from('>I', data, 4)[0] != 2:
+        raise Ambiguous("unsupported pack index")
+    fanout = struct.unpack_from('>256I', data, 8)
+    count = fanout[255]
+    lo = fanout[sha[0] - 1] if sha[0] else 0
+    hi = fanout[sha[0]]
+    names = 8 + 256 * 4
+    while lo < hi:
+        mid = (lo + hi) // 2
+        candidate = data[names + mid * 20:names + mid * 20 + 20]
+        if candidate == sha:
+            break
+        if candidate < sha:
+            lo = mid + 1
+        else:
+            hi = mid
+    else:
+        return None
+    offsets = names + count * 24
+    (offset,) = struct.unpack_from('>I', data, offsets + mid * 4)
+    if offset & 0x80000000:
+        (offset,) = struct.unpack_from('>Q', data, offsets + count * 4 + (offset & 0x7fffffff) * 8)
+    with open(pack_idx.with_suffix('.pack'), 'rb') as pack:
+        pack.seek(offset)
+        header = pack.read(4096)
+    byte = header[0]
+    kind = (byte >> 4) & 7
+    pos = 1
+    while byte & 0x80:
+        byte = header[pos]
+        pos += 1
+    if kind != 1:
+        raise Ambiguous("HEAD commit is stored as a delta")
+    return zlib.decompressobj().decompress(header[pos:])
+
+
+def read_commit_tree(git_dir: Path, commit: str) -> str:
+    """Return the tree id of a commit, from a loose object or a pack."""
+    if not re.fullmatch(r'[0-9a-f]{40}', commit or ''):
+        raise Ambiguous(f"unsupported object id {commit!r}")
+    body = None
+    for objects in _object_dirs(git_dir):
+        try:
+            with open(objects / commit[:2] / commit[2:], 'rb') as f:
+                body = zlib.decompressobj().decompress(f.read(4096)).split(b'\0', 1)[1]
+            break
+        except OSError:
+            pass
+        packs = objects / 'pack'
+        try:
+            indexes = sorted(packs.glob('*.idx'))
+        except OSError:
+            indexes = []
+        for index in indexes:
+            body = _read_packed_commit(index, bytes.fromhex(commit))
+            if body is not None:
+                break
+        if body is not None:
+            break
+    if not body or not body.startswith(b'tree '):
+        raise Ambiguous(f"commit {commit} not readable")
+    return body[5:45].decode('ascii')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == len(pattern):
+            out.append('/.*')
+            i += 3
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 2)
+            if end < 0:
+                out.append(re.escape('['))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        elif pattern[i] == '\\' and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+class IgnoreRules:
+    """The subset of gitignore matching that can be decided with certainty.
+
+    Negated patterns make later decisions order-dependent across files, so
+    any ``!pattern`` raises Ambiguous instead of guessing.
+    """
+
+    def __init__(self) -> None:
+        # (base directory relpath, regex, directory-only)
+        self.rules: List[Tuple[str, 're.Pattern', bool]] = []
+
+    def add_file(self, path: Path, base: str) -> None:
+        try:
+            lines = path.read_text(encoding='utf-8', errors='replace').splitlines()
+        except OSError:
+            return
+        for line in lines:
+            line = line.rstrip()
+            if line.endswith('\\'):
+                line += ' '
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('!'):
+                raise Ambiguous(f"negated ignore pattern in {path}")
+            directory_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            if '/' in line:
+                regex = _glob_to_regex(line.lstrip('/'))
+            else:
+                regex = '(?:.*/)?' + _glob_to_regex(line)
+            self.rules.append((base, re.compile(regex + r'\Z'), directory_only))
+
+    def ignored(self, relpath: str, is_dir: bool) -> bool:
+        for base, regex, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if base:
+                if not relpath.startswith(base + '/'):
+                    continue
+                candidate = relpath[len(base) + 1:]
+            else:
+                candidate = relpath
+            if regex.match(candidate):
+                return True
+        return False
+
+
+def _has_untracked(worktree: Path, git_dir: Path, tracked: Set[str]) -> bool:
+    """True if a non-ignored file outside the index exists; Ambiguous if unsure."""
+    rules = IgnoreRules()
+    rules.add_file(common_dir(git_dir) / 'info' / 'exclude', '')
+    tracked_dirs = set()
+    for path in tracked:
+        parent = path.rpartition('/')[0]
+        while parent and parent not in tracked_dirs:
+            tracked_dirs.add(parent)
+            parent = parent.rpartition('/')[0]
+
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        directory = worktree / relative if relative else worktree
+        rules.add_file(directory / '.gitignore', relative)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relpath = f"{relative}/{entry.name}" if relative else entry.name
+                    if relpath in tracked:
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir and entry.name == '.git':
+                        continue
+                    if rules.ignored(relpath, is_dir):
+                        continue
+                    if is_dir:
+                        if os.path.exists(os.path.join(entry.path, '.git')):
+                            raise Ambiguous(f"nested repository {relpath}")
+                        pending.append(relpath)
+                        continue
+                    # An untracked file nothing here ignores; global excludes might
+                    raise Ambiguous(f"untracked file {relpath}")
+        except OSError:
+            continue
+    return False
+
+
+def _worktree_dirty(worktree: Path, git_dir: Path, head: Optional[str]) -> bool:
+    """Decide dirtiness from the index alone, raising Ambiguous when git must decide."""
+    if _config_value(git_dir, r'^\s*objectformat\s*=\s*sha256'):
+        raise Ambiguous("sha256 repository")
+    # With core.fileMode=false (the Windows default) git ignores the exec bit
+    file_mode = not _config_value(git_dir, r'^\s*filemode\s*=\s*(false|no|off|0)\s*$')
+    index = read_index(git_dir)
+    entries = index['entries']
+    if head is None:
+        if entries:
+            return True
+    else:
+        if index['tree'] is None:
+            raise Ambiguous("cache-tree not valid")
+        if index['tree'] != read_commit_tree(git_dir, head):
+            return True
+
+    tracked = set()
+    for name, mtime_s, mtime_ns, mode, size, flags, extended in entries:
+        if (flags >> 12) & 3:
+            return True  # unmerged
+        if extended & _INTENT_TO_ADD:
+            return True
+        if extended & _SKIP_WORKTREE or flags & _ASSUME_VALID:
+            tracked.add(name)
+            continue
+        if mode == _GITLINK:
+            raise Ambiguous(f"submodule {name}")
+        tracked.add(name)
+        try:
+            stat = os.lstat(worktree / name)
+        except FileNotFoundError:
+            return True
+        except OSError:
+            raise Ambiguous(f"cannot stat {name}")
+        if (stat.st_size & 0xffffffff) != size:
+            if size == 0:
+                raise Ambiguous(f"{name} was smudged as racily clean")
+            return True
+        if file_mode and mode & 0o170000 == 0o100000 and (stat.st_mode & 0o100) != (mode & 0o100):
+            return True
+        recorded = mtime_s * 1_000_000_000 + mtime_ns
+        if stat.st_mtime_ns != recorded and not (mtime_ns == 0 and stat.st_mtime_ns // 1_000_000_000 == mtime_s):
+            raise Ambiguous(f"{name} touched since it was indexed")
+        if recorded >= index['mtime_ns']:
+            raise Ambiguous(f"{name} is racily clean")
+    return _has_untracked(worktree, git_dir, tracked)
+
+
+def git_status_dirty(path: Path) -> bool:
+    """Ask git whether the worktree has any changes."""
+    result = subprocess.run(['git', 'status', '--porcelain'], cwd=path,
+                            capture_output=True, text=True, check=True)
+    return bool(result.stdout.strip())
+
+
+def read_git_state(path: Path, fallback: bool = True) -> Dict:
+    """Return ``{'is_repo', 'branch', 'head', 'has_remote', 'remote', 'dirty', 'source'}`` for a worktree.
+
+    ``remote`` is the origin URL, if any. ``source`` is ``'files'`` when everything was decided from ``.git``,
+    ``'git'`` when git had to be run and ``'unknown'`` when it was needed
+    but ``fallback`` is False (``dirty``/``has_remote`` are then None).
+    """
+    path = Path(path)
+    state = {'is_repo': False, 'branch': None, 'head': None, 'has_remote': False,
+             'remote': None, 'dirty': None, 'source': 'files'}
+    git_dir = find_git_dir(path)
+    if git_dir is None or not (git_dir / 'HEAD').is_file():
+        return state
+    state['is_repo'] = True
+    try:
+        state['branch'], state['head'] = read_head(git_dir)
+        state['has_remote'] = read_config_remotes(git_dir)
+        state['remote'] = read_remote_url(git_dir)
+        if state['has_remote'] is None:
+            raise Ambiguous("config includes")
+        state['dirty'] = _worktree_dirty(path, git_dir, state['head'])
+    except (Ambiguous, OSError, ValueError, IndexError, struct.error, zlib.error):
+        if not fallback:
+            state['source'] = 'unknown'
+            return state
+        state['source'] = 'git'
+        try:
+            state['dirty'] = git_status_dirty(path)
+            if state['has_remote'] is None:
+                remotes = subprocess.run(['git', 'remote'], cwd=path, capture_output=True,
+                                         text=True, check=True)
+                state['has_remote'] = bool(remotes.stdout.strip())
+        except (OSError, subprocess.CalledProcessError):
+            state['dirty'] = None
+    return state
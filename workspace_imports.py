@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Cross-project import graph for the workspace's first-party Python code.
+
+Every ``.py`` file in a project's content manifest is parsed with ``ast`` (in
+a process pool) and its imports are cached per file digest, so re-indexing
+after an edit only parses files with new content; projects whose manifest is
+unchanged since the last index are skipped outright. The resulting edges are
+stored next to the module names each project defines, which makes both
+directions queryable: who imports ``shared.utils.api_client``, and which
+projects depend on which.
+
+Usage:
+    python workspace_imports.py index [--jobs N] [--all-dirs]
+    python workspace_imports.py who-imports MODULE
+    python workspace_imports.py deps [PROJECT]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import argparse
+import ast
+import json
+import os
+
+from workspace_manifest import CURRENT, ManifestStore
+from workspace_watch import load_projects
+
+# Manifest label recording each project's state when its imports were indexed
+MANIFEST_LABEL = 'imports'
+# Below this many files parsing happens in-process; a pool costs more to start.
+PARALLEL_THRESHOLD = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS import_parses (
+    digest TEXT PRIMARY KEY,
+    imports TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS import_edges (
+    project TEXT NOT NULL,
+    relpath TEXT NOT NULL,
+    module TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS import_edges_module ON import_edges (module);
+CREATE INDEX IF NOT EXISTS import_edges_project ON import_edges (project);
+CREATE TABLE IF NOT EXISTS import_modules (
+    project TEXT NOT NULL,
+    module TEXT NOT NULL,
+    PRIMARY KEY (project, module)
+);
+CREATE INDEX IF NOT EXISTS import_modules_module ON import_modules (module);
+"""
+
+
+def parse_imports(path: str) -> Optional[List[Tuple[str, int, List[str]]]]:
+    """Return ``(module, level, names)`` for every import statement in a file.
+
+    Plain ``import a.b`` yields ``('a.b', 0, [])``; ``from ..x import y``
+    yields ``('x', 2, ['y'])``. Files that fail to parse return ``None``.
+    """
+    try:
+        with open(path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend((alias.name, 0, []) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.module or '', node.level, [alias.name for alias in node.names]))
+    return imports
+
+
+def module_parts(relpath: str) -> List[str]:
+    """Return the dotted module path of a project file, honouring ``src/`` layouts."""
+    parts = relpath[:-3].split('/')
+    if parts[0] == 'src' and len(parts) > 1:
+        parts = parts[1:]
+    if parts[-1] == '__init__':
+        parts = parts[:-1]
+    return parts
+
+
+def resolve_imports(relpath: str, imports: Iterable[Tuple[str, int, List[str]]]) -> Set[str]:
+    """Turn raw import records into absolute module names for one file.
+
+    ``from package import name`` records both ``package`` and
+    ``package.name`` since ``name`` may be a submodule.
+    """
+    package = module_parts(relpath)
+    if not relpath.endswith('__init__.py'):
+        package = package[:-1]
+    modules = set()
+    for module, level, names in imports:
+        if level:
+            if level - 1 > len(package):
+                continue
+            base = package[:len(package) - (level - 1)]
+            target = '.'.join(base + ([module] if module else []))
+        else:
+            target = module
+        if target:
+            modules.add(target)
+        for name in names:
+            if name != '*':
+                modules.add(f"{target}.{name}" if target else name)
+    return modules
+
+
+def _parse_many(paths: List[str], jobs: Optional[int]) -> List[Optional[list]]:
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(paths) < PARALLEL_THRESHOLD:
+        return [parse_imports(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(parse_imports, paths, chunksize=32))
+
+
+class ImportGraph:
+    """Incrementally maintained import graph across workspace projects."""
+
+    def __init__(self, base_path: Path = Path('.'), jobs: Optional[int] = None) -> None:
+        self.base_path = Path(base_path)
+        self.jobs = jobs
+        self.manifests = ManifestStore(self.base_path)
+        self.conn = self.manifests.conn
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'ImportGraph':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.manifests.close()
+
+    def index(self, projects: Iterable[Dict], force: bool = False) -> Dict[str, int]:
+        """Re-index changed projects; return files parsed per re-indexed project."""
+        parsed = {}
+        for project in projects:
+            name = project['name']
+            if not self.manifests.needs_update(name, MANIFEST_LABEL, project['path']) and not force:
+                continue
+            parsed[name] = self._index_project(name, Path(project['path']))
+            self.manifests.mark(name, MANIFEST_LABEL)
+        return parsed
+
+    def importers(self, module: str, include_submodules: bool = True) -> List[Tuple[str, str]]:
+        """Return ``(project, relpath)`` of every file importing ``module``."""
+        query = "SELECT DISTINCT project, relpath FROM import_edges WHERE module = ?"
+        params: Tuple = (module,)
+        if include_submodules:
+            query += " OR module LIKE ? ESCAPE '\\'"
+            escaped = module.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params += (escaped + '.%',)
+        return self.conn.execute(query + " ORDER BY project, relpath", params).fetchall()
+
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """Return, for each project, the other projects whose modules it imports.
+
+        A module the importing project defines itself (its own ``utils``,
+        ``config``, ...) resolves locally and is no cross-project edge.
+        """
+        graph: Dict[str, Set[str]] = {}
+        rows = self.conn.execute(
+            "SELECT DISTINCT e.project, m.project FROM import_edges e "
+            "JOIN import_modules m ON m.module = e.module WHERE m.project != e.project "
+            "AND NOT EXISTS (SELECT 1 FROM import_modules s WHERE s.project = e.project AND s.module = e.module)"
+        )
+        for importer, provider in rows:
+            graph.setdefault(importer, set()).add(provider)
+        return graph
+
+    def dependents(self, project: str) -> Set[str]:
+        """Return the projects that import any module defined by ``project``."""
+        return {importer for importer, providers in self.dependencies().items() if project in providers}
+
+    def _index_project(self, name: str, path: Path) -> int:
+        sources = [(relpath, digest) for relpath, _, digest in self.manifests.entries(name)
+                   if relpath.endswith('.py')]
+        cached = dict(self.conn.execute(
+            "SELECT p.digest, p.imports FROM import_parses p JOIN manifest_entries m "
+            "ON m.digest = p.digest WHERE m.project = ? AND m.label = ?", (name, CURRENT)
+        ))
+        missing = sorted({digest: relpath for relpath, digest in sources if digest not in cached}.items())
+        results = _parse_many([os.path.join(path, relpath) for _, relpath in missing], self.jobs)
+        new_rows = []
+        for (digest, _), imports in zip(missing, results):
+            encoded = json.dumps(imports or [])
+            cached[digest] = encoded
+            new_rows.append((digest, encoded))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO import_parses (digest, imports) VALUES (?, ?)", new_rows
+        )
+
+        edges = []
+        modules = set()
+        for relpath, digest in sources:
+            parts = module_parts(relpath)
+            modules.update('.'.join(parts[:depth]) for depth in range(1, len(parts) + 1))
+            for module in resolve_imports(relpath, json.loads(cached[digest])):
+                edges.append((name, relpath, module))
+        self.conn.execute("DELETE FROM import_edges WHERE project = ?", (name,))
+        self.conn.execute("DELETE FROM import_modules WHERE project = ?", (name,))
+        self.conn.executemany(
+            "INSERT INTO import_edges (project, relpath, module) VALUES (?, ?, ?)", edges
+        )
+        self.conn.executemany(
+            "INSERT INTO import_modules (project, module) VALUES (?, ?)",
+            [(name, module) for module in modules],
+        )
+        self.conn.commit()
+        return len(missing)
+
+
+def workspace_directories(base_path: Path) -> List[Dict]:
+    """Every non-hidden top-level directory, for trees missing from the inventory."""
+    return [
+        {'name': path.name, 'path': path}
+        for path in sorted(base_path.iterdir())
+        if path.is_dir() and not path.name.startswith('.')
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Index and query cross-project Python imports')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    index_parser = subparsers.add_parser('index', help='Re-index changed projects')
+    index_parser.add_argument('--jobs', type=int, default=None,
+                              help='Worker processes for parsing (default: CPU count)')
+    index_parser.add_argument('--all-dirs', action='store_true',
+                              help='Index every top-level directory, not just clone_summary.json projects')
+    index_parser.add_argument('--force', action='store_true',
+                              help='Re-index projects even if unchanged since the last index')
+    who_parser = subparsers.add_parser('who-imports', help='List files importing a module')
+    who_parser.add_argument('module')
+    deps_parser = subparsers.add_parser('deps', help='Show cross-project dependencies')
+    deps_parser.add_argument('project', nargs='?')
+    args = parser.parse_args()
+
+    base_path = Path('.')
+    with ImportGraph(base_path, jobs=getattr(args, 'jobs', None)) as graph:
+        if args.command == 'index':
+            projects = workspace_directories(base_path) if args.all_dirs else load_projects(base_path)
+            parsed = graph.index(projects, force=args.force)
+            for name, count in parsed.items():
+                print(f"Indexed {name} ({count} files parsed)")
+            print(f"Re-indexed {len(parsed)} of {len(projects)} projects")
+        elif args.command == 'who-imports':
+            for project, relpath in graph.importers(args.module):
+                print(f"{project}/{relpath}")
+        else:
+            dependencies = graph.dependencies()
+            if args.project:
+                print(f"{args.project} imports from: {', '.join(sorted(dependencies.get(args.project, ()))) or '-'}")
+                print(f"{args.project} is imported by: {', '.join(sorted(graph.dependents(args.project))) or '-'}")
+            else:
+                for project, providers in sorted(dependencies.items()):
+                    print(f"{project} -> {', '.join(sorted(providers))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""Persistent, mtime-keyed index of the projects in the workspace.
+
+The index lives in a SQLite file under the workspace root and records, for
+every project listed in ``clone_summary.json``, its detected type, file count,
+total size and the mtime of every directory in its tree (SKIP_DIRS pruned).
+A refresh only re-reads directories whose mtime changed, so a re-run over an
+unchanged workspace costs one ``stat`` per directory instead of a full walk.
+Projects that did change are re-classified in parallel via
+``workspace_utils.classify_projects``.
+
+Directory mtimes change when entries are added, removed or renamed; in-place
+edits to existing files are not tracked here.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import os
+import sqlite3
+
+from workspace_utils import SKIP_DIRS, classify_projects, load_inventory
+
+INDEX_FILENAME = '.workspace_index.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    project TEXT NOT NULL,
+    relpath TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    total_size INTEGER NOT NULL,
+    PRIMARY KEY (project, relpath)
+);
+"""
+
+
+class WorkspaceIndex:
+    """SQLite-backed cache of project metadata keyed on directory mtimes."""
+
+    def __init__(
+        self,
+        base_path: Path = Path('.'),
+        db_path: Optional[Path] = None,
+        jobs: Optional[int] = None,
+    ) -> None:
+        self.base_path = Path(base_path)
+        self.jobs = jobs
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'WorkspaceIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def inventory_names(self) -> List[str]:
+        """Return every project named in clone_summary.json, cloned or not.
+
+        The names are cached on the file's mtime.
+        """
+        config_path = self.base_path / 'clone_summary.json'
+        try:
+            mtime_ns = str(config_path.stat().st_mtime_ns)
+        except OSError:
+            return []
+        cached = dict(self.conn.execute(
+            "SELECT key, value FROM meta WHERE key IN ('inventory_mtime_ns', 'inventory_names')"
+        ))
+        if cached.get('inventory_mtime_ns') == mtime_ns:
+            names = json.loads(cached['inventory_names'])
+        else:
+            names = [repo['name'] for repo in load_inventory(config_path) if repo.get('name')]
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [('inventory_mtime_ns', mtime_ns), ('inventory_names', json.dumps(names))],
+            )
+        return names
+
+    def project_names(self) -> List[str]:
+        """Return the clone_summary.json projects whose directories exist.
+
+        Which of them exist is checked on every call, so a project cloned
+        later shows up without the inventory being touched.
+        """
+        names = self.inventory_names()
+        if not names:
+            return []
+        # One scandir of the workspace root, as in get_project_directories
+        try:
+            with os.scandir(self.base_path) as entries:
+                present = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
+            return []
+        return [name for name in names if name in present]
+
+    def refresh(self, dirty: Optional[Dict[str, Iterable[str]]] = None) -> List[Dict]:
+        """Bring the index up to date and return every project record.
+
+        ``dirty`` restricts the refresh to the named projects and forces the
+        given relative directories to be rescanned even if their mtime is
+        unchanged (used by the watcher when it already knows what changed).
+        """
+        names = self.project_names()
+        targets = names if dirty is None else [name for name in names if name in dirty]
+        changed = {}
+        for name in targets:
+            path = self.base_path / name
+            force = set(dirty[name]) if dirty is not None else set()
+            if not path.is_dir():
+                self._forget(name)
+            elif self._refresh_project(name, path, force):
+                changed[path] = name
+        for path, project_type in classify_projects(changed, self.jobs, ordered=False):
+            self.conn.execute(
+                "UPDATE projects SET type = ? WHERE name = ?", (project_type, changed[path])
+            )
+        stale = {row[0] for row in self.conn.execute("SELECT name FROM projects")} - set(names)
+        for name in stale:
+            self._forget(name)
+        self.conn.commit()
+        order = {name: position for position, name in enumerate(names)}
+        return sorted(self.projects(), key=lambda record: order[record['name']])
+
+    def projects(self) -> List[Dict]:
+        """Return the indexed project records without touching the filesystem."""
+        rows = self.conn.execute(
+            "SELECT name, path, type, file_count, total_size FROM projects ORDER BY name"
+        )
+        return [
+            {
+                'name': name,
+                'path': Path(path),
+                'type': project_type,
+                'file_count': file_count,
+                'total_size': total_size,
+            }
+            for name, path, project_type, file_count, total_size in rows
+        ]
+
+    def project_directories(self) -> List[Path]:
+        """Indexed replacement for ``workspace_utils.get_project_directories``."""
+        return [record['path'] for record in self.refresh()]
+
+    def _forget(self, name: str) -> None:
+        self.conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+        self.conn.execute("DELETE FROM dirs WHERE project = ?", (name,))
+
+    def _refresh_project(self, name: str, path: Path, force: Iterable[str] = ()) -> bool:
+        """Rescan changed directories of one project; return True if it changed."""
+        stored = dict(self.conn.execute(
+            "SELECT relpath, mtime_ns FROM dirs WHERE project = ?", (name,)
+        ))
+        changed = not stored
+        pending = [''] if not stored else []
+        for relpath, mtime_ns in stored.items():
+            try:
+                current = os.stat(os.path.join(path, relpath)).st_mtime_ns
+            except OSError:
+                self.conn.execute(
+                    "DELETE FROM dirs WHERE project = ? AND relpath = ?", (name, relpath)
+                )
+                changed = True
+                continue
+            if current != mtime_ns or relpath in force:
+                pending.append(relpath)
+                changed = True
+
+        while pending:
+            relpath = pending.pop()
+            for subdir in self._scan_dir(name, path, relpath):
+                if subdir not in stored:
+                    pending.append(subdir)
+
+        known = self.conn.execute("SELECT 1 FROM projects WHERE name = ?", (name,)).fetchone()
+        if known and not changed:
+            return False
+        file_count, total_size = self.conn.execute(
+            "SELECT COALESCE(SUM(file_count), 0), COALESCE(SUM(total_size), 0) "
+            "FROM dirs WHERE project = ?", (name,)
+        ).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO projects (name, path, type, file_count, total_size) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, os.fspath(path), 'Unknown', file_count, total_size),
+        )
+        return True
+
+    def _scan_dir(self, name: str, root: Path, relpath: str) -> List[str]:
+        """Record one directory's direct files and return its subdirectories."""
+        directory = os.path.join(root, relpath)
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as iterator:
+                entries = list(iterator)
+        except OSError:
+            return []
+        file_count = total_size = 0
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        subdirs.append(os.path.join(relpath, entry.name) if relpath else entry.name)
+                    continue
+                total_size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            file_count += 1
+        self.conn.execute(
+            "INSERT OR REPLACE INTO dirs (project, relpath, mtime_ns, file_count, total_size) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, relpath, mtime_ns, file_count, total_size),
+        )
+        return subdirs
@@ -0,0 +1,132 @@
+"""Resumable journal of per-project git stages for push_all_projects.
+
+Each run of the git pipeline records, per project, which of the stages
+``init``, ``commit``, ``remote`` and ``push`` completed (or how they last
+failed) in the workspace index, committing after every change so an
+interrupted run loses nothing. A run stays open until every project in it
+has succeeded; the next journaled invocation resumes it, skipping journaled
+stages and completed projects, so a 50-repository push that died at
+repository 31 restarts there instead of from the beginning.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sqlite3
+import time
+
+from workspace_index import INDEX_FILENAME
+
+JOURNAL_STAGES = ('init', 'commit', 'remote', 'push')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS push_runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS push_journal (
+    run INTEGER NOT NULL,
+    project TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (run, project, stage)
+);
+"""
+
+
+class PushJournal:
+    """Records stage completion for one (possibly resumed) pipeline run.
+
+    Pass ``conn`` to share an open index connection; the caller then owns
+    closing it. ``restart`` abandons an unfinished run instead of resuming
+    it.
+    """
+
+    def __init__(self, base_path: Path = Path('.'), db_path: Optional[Path] = None,
+                 conn: Optional[sqlite3.Connection] = None, restart: bool = False) -> None:
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.owns_conn = conn is None
+        self.conn = sqlite3.connect(str(self.db_path)) if conn is None else conn
+        self.conn.executescript(_SCHEMA)
+        self.run_id, self.resumed = self._open_run(restart)
+
+    def __enter__(self) -> 'PushJournal':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        if self.owns_conn:
+            self.conn.close()
+
+    def _open_run(self, restart: bool) -> Tuple[int, bool]:
+        row = self.conn.execute(
+            "SELECT id FROM push_runs WHERE finished IS NULL ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        if row and restart:
+            self.conn.execute("UPDATE push_runs SET finished = ? WHERE id = ?", (time.time(), row[0]))
+            row = None
+        if row:
+            return row[0], True
+        cursor = self.conn.execute("INSERT INTO push_runs (started) VALUES (?)", (time.time(),))
+        self.conn.commit()
+        return cursor.lastrowid, False
+
+    def _record(self, project: str, stage: str, status: str, attempts: int, error: Optional[str]) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO push_journal (run, project, stage, status, attempts, error, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.run_id, project, stage, status, attempts, error, time.time()),
+        )
+        self.conn.commit()
+
+    def done(self, project: str, stage: str, attempts: int = 1) -> None:
+        """Record that ``stage`` completed for ``project``."""
+        self._record(project, stage, 'done', attempts, None)
+
+    def failed(self, project: str, stage: str, error: str, attempts: int = 1) -> None:
+        """Record that ``stage`` failed for ``project`` after ``attempts`` tries."""
+        self._record(project, stage, 'failed', attempts, error)
+
+    def completed(self, project: str) -> Set[str]:
+        """Stages journaled as done for ``project`` in this run."""
+        return {stage for (stage,) in self.conn.execute(
+            "SELECT stage FROM push_journal WHERE run = ? AND project = ? AND status = 'done'",
+            (self.run_id, project),
+        )}
+
+    def is_complete(self, project: str, stages: Iterable[str]) -> bool:
+        return set(stages) <= self.completed(project)
+
+    def failures(self) -> List[Dict]:
+        """Stages whose latest attempt in this run failed."""
+        return [
+            {'project': project, 'stage': stage, 'error': error, 'attempts': attempts}
+            for project, stage, error, attempts in self.conn.execute(
+                "SELECT project, stage, error, attempts FROM push_journal "
+                "WHERE run = ? AND status = 'failed' ORDER BY project, stage",
+                (self.run_id,),
+            )
+        ]
+
+    def finish(self) -> bool:
+        """Close the run if nothing in it is still failing; returns whether it was closed."""
+        if self.failures():
+            return False
+        self.conn.execute("UPDATE push_runs SET finished = ? WHERE id = ?", (time.time(), self.run_id))
+        self.conn.commit()
+        return True
+
+    def summary(self) -> str:
+        counts = dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM push_journal WHERE run = ? GROUP BY status", (self.run_id,)
+        ).fetchall())
+        state = 'resumed' if self.resumed else 'new'
+        return (f"journal run {self.run_id} ({state}): {counts.get('done', 0)} stages done, "
+                f"{counts.get('failed', 0)} failing")
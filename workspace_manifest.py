@@ -0,0 +1,219 @@
+"""Content-hash manifests for cheap per-project change detection.
+
+Each project has a live manifest recording ``(size, mtime_ns, blake2b)`` for
+every file in its tree (SKIP_DIRS pruned). Updating it re-hashes only files
+whose size or mtime changed. Consumers snapshot the live manifest under a
+label when they finish (``mark``) and later ask whether anything changed
+since that label, so a generator or push step can skip untouched projects.
+Because comparisons are by content hash, rewriting a file with identical
+bytes does not count as a change. A generator leaves its own output files
+out of the comparison (``exclude``), so editing a generated document does
+not get it regenerated, and records a digest of its other inputs
+(template, project type, ...) with the mark, so changing those does.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import mmap
+import os
+import sqlite3
+import time
+
+from workspace_index import INDEX_FILENAME
+from workspace_utils import iter_project_entries
+
+CURRENT = 'current'
+CHUNK_SIZE = 1 << 20
+MMAP_THRESHOLD = 8 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifest_entries (
+    project TEXT NOT NULL,
+    label TEXT NOT NULL,
+    relpath TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (project, label, relpath)
+);
+CREATE TABLE IF NOT EXISTS manifest_marks (
+    project TEXT NOT NULL,
+    label TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    inputs TEXT,
+    PRIMARY KEY (project, label)
+);
+"""
+
+
+def hash_file(path: str, size: Optional[int] = None) -> str:
+    """Return the BLAKE2b hex digest of a file.
+
+    Small files are read in one call, large ones are memory-mapped and fall
+    back to chunked reads where mapping is not possible.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+            except (OSError, ValueError):
+                f.seek(0)
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ManifestStore:
+    """Per-project file manifests kept alongside the workspace index."""
+
+    def __init__(self, base_path: Path = Path('.'), db_path: Optional[Path] = None) -> None:
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(manifest_marks)")}
+        if 'inputs' not in columns:
+            # Indexes created before marks recorded their inputs
+            self.conn.execute("ALTER TABLE manifest_marks ADD COLUMN inputs TEXT")
+
+    def __enter__(self) -> 'ManifestStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def update(self, name: str, path: Optional[Path] = None) -> int:
+        """Bring the live manifest of one project up to date.
+
+        Returns the number of files that had to be (re-)hashed.
+        """
+        root = os.fspath(path if path is not None else self.base_path / name)
+        stored = {
+            relpath: (size, mtime_ns)
+            for relpath, size, mtime_ns in self.conn.execute(
+                "SELECT relpath, size, mtime_ns FROM manifest_entries "
+                "WHERE project = ? AND label = ?", (name, CURRENT)
+            )
+        }
+        seen = set()
+        rows = []
+        prefix = len(root.rstrip(os.sep)) + 1
+        for entry in iter_project_entries(Path(root)):
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            relpath = entry.path[prefix:].replace(os.sep, '/')
+            seen.add(relpath)
+            if stored.get(relpath) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            try:
+                digest = hash_file(entry.path, stat.st_size)
+            except OSError:
+                continue
+            rows.append((name, CURRENT, relpath, stat.st_size, stat.st_mtime_ns, digest))
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO manifest_entries "
+            "(project, label, relpath, size, mtime_ns, digest) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.executemany(
+            "DELETE FROM manifest_entries WHERE project = ? AND label = ? AND relpath = ?",
+            [(name, CURRENT, relpath) for relpath in stored.keys() - seen],
+        )
+        self.conn.commit()
+        return len(rows)
+
+    def entries(self, name: str, label: str = CURRENT) -> List[Tuple[str, int, str]]:
+        """Return ``(relpath, size, digest)`` for every file in a manifest."""
+        return self.conn.execute(
+            "SELECT relpath, size, digest FROM manifest_entries "
+            "WHERE project = ? AND label = ? ORDER BY relpath", (name, label)
+        ).fetchall()
+
+    def mark(self, name: str, label: str, inputs: Optional[str] = None) -> None:
+        """Snapshot the live manifest of a project under ``label``.
+
+        ``inputs`` is a digest of whatever else the consumer's output
+        depends on; ``changed_since`` compares it.
+        """
+        self.conn.execute(
+            "DELETE FROM manifest_entries WHERE project = ? AND label = ?", (name, label)
+        )
+        self.conn.execute(
+            "INSERT INTO manifest_entries (project, label, relpath, size, mtime_ns, digest) "
+            "SELECT project, ?, relpath, size, mtime_ns, digest FROM manifest_entries "
+            "WHERE project = ? AND label = ?",
+            (label, name, CURRENT),
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO manifest_marks (project, label, created_at, inputs) VALUES (?, ?, ?, ?)",
+            (name, label, time.time(), inputs),
+        )
+        self.conn.commit()
+
+    def changes(self, name: str, since: str) -> Dict[str, List[str]]:
+        """Return files added, removed and modified since manifest ``since``."""
+        query = (
+            "SELECT a.relpath FROM manifest_entries a "
+            "LEFT JOIN manifest_entries b "
+            "ON b.project = a.project AND b.label = ? AND b.relpath = a.relpath "
+            "WHERE a.project = ? AND a.label = ? AND {condition} ORDER BY a.relpath"
+        )
+        missing = query.format(condition="b.relpath IS NULL")
+        modified = query.format(condition="b.digest != a.digest")
+        return {
+            'added': [row[0] for row in self.conn.execute(missing, (since, name, CURRENT))],
+            'removed': [row[0] for row in self.conn.execute(missing, (CURRENT, name, since))],
+            'modified': [row[0] for row in self.conn.execute(modified, (since, name, CURRENT))],
+        }
+
+    def changed_since(self, name: str, since: str, exclude: Iterable[str] = (),
+                      inputs: Optional[str] = None) -> bool:
+        """True if the live manifest differs from ``since`` or it was never marked.
+
+        Files in ``exclude`` (relative paths) are left out of the
+        comparison. If ``inputs`` is given, a mark recorded with different
+        inputs also counts as a change.
+        """
+        marked = self.conn.execute(
+            "SELECT inputs FROM manifest_marks WHERE project = ? AND label = ?", (name, since)
+        ).fetchone()
+        if not marked:
+            return True
+        if inputs is not None and marked[0] != inputs:
+            return True
+        exclude = list(exclude)
+        kept = f" AND relpath NOT IN ({', '.join('?' * len(exclude))})" if exclude else ""
+        differs = self.conn.execute(
+            "SELECT EXISTS ("
+            "  SELECT 1 FROM manifest_entries a LEFT JOIN manifest_entries b"
+            "  ON b.project = a.project AND b.label = ? AND b.relpath = a.relpath"
+            f"  WHERE a.project = ? AND a.label = ?{kept.replace('relpath', 'a.relpath')}"
+            "  AND (b.relpath IS NULL OR b.digest != a.digest)"
+            ") OR ("
+            f"  SELECT COUNT(*) FROM manifest_entries WHERE project = ? AND label = ?{kept}"
+            ") != ("
+            f"  SELECT COUNT(*) FROM manifest_entries WHERE project = ? AND label = ?{kept}"
+            ")",
+            (since, name, CURRENT, *exclude, name, CURRENT, *exclude, name, since, *exclude),
+        ).fetchone()[0]
+        return bool(differs)
+
+    def needs_update(self, name: str, since: str, path: Optional[Path] = None,
+                     exclude: Iterable[str] = (), inputs: Optional[str] = None) -> bool:
+        """Refresh the live manifest and report whether it changed since ``since``."""
+        self.update(name, path)
+        return self.changed_since(name, since, exclude, inputs)
@@ -0,0 +1,313 @@
+"""Asyncio git orchestrator with per-stage concurrency limits.
+
+Each project runs the stages ``commit`` (init, add, commit; only for
+projects whose ``has_git`` is false, so existing histories and work in
+progress are left alone), ``remote`` (add origin if missing) and
+optionally ``push`` in order, but every stage has its own semaphore:
+disk/CPU-bound commits and network-bound pushes are throttled
+independently, and because a project releases the commit slot before
+queueing for a push slot, project B can be committing while project A
+is pushing. Each stage has a timeout; a timed-out or cancelled stage
+kills its git process. With ``fail_fast`` the first failure cancels
+every project still in flight. With ``fast_import`` a repository's first
+commit is streamed through ``git fast-import``.
+
+Transient failures (network errors, 5xx responses, timeouts) of the stages
+in ``retries`` are retried with exponential backoff and jitter, releasing
+the stage's slot while waiting. With a ``PushJournal`` every completed
+stage is recorded, and stages or whole projects already completed in a
+resumed run are skipped.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import asyncio
+import os
+import random
+import re
+import signal
+import time
+
+from workspace_fastimport import FastImportUnsupported, ImportStream, fast_import_env, import_ref
+from workspace_gitstate import find_git_dir, read_config_remotes
+from workspace_journal import PushJournal
+from workspace_profile import profiler
+
+STAGES = ('commit', 'remote', 'push')
+DEFAULT_LIMITS = {'commit': os.cpu_count() or 1, 'remote': 16, 'push': 8}
+DEFAULT_TIMEOUTS = {'commit': 300.0, 'remote': 30.0, 'push': 600.0}
+DEFAULT_RETRIES = {'push': 3}
+DEFAULT_REMOTE_URL = 'https://github.com/Dadudekc/{name}.git'
+
+# git's wording for failures worth retrying: DNS, TCP and TLS trouble,
+# dropped connections and server-side (5xx) errors
+TRANSIENT_ERRORS = re.compile(
+    r'could not resolve host|connection (?:timed out|reset|refused)|operation timed out'
+    r'|remote end hung up|early eof|rpc failed|http 5\d\d|error: 5\d\d|temporarily unavailable'
+    r'|gnutls_handshake|ssl_error|tls connection',
+    re.IGNORECASE,
+)
+
+
+class GitCommandError(Exception):
+    """A git command exited non-zero."""
+
+    def __init__(self, args, returncode: int, stderr: str) -> None:
+        super().__init__(f"git {' '.join(args)} exited with {returncode}: {stderr.strip()}")
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+def is_transient(error: BaseException) -> bool:
+    """True if retrying the failed git command may succeed."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    return isinstance(error, GitCommandError) and TRANSIENT_ERRORS.search(error.stderr) is not None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Seconds to wait before retry ``attempt`` (1-based): exponential, capped, half jittered."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _kill(process: asyncio.subprocess.Process) -> None:
+    """Kill git together with helpers it spawned (ssh, hooks, credential helpers)."""
+    try:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def run_git(path: Path, *args: str) -> str:
+    """Run git in ``path`` and return its stdout; the process is killed if cancelled."""
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=os.fspath(path),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        start_new_session=hasattr(os, 'killpg'),
+    )
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        _kill(process)
+        await process.wait()
+        raise
+    if process.returncode:
+        raise GitCommandError(args, process.returncode, stderr.decode('utf-8', 'replace'))
+    return stdout.decode('utf-8', 'replace')
+
+
+async def run_fast_import(path: Path, stream: ImportStream) -> None:
+    """Feed ``stream`` into ``git fast-import``, reading files off the event loop."""
+    args = ('fast-import', '--quiet', '--done')
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=os.fspath(path), env=fast_import_env(),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        start_new_session=hasattr(os, 'killpg'),
+    )
+    chunks = stream.chunks()
+    try:
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # fast-import died; its exit status and stderr say why
+        stderr = await process.stderr.read()
+        await process.wait()
+    except BaseException:
+        # Without 'done' fast-import aborts and leaves no ref behind
+        _kill(process)
+        await process.wait()
+        raise
+    if process.returncode:
+        raise GitCommandError(args, process.returncode, stderr.decode('utf-8', 'replace'))
+
+
+class GitOrchestrator:
+    """Runs the per-project git stages for many projects concurrently.
+
+    ``limits`` and ``timeouts`` map stage names to a concurrency limit and
+    a timeout in seconds (``None`` for no timeout), overriding the defaults.
+    ``remote_url`` is a format string with ``{name}`` used when a project
+    has no origin remote. ``retries`` maps stage names to how many times a
+    transient failure is retried, waiting ``backoff_delay(attempt,
+    backoff, backoff_cap)`` seconds in between.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None, timeouts: Optional[Dict[str, float]] = None,
+                 remote_url: str = DEFAULT_REMOTE_URL, push: bool = False, fail_fast: bool = False,
+                 fast_import: bool = False, retries: Optional[Dict[str, int]] = None,
+                 backoff: float = 1.0, backoff_cap: float = 30.0,
+                 journal: Optional[PushJournal] = None) -> None:
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.remote_url = remote_url
+        self.stages = STAGES if push else STAGES[:-1]
+        self.fail_fast = fail_fast
+        self.fast_import = fast_import
+        self.retries = {**DEFAULT_RETRIES, **(retries or {})}
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+        self.journal = journal
+
+    async def _commit(self, project: Dict, log: List[str]) -> None:
+        path, name = project['path'], project['name']
+        if not (path / '.git').exists():
+            await run_git(path, 'init')
+            log.append(f"✅ Initialized git repository for {name}")
+        if self.journal is not None:
+            self.journal.done(name, 'init')
+        if self.fast_import and await self._import(project, log):
+            return
+        try:
+            await run_git(path, 'add', '.')
+        except GitCommandError:
+            await run_git(path, 'add', '-f', '.')
+        if (await run_git(path, 'status', '--porcelain')).strip():
+            await run_git(path, 'commit', '-m', f'Initial commit for {name}')
+            log.append(f"✅ Committed changes for {name}")
+        else:
+            log.append(f"ℹ️  No changes to commit for {name}")
+
+    async def _import(self, project: Dict, log: List[str]) -> bool:
+        """Create the first commit with fast-import; False if add/commit must be used."""
+        path, name = project['path'], project['name']
+        try:
+            ref = import_ref(path)
+            author = (await run_git(path, 'var', 'GIT_AUTHOR_IDENT')).strip()
+            committer = (await run_git(path, 'var', 'GIT_COMMITTER_IDENT')).strip()
+            stream = ImportStream(path, ref, f'Initial commit for {name}', author, committer)
+            await run_fast_import(path, stream)
+        except FastImportUnsupported as e:
+            log.append(f"ℹ️  Using git add for {name}: {e}")
+            return False
+        await asyncio.to_thread(stream.finish)
+        log.append(f"✅ Imported {stream.files} files for {name} with git fast-import")
+        return True
+
+    async def _remote(self, project: Dict, log: List[str]) -> None:
+        path, name = project['path'], project['name']
+        git_dir = find_git_dir(path)
+        has_remote = read_config_remotes(git_dir) if git_dir is not None else None
+        if has_remote is None:
+            has_remote = bool((await run_git(path, 'remote', '-v')).strip())
+        if not has_remote:
+            remote_url = self.remote_url.format(name=name)
+            await run_git(path, 'remote', 'add', 'origin', remote_url)
+            log.append(f"✅ Added remote origin for {name}: {remote_url}")
+
+    async def _push(self, project: Dict, log: List[str]) -> None:
+        await run_git(project['path'], 'push', '-u', 'origin', 'HEAD')
+        log.append(f"✅ Successfully pushed {project['name']} to remote repository")
+
+    async def _run_stage(self, stage: str, project: Dict, semaphore: asyncio.Semaphore, result: Dict) -> int:
+        """Run one stage, retrying transient failures; returns the number of attempts."""
+        name = project['name']
+        retries = self.retries.get(stage, 0)
+        attempt = 0
+        while True:
+            attempt += 1
+            result['attempts'][stage] = attempt
+            try:
+                async with semaphore:
+                    with profiler.span(f'git.{stage}', name):
+                        await asyncio.wait_for(getattr(self, f'_{stage}')(project, result['log']),
+                                               self.timeouts.get(stage))
+                return attempt
+            except (GitCommandError, asyncio.TimeoutError) as e:
+                if attempt > retries or not is_transient(e):
+                    raise
+                delay = backoff_delay(attempt, self.backoff, self.backoff_cap)
+                reason = 'timed out' if isinstance(e, asyncio.TimeoutError) else (e.stderr.strip().splitlines() or [str(e)])[-1]
+                result['log'].append(f"🔁 {stage} failed for {name} ({reason}); "
+                                     f"retry {attempt}/{retries} in {delay:.1f}s")
+            # Back off without holding the stage's slot
+            await asyncio.sleep(delay)
+
+    async def run_project(self, project: Dict, semaphores: Dict[str, asyncio.Semaphore]) -> Dict:
+        """Run every stage for one project; never raises except on cancellation."""
+        name = project['name']
+        result = {'name': name, 'ok': True, 'stage': None, 'error': None,
+                  'log': [], 'stages': {}, 'attempts': {}, 'skipped': []}
+        start = time.perf_counter()
+        completed = self.journal.completed(name) if self.journal is not None else set()
+        stage = None
+        # Projects that already have a repository skip the commit stage
+        stages = [stage for stage in self.stages if not (stage == 'commit' and project.get('has_git'))]
+        try:
+            for stage in stages:
+                if stage in completed:
+                    result['skipped'].append(stage)
+                    continue
+                stage_start = time.perf_counter()
+                attempts = await self._run_stage(stage, project, semaphores[stage], result)
+                result['stages'][stage] = time.perf_counter() - stage_start
+                if self.journal is not None:
+                    self.journal.done(name, stage, attempts)
+            if result['skipped']:
+                skipped = ', '.join(result['skipped'])
+                result['log'].append(f"⏭️  Journal: {skipped} already done for {name}")
+        except asyncio.TimeoutError:
+            result.update(ok=False, stage=stage, error=f"timed out after {self.timeouts.get(stage)}s")
+        except asyncio.CancelledError:
+            result.update(ok=False, stage=stage, error='cancelled')
+            raise
+        except Exception as e:
+            result.update(ok=False, stage=stage, error=str(e))
+        finally:
+            result['seconds'] = time.perf_counter() - start
+        if not result['ok'] and self.journal is not None:
+            self.journal.failed(name, stage, result['error'], result['attempts'].get(stage, 1))
+        return result
+
+    async def run(self, projects: List[Dict], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Run all projects; returns results in completion order.
+
+        ``on_result`` is called with each result as its project finishes.
+        Projects cancelled by ``fail_fast`` are reported with error
+        ``'cancelled'``.
+        """
+        semaphores = {stage: asyncio.Semaphore(self.limits[stage]) for stage in self.stages}
+        tasks = {asyncio.ensure_future(self.run_project(project, semaphores)): project for project in projects}
+        results = []
+        try:
+            for finished in asyncio.as_completed(list(tasks)):
+                result = await finished
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                if self.fail_fast and not result['ok']:
+                    break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        # After a fail-fast stop, report what finished meanwhile and what was cancelled
+        reported = {id(result) for result in results}
+        for task, project in tasks.items():
+            if task.cancelled():
+                result = {'name': project['name'], 'ok': False, 'stage': None, 'error': 'cancelled',
+                          'log': [], 'stages': {}, 'attempts': {}, 'skipped': [], 'seconds': 0.0}
+            else:
+                result = task.result()
+                if id(result) in reported:
+                    continue
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    def run_all(self, projects: List[Dict], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Synchronous wrapper around ``run``."""
+        return asyncio.run(self.run(projects, on_result))
@@ -0,0 +1,158 @@
+"""Per-phase timing instrumentation for the workspace management scripts.
+
+Scripts wrap their work in ``profiler.span(phase, project)`` blocks. While
+profiling is disabled (the default) a span is a shared no-op context
+manager, so instrumented code pays one attribute check per span. With
+``--profile`` every span is recorded; at the end a per-phase summary table
+is printed and a Chrome trace-event file is written that Perfetto,
+speedscope or chrome://tracing can load as a flame graph. ``--profile-phase
+NAME`` additionally runs cProfile inside every span of that one phase and
+dumps the stats next to the trace.
+"""
+
+from typing import Dict, List, Optional
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'phase', 'project', 'start', 'cprofile')
+
+    def __init__(self, profiler: 'Profiler', phase: str, project: Optional[str]) -> None:
+        self.profiler = profiler
+        self.phase = phase
+        self.project = project
+        self.cprofile = None
+
+    def __enter__(self) -> '_Span':
+        if self.phase == self.profiler.cprofile_phase:
+            self.cprofile = self.profiler.cprofile
+            self.cprofile.enable()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        end = time.perf_counter_ns()
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.profiler.record(self.phase, self.project, self.start, end)
+        return False
+
+
+class Profiler:
+    """Collects timed spans per phase and project."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.cprofile_phase: Optional[str] = None
+        self.cprofile: Optional[cProfile.Profile] = None
+        self.events: List[tuple] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, cprofile_phase: Optional[str] = None) -> None:
+        self.enabled = True
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self.cprofile_phase = cprofile_phase
+        self.cprofile = cProfile.Profile() if cprofile_phase else None
+
+    def span(self, phase: str, project: Optional[str] = None):
+        """Context manager timing one phase, optionally for one project."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, phase, project)
+
+    def record(self, phase: str, project: Optional[str], start: int, end: int) -> None:
+        with self._lock:
+            self.events.append((phase, project, start, end, threading.get_ident()))
+
+    def summary(self) -> List[Dict]:
+        """Per-phase count, total, mean and max in milliseconds, slowest first."""
+        phases: Dict[str, List[int]] = {}
+        for phase, _, start, end, _ in self.events:
+            phases.setdefault(phase, []).append(end - start)
+        rows = [
+            {
+                'phase': phase,
+                'count': len(durations),
+                'total_ms': sum(durations) / 1e6,
+                'mean_ms': sum(durations) / len(durations) / 1e6,
+                'max_ms': max(durations) / 1e6,
+            }
+            for phase, durations in phases.items()
+        ]
+        return sorted(rows, key=lambda row: -row['total_ms'])
+
+    def print_summary(self) -> None:
+        print(f"\n{'phase':<20} {'count':>7} {'total ms':>11} {'mean ms':>10} {'max ms':>10}")
+        for row in self.summary():
+            print(f"{row['phase']:<20} {row['count']:>7} {row['total_ms']:>11.1f} "
+                  f"{row['mean_ms']:>10.2f} {row['max_ms']:>10.2f}")
+
+    def write_trace(self, path: str) -> None:
+        """Write recorded spans in Chrome trace-event format."""
+        pid = os.getpid()
+        events = [
+            {
+                'name': phase if project is None else f"{phase} {project}",
+                'cat': phase,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': {'project': project} if project is not None else {},
+            }
+            for phase, project, start, end, tid in self.events
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    @staticmethod
+    def add_arguments(parser) -> None:
+        """Add the shared --profile options to an argparse parser."""
+        parser.add_argument('--profile', action='store_true',
+                            help='Time each phase and print a summary table')
+        parser.add_argument('--profile-trace', default='profile_trace.json',
+                            help='Where --profile writes its Chrome trace-event file')
+        parser.add_argument('--profile-phase', default=None,
+                            help='Also capture cProfile stats for this one phase')
+
+    def configure(self, args) -> None:
+        """Enable profiling if the parsed arguments ask for it."""
+        if args.profile or args.profile_phase:
+            self.enable(args.profile_phase)
+
+    def report(self, args) -> None:
+        """Print the summary and write trace/cProfile outputs, if enabled."""
+        if not self.enabled:
+            return
+        self.print_summary()
+        self.write_trace(args.profile_trace)
+        print(f"Trace written to {args.profile_trace}")
+        if self.cprofile is not None:
+            stats_path = f"profile_{args.profile_phase}.prof"
+            self.cprofile.dump_stats(stats_path)
+            print(f"cProfile stats for phase '{args.profile_phase}' written to {stats_path}")
+            pstats.Stats(self.cprofile).sort_stats('cumulative').print_stats(15)
+
+
+profiler = Profiler()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Real checkbox progress across every TASK_LIST.md in the workspace.
+
+Task lists are found at any depth (SKIP_DIRS pruned), so nested lists such
+as ``trading-platform/*/*/TASK_LIST.md`` are included. Each file is scanned
+line by line for ``- [ ]`` / ``- [x]`` items, counted per ``##`` section,
+without ever loading the whole file. Results are cached per file by
+``(size, mtime_ns)`` in the workspace index, so re-aggregating after
+editing one task list re-reads only that file.
+
+Usage: python workspace_progress.py [--json]
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+import argparse
+import json
+import os
+import re
+import sqlite3
+
+from workspace_index import INDEX_FILENAME
+from workspace_utils import iter_project_entries
+
+TASK_LIST_NAME = 'TASK_LIST.md'
+
+_CHECKBOX = re.compile(rb'\s*[-*+]\s+\[([ xX])\]')
+_SECTION = re.compile(rb'##\s+(.*?)\s*$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sections TEXT NOT NULL
+);
+"""
+
+
+def scan_checkboxes(path: str) -> Dict[str, List[int]]:
+    """Return ``{section: [done, total]}`` for one markdown file.
+
+    Sections are level-2 headings with emphasis markers removed; items
+    before the first one are counted under ``''``.
+    """
+    sections: Dict[str, List[int]] = {}
+    section = ''
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(b'##'):
+                match = _SECTION.match(line)
+                if match and not line.startswith(b'###'):
+                    section = match.group(1).replace(b'*', b'').strip().decode('utf-8', 'replace')
+                continue
+            match = _CHECKBOX.match(line)
+            if match:
+                counts = sections.setdefault(section, [0, 0])
+                counts[0] += match.group(1) != b' '
+                counts[1] += 1
+    return sections
+
+
+def find_task_lists(base_path: Path) -> Iterator[os.DirEntry]:
+    """Yield every TASK_LIST.md under ``base_path``, SKIP_DIRS pruned."""
+    for entry in iter_project_entries(base_path):
+        if entry.name == TASK_LIST_NAME and entry.is_file(follow_symlinks=False):
+            yield entry
+
+
+class ProgressAggregator:
+    """Aggregates task-list progress, caching per-file counts by mtime.
+
+    Pass ``conn`` to share an open index connection; the caller then owns
+    closing it.
+    """
+
+    def __init__(self, base_path: Path = Path('.'), db_path: Optional[Path] = None,
+                 conn: Optional[sqlite3.Connection] = None) -> None:
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.owns_conn = conn is None
+        self.conn = sqlite3.connect(str(self.db_path)) if conn is None else conn
+        self.conn.executescript(_SCHEMA)
+        self.rescanned = 0
+
+    def __enter__(self) -> 'ProgressAggregator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        if self.owns_conn:
+            self.conn.close()
+
+    def aggregate(self) -> Dict:
+        """Return per-file and per-section progress for the whole workspace.
+
+        ``files`` maps each task list's directory (relative, ``/``-separated,
+        ``'.'`` for the root) to ``{'done', 'total', 'sections'}``.
+        """
+        cached = {
+            path: (size, mtime_ns, sections)
+            for path, size, mtime_ns, sections in self.conn.execute(
+                "SELECT path, size, mtime_ns, sections FROM progress_files"
+            )
+        }
+        root = os.fspath(self.base_path)
+        files = {}
+        updates = []
+        self.rescanned = 0
+        for entry in find_task_lists(self.base_path):
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            relpath = os.path.relpath(entry.path, root).replace(os.sep, '/')
+            row = cached.pop(relpath, None)
+            if row and row[:2] == (stat.st_size, stat.st_mtime_ns):
+                sections = json.loads(row[2])
+            else:
+                try:
+                    sections = scan_checkboxes(entry.path)
+                except OSError:
+                    continue
+                self.rescanned += 1
+                updates.append((relpath, stat.st_size, stat.st_mtime_ns, json.dumps(sections)))
+            directory = relpath.rpartition('/')[0] or '.'
+            files[directory] = {
+                'done': sum(done for done, _ in sections.values()),
+                'total': sum(total for _, total in sections.values()),
+                'sections': sections,
+            }
+
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO progress_files (path, size, mtime_ns, sections) VALUES (?, ?, ?, ?)",
+            updates,
+        )
+        self.conn.executemany("DELETE FROM progress_files WHERE path = ?", [(path,) for path in cached])
+        self.conn.commit()
+
+        sections: Dict[str, List[int]] = {}
+        for result in files.values():
+            for section, (done, total) in result['sections'].items():
+                counts = sections.setdefault(section, [0, 0])
+                counts[0] += done
+                counts[1] += total
+        return {
+            'files': dict(sorted(files.items())),
+            'sections': sections,
+            'done': sum(result['done'] for result in files.values()),
+            'total': sum(result['total'] for result in files.values()),
+        }
+
+
+def percent(done: int, total: int) -> str:
+    return f"{100.0 * done / total:.1f}%" if total else "n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report checkbox progress across all TASK_LIST.md files')
+    parser.add_argument('--json', action='store_true', help='Emit JSON instead of a table')
+    args = parser.parse_args()
+
+    with ProgressAggregator(Path('.')) as aggregator:
+        progress = aggregator.aggregate()
+
+    if args.json:
+        print(json.dumps(progress, indent=2))
+        return
+    print(f"{'task list':<48} {'done':>6} {'total':>6} {'progress':>9}")
+    for directory, result in progress['files'].items():
+        print(f"{directory:<48} {result['done']:>6} {result['total']:>6} "
+              f"{percent(result['done'], result['total']):>9}")
+    print(f"{'(all)':<48} {progress['done']:>6} {progress['total']:>6} "
+          f"{percent(progress['done'], progress['total']):>9}")
+    print(f"{len(progress['files'])} task lists, {aggregator.rescanned} re-read")
+
+
+if __name__ == '__main__':
+    main()
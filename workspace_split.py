@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""Split the monorepo history into one history per project in a single pass.
+
+``git subtree split`` walks the whole history once per project. Here
+``rev-list`` is walked once and each commit is fanned out to every
+project: the project's subtree is looked up in the commit's tree (parsed
+trees are kept in an LRU cache keyed by id, so unchanged subtrees are never
+re-read), and when it differs from the trees of the project's mapped
+parents a split commit is written with the original author, committer and
+message. Split commits are therefore deterministic: rerunning, or
+splitting incrementally, yields the same ids. Objects are read through one
+``git cat-file --batch`` process and commits are written as loose objects
+directly, so the walk spawns no process per commit.
+
+Mappings are kept in the workspace index as deltas (a row only where a
+project's split commit differs from the first parent's) plus a snapshot per
+split tip, so the next run walks only commits that are new since each
+project's own last split.
+Each project's history ends up at ``refs/split/<project>``; with ``--push``
+it is pushed to ``main`` of the project's remote.
+
+Usage: python workspace_split.py [--rev REV] [--project NAME ...] [--push] [--remote-url URL]
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import asyncio
+import hashlib
+import os
+import sqlite3
+import subprocess
+import tempfile
+import time
+import zlib
+
+from workspace_gitstate import common_dir, find_git_dir
+from workspace_index import INDEX_FILENAME
+from workspace_orchestrator import DEFAULT_LIMITS, DEFAULT_REMOTE_URL, GitCommandError, backoff_delay, \
+    is_transient, run_git
+from workspace_profile import profiler
+from workspace_watch import load_projects
+
+REF_PREFIX = 'refs/split/'
+TREE_CACHE_SIZE = 8192
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS split_commits (
+    project TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT,
+    tree TEXT,
+    PRIMARY KEY (project, source)
+);
+CREATE TABLE IF NOT EXISTS split_tips (
+    project TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT,
+    tree TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (project, source)
+);
+"""
+
+# Commit headers that do not survive rewriting: signatures cover the old ids
+_DROPPED_HEADERS = (b'gpgsig', b'gpgsig-sha256', b'mergetag')
+
+
+class ObjectReader:
+    """Reads objects through one long-running ``git cat-file --batch``."""
+
+    def __init__(self, repo: Path) -> None:
+        self.process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=repo,
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, sha: str) -> Tuple[str, bytes]:
+        self.process.stdin.write(sha.encode('ascii') + b'\n')
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(sha)
+        data = self.process.stdout.read(int(header[2]) + 1)[:-1]
+        return header[1].decode('ascii'), data
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait()
+
+
+def parse_tree(data: bytes) -> Dict[bytes, Tuple[bytes, str]]:
+    """Map entry names to ``(mode, hex id)``."""
+    entries = {}
+    pos = 0
+    while pos < len(data):
+        space = data.index(b' ', pos)
+        nul = data.index(b'\0', space)
+        entries[data[space + 1:nul]] = (data[pos:space], data[nul + 1:nul + 21].hex())
+        pos = nul + 21
+    return entries
+
+
+def parse_commit(data: bytes) -> Tuple[str, List[bytes], bytes]:
+    """Return ``(tree, kept header lines, message)``; tree and parent lines are left out."""
+    head, _, message = data.partition(b'\n\n')
+    tree = None
+    headers = []
+    skipping = False
+    for line in head.split(b'\n'):
+        if line.startswith(b' '):
+            if not skipping:
+                headers.append(line)
+            continue
+        key = line.partition(b' ')[0]
+        skipping = key in _DROPPED_HEADERS
+        if key == b'tree':
+            tree = line[5:].decode('ascii')
+        elif key != b'parent' and not skipping:
+            headers.append(line)
+    return tree, headers, message
+
+
+class HistorySplitter:
+    """Fans the history of ``repo`` out into per-project histories.
+
+    ``projects`` are directory paths relative to the repository root
+    (``/``-separated); each project's history is written to
+    ``refs/split/<path>``. Pass ``conn`` to share an open index connection.
+    """
+
+    def __init__(self, repo: Path, projects: Sequence[str], db_path: Optional[Path] = None,
+                 conn: Optional[sqlite3.Connection] = None) -> None:
+        self.repo = Path(repo)
+        git_dir = find_git_dir(self.repo)
+        if git_dir is None:
+            raise ValueError(f"{self.repo} is not a git repository")
+        self.objects = common_dir(git_dir) / 'objects'
+        self.projects = list(dict.fromkeys(projects))
+        self.db_path = Path(db_path) if db_path else self.repo / INDEX_FILENAME
+        self.owns_conn = conn is None
+        self.conn = sqlite3.connect(str(self.db_path)) if conn is None else conn
+        self.conn.executescript(_SCHEMA)
+        self._trees: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.tree_hits = 0
+        self.tree_misses = 0
+        self.walked = 0
+        self.created = 0
+
+    def __enter__(self) -> 'HistorySplitter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        if self.owns_conn:
+            self.conn.close()
+
+    def _tree(self, reader: ObjectReader, sha: str) -> Dict:
+        entries = self._trees.get(sha)
+        if entries is not None:
+            self._trees.move_to_end(sha)
+            self.tree_hits += 1
+            return entries
+        self.tree_misses += 1
+        kind, data = reader.read(sha)
+        entries = parse_tree(data) if kind == 'tree' else {}
+        self._trees[sha] = entries
+        if len(self._trees) > TREE_CACHE_SIZE:
+            self._trees.popitem(last=False)
+        return entries
+
+    def _subtree(self, reader: ObjectReader, root: str, parts: Sequence[bytes]) -> Optional[str]:
+        sha = root
+        for part in parts:
+            entry = self._tree(reader, sha).get(part)
+            if entry is None or entry[0] != b'40000':
+                return None
+            sha = entry[1]
+        return sha
+
+    def _write_commit(self, tree: str, parents: Sequence[str], headers: List[bytes], message: bytes) -> str:
+        body = b'tree %s\n' % tree.encode('ascii')
+        body += b''.join(b'parent %s\n' % parent.encode('ascii') for parent in parents)
+        body += b'\n'.join(headers) + b'\n\n' + message
+        data = b'commit %d\0' % len(body) + body
+        sha = hashlib.sha1(data).hexdigest()
+        directory = self.objects / sha[:2]
+        path = directory / sha[2:]
+        if not path.exists():
+            directory.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='tmp_obj_', dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data, 1))
+            os.chmod(tmp_path, 0o444)
+            os.replace(tmp_path, path)
+            self.created += 1
+        return sha
+
+    def _stored(self, project: str, commit: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """``(target, tree)`` for an already split commit, or None if it was never split."""
+        row = self.conn.execute("SELECT target, tree FROM split_tips WHERE project = ? AND source = ?",
+                                (project, commit)).fetchone()
+        if row:
+            return row
+        # Mappings only change where a delta was recorded; follow first parents back to it
+        walk = subprocess.Popen(['git', 'rev-list', '--first-parent', commit], cwd=self.repo,
+                                stdout=subprocess.PIPE, text=True)
+        try:
+            for line in walk.stdout:
+                row = self.conn.execute("SELECT target, tree FROM split_commits WHERE project = ? AND source = ?",
+                                        (project, line.strip())).fetchone()
+                if row:
+                    return row
+        finally:
+            walk.kill()
+            walk.wait()
+        return (None, None)
+
+    def _supersedes(self, candidate: Tuple, candidates: List[Tuple]) -> bool:
+        """True if every other candidate parent is an ancestor of ``candidate``."""
+        return all(
+            subprocess.run(['git', 'merge-base', '--is-ancestor', other[0], candidate[0]],
+                           cwd=self.repo, capture_output=True).returncode == 0
+            for other in candidates if other != candidate
+        )
+
+    def _tips(self) -> Dict[str, frozenset]:
+        """Each project's split tips: the commits its own history was split up to."""
+        tips: Dict[str, set] = {}
+        for project, source in self.conn.execute("SELECT project, source FROM split_tips"):
+            tips.setdefault(project, set()).add(source)
+        return {project: frozenset(sources) for project, sources in tips.items()}
+
+    def _rev_list(self, rev: str, exclude: Sequence[str]) -> List[Tuple[str, List[str]]]:
+        args = ['git', 'rev-list', '--reverse', '--topo-order', '--parents', rev]
+        if exclude:
+            args += ['--not', *exclude]
+        output = subprocess.run(args, cwd=self.repo, capture_output=True, text=True, check=True).stdout
+        return [(line.split()[0], line.split()[1:]) for line in output.splitlines()]
+
+    def _walk(self, rev: str, projects: List[str], exclude: Sequence[str]) -> Dict[str, Tuple]:
+        """Split every commit in ``rev`` not reachable from ``exclude``; returns the tip mappings."""
+        commits = self._rev_list(rev, exclude)
+        tip = subprocess.run(['git', 'rev-parse', '--verify', f'{rev}^{{commit}}'], cwd=self.repo,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        paths = [[part.encode('utf-8') for part in project.split('/')] for project in projects]
+        # A commit's mappings are kept only until its last child in this walk is split
+        children: Dict[str, int] = {}
+        for _, parents in commits:
+            for parent in parents:
+                children[parent] = children.get(parent, 0) + 1
+        mapped: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}
+
+        def mapping(commit: str) -> List[Tuple[Optional[str], Optional[str]]]:
+            if commit not in mapped:
+                mapped[commit] = [self._stored(project, commit) for project in projects]
+            return mapped[commit]
+
+        deltas = []
+        reader = ObjectReader(self.repo)
+        try:
+            for commit, parents in commits:
+                kind, data = reader.read(commit)
+                root, headers, message = parse_commit(data)
+                parent_maps = [mapping(parent) for parent in parents]
+                result = []
+                for index, project in enumerate(projects):
+                    subtree = self._subtree(reader, root, paths[index])
+                    candidates = list(dict.fromkeys(
+                        parent_map[index] for parent_map in parent_maps if parent_map[index][0] is not None))
+                    if subtree is None:
+                        # Not present here: carry the history forward unchanged
+                        target = candidates[0] if candidates else (None, None)
+                    elif candidates and all(tree == subtree for _, tree in candidates):
+                        target = candidates[0]
+                    else:
+                        # A merge that only brought in older history of this project is skipped too
+                        target = next((same for same in candidates
+                                       if same[1] == subtree and self._supersedes(same, candidates)), None)
+                        if target is None:
+                            target = (self._write_commit(subtree, [target for target, _ in candidates],
+                                                         headers, message), subtree)
+                    first = parent_maps[0][index] if parent_maps else (None, None)
+                    if target != first:
+                        deltas.append((project, commit, *target))
+                    result.append(target)
+                mapped[commit] = result
+                self.walked += 1
+                for parent in parents:
+                    children[parent] -= 1
+                    if children[parent] == 0 and parent != tip:
+                        mapped.pop(parent, None)
+                if len(deltas) >= 1000:
+                    self._save_deltas(deltas)
+        finally:
+            reader.close()
+        self._save_deltas(deltas)
+        tips = dict(zip(projects, mapping(tip)))
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO split_tips (project, source, target, tree, created) VALUES (?, ?, ?, ?, ?)",
+            [(project, tip, target, tree, now) for project, (target, tree) in tips.items()],
+        )
+        self.conn.commit()
+        return tips
+
+    def _save_deltas(self, deltas: List[Tuple]) -> None:
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO split_commits (project, source, target, tree) VALUES (?, ?, ?, ?)", deltas)
+        self.conn.commit()
+        deltas.clear()
+
+    def run(self, rev: str = 'HEAD') -> Dict[str, Optional[str]]:
+        """Split new history up to ``rev`` and update ``refs/split/*``; returns each project's tip.
+
+        Each project continues from its own split tips, so commits split
+        only for other projects are still walked for it; projects sharing
+        the same tips (usually all of them) share one walk. A project seen
+        for the first time needs (and gets) a walk of the full history,
+        shared by all new projects.
+        """
+        known = self._tips()
+        groups: Dict[frozenset, List[str]] = {}
+        for project in self.projects:
+            groups.setdefault(known.get(project, frozenset()), []).append(project)
+        tips: Dict[str, Tuple] = {}
+        for exclude, projects in groups.items():
+            with profiler.span('split.walk', 'incremental' if exclude else 'full'):
+                tips.update(self._walk(rev, projects, sorted(exclude)))
+        updates = ''.join(f"update {REF_PREFIX}{project} {target}\n"
+                          for project, (target, _) in tips.items() if target is not None)
+        if updates:
+            subprocess.run(['git', 'update-ref', '--stdin'], cwd=self.repo, input=updates,
+                           text=True, check=True)
+        return {project: tips[project][0] for project in self.projects}
+
+    def summary(self) -> str:
+        lookups = self.tree_hits + self.tree_misses
+        return (f"{self.walked} commits walked, {self.created} split commits written, "
+                f"tree cache {self.tree_hits}/{lookups} hits")
+
+
+async def push_splits(repo: Path, tips: Dict[str, Optional[str]], remote_url: str = DEFAULT_REMOTE_URL,
+                      limit: int = DEFAULT_LIMITS['push'], retries: int = 3, backoff: float = 1.0) -> Dict:
+    """Push each project's split history to ``main`` of its remote; returns errors by project."""
+    semaphore = asyncio.Semaphore(limit)
+    errors = {}
+
+    async def push(project: str) -> None:
+        url = remote_url.format(name=project.rsplit('/', 1)[-1])
+        for attempt in range(1, retries + 2):
+            try:
+                async with semaphore:
+                    await run_git(repo, 'push', url, f'{REF_PREFIX}{project}:refs/heads/main')
+                return
+            except GitCommandError as e:
+                if attempt > retries or not is_transient(e):
+                    errors[project] = str(e)
+                    return
+            await asyncio.sleep(backoff_delay(attempt, backoff, 30.0))
+
+    await asyncio.gather(*(push(project) for project, tip in tips.items() if tip is not None))
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Split the monorepo history into per-project histories')
+    parser.add_argument('--rev', default='HEAD', help='History to split (default: HEAD)')
+    parser.add_argument('--project', action='append', default=[],
+                        help='Project directory to split; repeatable (default: every clone_summary.json project)')
+    parser.add_argument('--push', action='store_true', help="Push each split history to its remote's main")
+    parser.add_argument('--remote-url', default=DEFAULT_REMOTE_URL,
+                        help='Remote URL for each project; {name} is the project name')
+    profiler.add_arguments(parser)
+    args = parser.parse_args()
+    profiler.configure(args)
+
+    base_path = Path('.')
+    projects = args.project or [record['name'] for record in load_projects(base_path)]
+    try:
+        splitter = HistorySplitter(base_path, projects)
+    except ValueError as e:
+        parser.error(str(e))
+    with splitter:
+        tips = splitter.run(args.rev)
+    print(f"✂️  {splitter.summary()}")
+    for project, tip in tips.items():
+        print(f"  {project:<40} {tip or '(not in history)'}")
+
+    if args.push:
+        errors = asyncio.run(push_splits(base_path, tips, args.remote_url))
+        for project, error in errors.items():
+            print(f"❌ Push failed for {project}: {error}")
+        pushed = sum(1 for tip in tips.values() if tip) - len(errors)
+        print(f"🚀 Pushed {pushed} split histories")
+    profiler.report(args)
+
+
+if __name__ == '__main__':
+    main()
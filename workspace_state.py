@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Per-project state kept in the workspace index instead of project_config.json.
+
+Every scanned project is one row of the ``project_state`` table with indexed
+``type``, ``has_git``, ``status`` and ``remote`` columns, so "all Python
+projects without git" is one indexed query and recording one project's
+push result is one single-row UPDATE rather than a rewrite of the whole
+file. The index is switched to WAL mode: readers never block the writer,
+and each push worker can open its own ``ProjectStateStore`` and update its
+row concurrently, waiting out the brief write lock of the others.
+``export_json`` still writes the legacy project_config.json layout.
+
+Usage: python workspace_state.py list [--type T] [--status S] [--git | --no-git] [--remote URL]
+       python workspace_state.py set NAME STATUS
+       python workspace_state.py export [FILE]
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+from workspace_index import INDEX_FILENAME
+from workspace_writer import atomic_write
+
+STATUSES = ('pending', 'committed', 'pushed', 'failed')
+CONFIG_FILENAME = 'project_config.json'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS project_state (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    has_git INTEGER NOT NULL,
+    has_task_list INTEGER NOT NULL,
+    branch TEXT,
+    dirty INTEGER,
+    has_remote INTEGER,
+    remote TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    scanned REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS project_state_type ON project_state (type);
+CREATE INDEX IF NOT EXISTS project_state_has_git ON project_state (has_git);
+CREATE INDEX IF NOT EXISTS project_state_status ON project_state (status);
+CREATE INDEX IF NOT EXISTS project_state_remote ON project_state (remote);
+"""
+
+# Columns a caller may change on one row with update()
+_UPDATABLE = frozenset({'type', 'has_git', 'has_task_list', 'branch', 'dirty', 'has_remote', 'remote',
+                        'status', 'error'})
+_BOOLEANS = ('has_git', 'has_task_list', 'dirty', 'has_remote')
+
+
+def _row(cursor: sqlite3.Cursor, values: tuple) -> Dict:
+    row = {column[0]: value for column, value in zip(cursor.description, values)}
+    for column in _BOOLEANS:
+        if row.get(column) is not None:
+            row[column] = bool(row[column])
+    return row
+
+
+class ProjectStateStore:
+    """Project rows in the workspace index, safe to update from parallel workers.
+
+    Pass ``conn`` to share an open index connection; the caller then owns
+    closing it. Otherwise give each worker thread or process its own store.
+    ``timeout`` is how long a write waits for another writer's lock.
+    """
+
+    def __init__(self, base_path: Path = Path('.'), db_path: Optional[Path] = None,
+                 conn: Optional[sqlite3.Connection] = None, timeout: float = 30.0) -> None:
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.owns_conn = conn is None
+        # Autocommit mode: every write below runs in its own explicit transaction
+        self.conn = sqlite3.connect(str(self.db_path), timeout=timeout, isolation_level=None) \
+            if conn is None else conn
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(project_state)")}
+        if 'has_remote' not in columns:
+            # Indexes created before has_remote had its own column
+            self.conn.execute("ALTER TABLE project_state ADD COLUMN has_remote INTEGER")
+            self.conn.execute("UPDATE project_state SET has_remote = 1 WHERE remote IS NOT NULL")
+
+    def __enter__(self) -> 'ProjectStateStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.owns_conn:
+            self.conn.close()
+
+    def _read(self, sql: str, params=()) -> sqlite3.Cursor:
+        # Per-cursor row factory, so a shared connection keeps returning tuples to its owner
+        cursor = self.conn.cursor()
+        cursor.row_factory = _row
+        return cursor.execute(sql, params)
+
+    def _write(self, statements: Iterable) -> int:
+        """Run ``(sql, params)`` pairs in one transaction holding the write lock from the start.
+
+        Returns the number of rows changed by the last statement.
+        """
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                changed = self.conn.execute(sql, params).rowcount
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return changed
+
+    def sync(self, projects: List[Dict]) -> None:
+        """Upsert scanned projects and drop rows for projects that disappeared.
+
+        Scan results (path, type, git state) are replaced; ``status`` and
+        ``error`` recorded by earlier runs are kept. ``has_remote`` is None
+        when the scan could not decide; only then are the previous
+        ``has_remote`` and ``remote`` kept, so a removed remote is forgotten.
+        """
+        now = time.time()
+        statements = [(
+            "INSERT INTO project_state (name, path, type, has_git, has_task_list, branch, dirty, has_remote, "
+            "remote, scanned, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET path = excluded.path, type = excluded.type, "
+            "has_git = excluded.has_git, has_task_list = excluded.has_task_list, "
+            "branch = excluded.branch, dirty = excluded.dirty, "
+            "has_remote = COALESCE(excluded.has_remote, project_state.has_remote), "
+            "remote = CASE WHEN excluded.has_remote IS NULL THEN COALESCE(excluded.remote, project_state.remote) "
+            "ELSE excluded.remote END, scanned = excluded.scanned",
+            (project['name'], str(project['path']), project['type'], bool(project['has_git']),
+             bool(project.get('has_task_list')), project.get('branch'), project.get('dirty'),
+             project.get('has_remote'), project.get('remote'), now, now),
+        ) for project in projects]
+        names = [project['name'] for project in projects]
+        keep = ', '.join('?' * len(names))
+        statements.append((f"DELETE FROM project_state WHERE name NOT IN ({keep})", names))
+        self._write(statements)
+
+    def update(self, name: str, **fields) -> bool:
+        """Change columns of one project in a single-row transaction; False if it is unknown."""
+        unknown = set(fields) - _UPDATABLE
+        if unknown:
+            raise ValueError(f"cannot update {', '.join(sorted(unknown))}")
+        if 'status' in fields and fields['status'] not in STATUSES:
+            raise ValueError(f"status must be one of {', '.join(STATUSES)}, not {fields['status']!r}")
+        if not fields:
+            return self.get(name) is not None
+        assignments = ', '.join(f"{column} = ?" for column in fields)
+        return self._write([(f"UPDATE project_state SET {assignments}, updated = ? WHERE name = ?",
+                             (*fields.values(), time.time(), name))]) == 1
+
+    def set_status(self, name: str, status: str, error: Optional[str] = None, **fields) -> bool:
+        return self.update(name, status=status, error=error, **fields)
+
+    def get(self, name: str) -> Optional[Dict]:
+        return self._read("SELECT * FROM project_state WHERE name = ?", (name,)).fetchone()
+
+    def query(self, type: Optional[str] = None, has_git: Optional[bool] = None,
+              status: Optional[str] = None, remote: Optional[str] = None) -> List[Dict]:
+        """Projects matching every given column, by name."""
+        conditions = {'type': type, 'has_git': has_git, 'status': status, 'remote': remote}
+        where = [(f"{column} = ?", value) for column, value in conditions.items() if value is not None]
+        sql = "SELECT * FROM project_state"
+        if where:
+            sql += " WHERE " + " AND ".join(clause for clause, _ in where)
+        return self._read(sql + " ORDER BY name", [value for _, value in where]).fetchall()
+
+    def counts(self, column: str) -> Dict:
+        """Number of projects per value of an indexed column."""
+        if column not in ('type', 'has_git', 'status', 'remote'):
+            raise ValueError(f"cannot group by {column!r}")
+        return {row[column]: row['count'] for row in self._read(
+            f"SELECT {column}, COUNT(*) AS count FROM project_state GROUP BY {column} ORDER BY {column}"
+        )}
+
+    def to_config(self) -> Dict:
+        """The project_config.json document for the current rows."""
+        rows = self.query()
+        return {
+            'last_updated': datetime.now().isoformat(),
+            'total_projects': len(rows),
+            'projects': {
+                row['name']: {
+                    'type': row['type'],
+                    'has_git': row['has_git'],
+                    'branch': row['branch'],
+                    'has_remote': row['has_remote'],
+                    'dirty': row['dirty'],
+                    'has_task_list': row['has_task_list'],
+                    'remote_url': row['remote'],
+                    'status': row['status'],
+                }
+                for row in rows
+            },
+        }
+
+    def export_json(self, path: Path) -> Dict:
+        """Write the legacy project_config.json layout to ``path``."""
+        config = self.to_config()
+        atomic_write(Path(path), json.dumps(config, indent=2).encode('utf-8'))
+        return config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Query and update per-project state')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    list_parser = subparsers.add_parser('list', help='List projects matching all given filters')
+    list_parser.add_argument('--type')
+    list_parser.add_argument('--status', choices=STATUSES)
+    list_parser.add_argument('--remote')
+    git_group = list_parser.add_mutually_exclusive_group()
+    git_group.add_argument('--git', dest='has_git', action='store_true', default=None)
+    git_group.add_argument('--no-git', dest='has_git', action='store_false')
+    set_parser = subparsers.add_parser('set', help="Set one project's status")
+    set_parser.add_argument('name')
+    set_parser.add_argument('status', choices=STATUSES)
+    export_parser = subparsers.add_parser('export', help='Write project_config.json')
+    export_parser.add_argument('file', nargs='?', default=CONFIG_FILENAME)
+    args = parser.parse_args()
+
+    with ProjectStateStore(Path('.')) as store:
+        if args.command == 'list':
+            rows = store.query(type=args.type, has_git=args.has_git, status=args.status, remote=args.remote)
+            for row in rows:
+                print(f"{row['name']:<40} {row['type']:<14} {'git' if row['has_git'] else '-':<4} "
+                      f"{row['status']:<10} {row['remote'] or ''}")
+            print(f"{len(rows)} projects")
+        elif args.command == 'set':
+            if not store.set_status(args.name, args.status):
+                parser.error(f"unknown project {args.name!r}")
+            print(f"✅ {args.name}: {args.status}")
+        else:
+            config = store.export_json(Path(args.file))
+            print(f"✅ Exported {config['total_projects']} projects to {args.file}")
+
+
+if __name__ == '__main__':
+    main()
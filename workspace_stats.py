@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Per-project code statistics: files, bytes and lines per language.
+
+Statistics are derived from each project's content manifest (see
+``workspace_manifest``). Line counts are cached per file digest, so only
+files with new content are read, and a project whose manifest is unchanged
+since the last run is answered entirely from the cache. Newlines are counted
+in bulk on raw bytes (memory-mapped for large files) without decoding text.
+
+Usage: python workspace_stats.py [--json] [PROJECT ...]
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import argparse
+import json
+import mmap
+import os
+
+from workspace_manifest import CURRENT, ManifestStore
+from workspace_watch import load_projects
+
+# Manifest label recording each project's state when its stats were cached
+MANIFEST_LABEL = 'stats'
+MMAP_THRESHOLD = 1 << 20
+COUNT_CHUNK = 8 << 20
+
+LANGUAGES = {
+    '.py': 'Python',
+    '.pyi': 'Python',
+    '.js': 'JavaScript',
+    '.jsx': 'JavaScript',
+    '.mjs': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.tsx': 'TypeScript',
+    '.php': 'PHP',
+    '.java': 'Java',
+    '.html': 'HTML',
+    '.htm': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'CSS',
+    '.md': 'Markdown',
+    '.rst': 'reStructuredText',
+    '.json': 'JSON',
+    '.yaml': 'YAML',
+    '.yml': 'YAML',
+    '.xml': 'XML',
+    '.toml': 'TOML',
+    '.ini': 'INI',
+    '.cfg': 'INI',
+    '.sh': 'Shell',
+    '.bat': 'Batch',
+    '.ps1': 'PowerShell',
+    '.sql': 'SQL',
+    '.txt': 'Text',
+    '.env': 'Text',
+}
+OTHER = 'Other'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_lines (
+    digest TEXT PRIMARY KEY,
+    lines INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats_projects (
+    project TEXT PRIMARY KEY,
+    result TEXT NOT NULL
+);
+"""
+
+
+def language_for(relpath: str) -> str:
+    """Return the language of a file from its extension."""
+    return LANGUAGES.get(os.path.splitext(relpath)[1].lower(), OTHER)
+
+
+def count_lines(path: str) -> int:
+    """Count lines in a file by counting newline bytes in bulk.
+
+    A final line without a trailing newline still counts as a line.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        if size < MMAP_THRESHOLD:
+            data = f.read()
+            return data.count(b'\n') + (not data.endswith(b'\n'))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            lines = sum(
+                mapped[offset:offset + COUNT_CHUNK].count(b'\n')
+                for offset in range(0, size, COUNT_CHUNK)
+            )
+            return lines + (mapped[size - 1:size] != b'\n')
+
+
+class WorkspaceStats:
+    """Compute and cache per-language statistics for workspace projects."""
+
+    def __init__(self, base_path: Path = Path('.')) -> None:
+        self.base_path = Path(base_path)
+        self.manifests = ManifestStore(self.base_path)
+        self.conn = self.manifests.conn
+        self.conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'WorkspaceStats':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.manifests.close()
+
+    def project_stats(self, name: str, path: Optional[Path] = None) -> Dict:
+        """Return statistics for one project, recomputing only what changed."""
+        path = Path(path) if path is not None else self.base_path / name
+        self.manifests.update(name, path)
+        if not self.manifests.changed_since(name, MANIFEST_LABEL):
+            row = self.conn.execute(
+                "SELECT result FROM stats_projects WHERE project = ?", (name,)
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+
+        result = self._compute(name, path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO stats_projects (project, result) VALUES (?, ?)",
+            (name, json.dumps(result)),
+        )
+        self.manifests.mark(name, MANIFEST_LABEL)
+        return result
+
+    def workspace_stats(self, projects: Iterable[Dict]) -> List[Dict]:
+        """Return statistics for each project record from ``load_projects``."""
+        return [self.project_stats(project['name'], project['path']) for project in projects]
+
+    def _compute(self, name: str, path: Path) -> Dict:
+        entries = self.manifests.entries(name)
+        cached = dict(self.conn.execute(
+            "SELECT l.digest, l.lines FROM stats_lines l JOIN manifest_entries m "
+            "ON m.digest = l.digest WHERE m.project = ? AND m.label = ?", (name, CURRENT)
+        ))
+        new_counts = {}
+        languages: Dict[str, Dict[str, int]] = {}
+        for relpath, size, digest in entries:
+            language = language_for(relpath)
+            totals = languages.setdefault(language, {'files': 0, 'bytes': 0, 'lines': 0})
+            totals['files'] += 1
+            totals['bytes'] += size
+            if language == OTHER:
+                continue
+            lines = cached.get(digest)
+            if lines is None:
+                try:
+                    lines = count_lines(os.path.join(path, relpath))
+                except OSError:
+                    continue
+                cached[digest] = new_counts[digest] = lines
+            totals['lines'] += lines
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO stats_lines (digest, lines) VALUES (?, ?)",
+            new_counts.items(),
+        )
+        self.conn.commit()
+        return {
+            'project': name,
+            'files': sum(totals['files'] for totals in languages.values()),
+            'bytes': sum(totals['bytes'] for totals in languages.values()),
+            'lines': sum(totals['lines'] for totals in languages.values()),
+            'languages': dict(sorted(languages.items(), key=lambda item: -item[1]['lines'])),
+        }
+
+
+def print_table(results: List[Dict]) -> None:
+    """Print a per-project, per-language summary table."""
+    print(f"{'project':<32} {'language':<18} {'files':>8} {'bytes':>12} {'lines':>10}")
+    for result in results:
+        print(f"{result['project']:<32} {'(total)':<18} {result['files']:>8} "
+              f"{result['bytes']:>12} {result['lines']:>10}")
+        for language, totals in result['languages'].items():
+            print(f"{'':<32} {language:<18} {totals['files']:>8} "
+                  f"{totals['bytes']:>12} {totals['lines']:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report files, bytes and lines per language per project')
+    parser.add_argument('projects', nargs='*', help='Limit the report to these projects')
+    parser.add_argument('--json', action='store_true', help='Emit JSON instead of a table')
+    args = parser.parse_args()
+
+    base_path = Path('.')
+    projects = load_projects(base_path)
+    if args.projects:
+        projects = [project for project in projects if project['name'] in args.projects]
+
+    with WorkspaceStats(base_path) as stats:
+        results = stats.workspace_stats(projects)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""Content-addressed storage for generated documents.
+
+Every distinct document is stored once as a blob named by its BLAKE2b
+digest under ``.workspace_store/blobs`` and linked into each repository,
+so disk usage and write volume scale with the number of distinct
+documents rather than the number of repositories. Links are either
+reflinks (copy-on-write clones; editing one repository's copy leaves the
+others alone) or hardlinks (one shared inode: an in-place edit in one
+repository shows up in all of them, so blobs are re-verified before they
+are reused). Where the requested link type is not supported, e.g. across
+filesystems, the blob is copied instead.
+
+Each run writes a manifest to ``.workspace_store/runs`` recording which
+document points at which blob.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import errno
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from workspace_manifest import hash_file
+from workspace_writer import atomic_write, content_digest
+
+STORE_DIRNAME = '.workspace_store'
+LINK_MODES = ('reflink', 'hardlink')
+
+# ioctl(dest_fd, FICLONE, src_fd) clones a whole file on btrfs, XFS and friends
+FICLONE = 0x40049409
+
+
+def _reflink(source: str, target: str) -> None:
+    try:
+        import fcntl
+    except ImportError:
+        # No ioctl() off POSIX (Windows): report reflinks as unsupported and copy
+        raise OSError(errno.EOPNOTSUPP, 'reflink needs fcntl') from None
+    with open(source, 'rb') as src, open(target, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+class ContentStore:
+    """Stores generated documents once and links them into repositories."""
+
+    def __init__(self, base_path: Path = Path('.'), link: str = 'reflink') -> None:
+        if link not in LINK_MODES:
+            raise ValueError(f"link must be one of {', '.join(LINK_MODES)}, not {link!r}")
+        self.base_path = Path(base_path)
+        self.root = self.base_path / STORE_DIRNAME
+        self.link_mode = link
+        self.documents: Dict[str, str] = {}
+        self.blobs_written = 0
+        self.bytes_written = 0
+        self.linked = 0
+        self.copied = 0
+        self._link_supported = True
+        self._verified = set()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / 'blobs' / digest[:2] / digest
+
+    def put(self, data: bytes, digest: Optional[str] = None) -> Path:
+        """Store ``data`` unless an intact blob with its digest exists; return the blob path."""
+        digest = digest or content_digest(data)
+        blob = self.blob_path(digest)
+        if digest in self._verified:
+            return blob
+        try:
+            intact = hash_file(os.fspath(blob)) == digest
+        except FileNotFoundError:
+            intact = False
+        if not intact:
+            # Missing, or edited in place through a hardlink: store a fresh copy
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(blob, data, mode=0o644)
+            self.blobs_written += 1
+            self.bytes_written += len(data)
+        self._verified.add(digest)
+        return blob
+
+    def _place(self, blob: Path, target: Path) -> None:
+        fd, tmp_path = tempfile.mkstemp(prefix=f'.{target.name}.', suffix='.tmp', dir=target.parent)
+        os.close(fd)
+        try:
+            placed = False
+            if self._link_supported:
+                try:
+                    if self.link_mode == 'hardlink':
+                        os.unlink(tmp_path)
+                        os.link(blob, tmp_path)
+                    else:
+                        _reflink(os.fspath(blob), tmp_path)
+                    placed = True
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+                                       errno.EPERM, errno.EMLINK):
+                        raise
+                    # Unsupported here; stop trying for the rest of the run
+                    self._link_supported = False
+            if placed:
+                self.linked += 1
+            else:
+                shutil.copyfile(blob, tmp_path)
+                os.chmod(tmp_path, 0o644)
+                self.copied += 1
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def write(self, target: Path, data: bytes, digest: Optional[str] = None) -> None:
+        """Point ``target`` at the blob holding ``data``."""
+        digest = digest or content_digest(data)
+        self._place(self.put(data, digest), Path(target))
+        self.record(target, digest)
+
+    def is_linked(self, target: Path, digest: str) -> bool:
+        """True if ``target`` already shares its inode with the blob (hardlink mode)."""
+        try:
+            return os.path.samefile(target, self.blob_path(digest))
+        except OSError:
+            return False
+
+    def record(self, target: Path, digest: str) -> None:
+        """Note in this run's manifest that ``target`` holds blob ``digest``."""
+        relpath = os.path.relpath(os.path.abspath(target), os.path.abspath(self.base_path))
+        self.documents[relpath.replace(os.sep, '/')] = digest
+
+    def save_run(self) -> Optional[Path]:
+        """Write this run's manifest; returns its path, or None if nothing was recorded."""
+        if not self.documents:
+            return None
+        runs = self.root / 'runs'
+        runs.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = runs / f'{stamp}-{os.getpid()}.json'
+        manifest = {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'link': self.link_mode,
+            'documents': dict(sorted(self.documents.items())),
+            'blobs': len(set(self.documents.values())),
+        }
+        atomic_write(path, json.dumps(manifest, indent=2).encode('utf-8'))
+        return path
+
+    def summary(self) -> str:
+        return (f"{len(self.documents)} documents -> {len(set(self.documents.values()))} blobs, "
+                f"{self.blobs_written} new ({self.bytes_written / 1024:.1f} KiB), "
+                f"{self.linked} {self.link_mode}ed, {self.copied} copied")
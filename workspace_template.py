@@ -0,0 +1,90 @@
+"""Precompiled text templates for the document generators.
+
+A ``Template`` is parsed once, when it is defined, into the static text
+between ``{slot}`` placeholders (``str.format`` syntax, ``{{``/``}}`` for
+literal braces). Rendering copies the precompiled part list and fills in
+only the slots before a single join, so large documents are not re-parsed
+or rebuilt from f-strings for every project.
+
+Slots that change on every run (dates) would otherwise make every
+regenerated document differ from the one on disk; ``keep_existing``
+compares documents with the lines of such slots masked out, so an
+otherwise identical file is left untouched.
+"""
+
+from string import Formatter
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+class Template:
+    """A document with named slots, split into static parts at construction."""
+
+    def __init__(self, source: str) -> None:
+        parts: List[str] = []
+        slots: List[Tuple[int, str]] = []
+        for literal, field, format_spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Unsupported template slot {{{field}}}: use plain {{name}} slots")
+            slots.append((len(parts), field))
+            parts.append('')
+        self.source = source
+        self._parts = parts
+        self._slots = slots
+        self.fields = frozenset(field for _, field in slots)
+
+    def render(self, values: Mapping[str, object]) -> str:
+        """Fill every slot from ``values`` and return the document."""
+        parts = self._parts.copy()
+        for index, field in self._slots:
+            parts[index] = str(values[field])
+        return ''.join(parts)
+
+    def line_prefixes(self, fields: Iterable[str]) -> Tuple[str, ...]:
+        """The literal text preceding each slot of ``fields`` on its line.
+
+        Slots not preceded by literal text from the start of their line get
+        an empty prefix, which ``keep_existing`` ignores.
+        """
+        fields = set(fields)
+        prefixes = []
+        for index, field in self._slots:
+            if field not in fields:
+                continue
+            before = self._parts[index - 1] if index else ''
+            starts_line = index == 1 or '\n' in before
+            prefixes.append(before.rpartition('\n')[2] if starts_line else '')
+        return tuple(prefixes)
+
+    def render_many(self, rows: Iterable[Mapping[str, object]]) -> Iterator[str]:
+        """Lazily render one document per row, for streaming to a writer."""
+        render = self.render
+        for values in rows:
+            yield render(values)
+
+
+def keep_existing(content: str, existing: Optional[str], prefixes: Iterable[str]) -> str:
+    """Return ``existing`` if it differs from ``content`` only on lines starting with ``prefixes``.
+
+    Masked lines compare by their prefix alone, so a document that only
+    changed its dates keeps the ones already on disk.
+    """
+    if existing is None:
+        return content
+    prefixes = tuple(prefix for prefix in prefixes if prefix)
+    if not prefixes:
+        return content
+
+    def masked(text: str) -> List[str]:
+        lines = text.splitlines(keepends=True)
+        for number, line in enumerate(lines):
+            for prefix in prefixes:
+                if line.startswith(prefix):
+                    lines[number] = prefix
+                    break
+        return lines
+
+    return existing if masked(content) == masked(existing) else content
@@ -1,46 +1,290 @@
 """Shared workspace utilities for project management."""
 
+from collections import deque
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 import json
+import os
+
+# Directory names that never contribute to project classification.
+SKIP_DIRS = frozenset({'venv', '.venv', 'node_modules', '.git', '__pycache__'})
+
+# Project types in priority order. Manifests decide the type outright; names
+# and suffixes are weak signals used only when no manifest is found.
+PROJECT_TYPES = (
+    ("Python", {
+        'manifests': {'requirements.txt', 'setup.py', 'pyproject.toml'},
+        'names': {'__init__.py'},
+        'suffixes': {'.py'},
+    }),
+    ("Node.js", {
+        'manifests': {'package.json', 'package-lock.json', 'yarn.lock'},
+        'names': set(),
+        'suffixes': set(),
+    }),
+    ("PHP", {
+        'manifests': {'composer.json'},
+        'names': {'index.php'},
+        'suffixes': {'.php'},
+    }),
+    ("Java", {
+        'manifests': {'pom.xml', 'build.gradle'},
+        'names': set(),
+        'suffixes': {'.java'},
+    }),
+    ("Web", {
+        'manifests': set(),
+        'names': {'index.html', 'index.htm'},
+        'suffixes': {'.html', '.htm', '.css', '.js'},
+    }),
+    ("Documentation", {
+        'manifests': set(),
+        'names': {'readme', 'docs'},
+        'suffixes': {'.md', '.rst'},
+    }),
+)
+
+_MANIFESTS = {
+    name: project_type
+    for project_type, rules in PROJECT_TYPES
+    for name in rules['manifests']
+}
+_WEAK_NAMES = {
+    name: project_type
+    for project_type, rules in PROJECT_TYPES
+    for name in rules['names']
+}
+_WEAK_SUFFIXES = {
+    suffix: project_type
+    for project_type, rules in PROJECT_TYPES
+    for suffix in rules['suffixes']
+}
+_PRIORITY = {project_type: rank for rank, (project_type, _) in enumerate(PROJECT_TYPES)}
+
+
+class _JSONStream:
+    """Incremental reader over a JSON text file, decoding one value at a time."""
+
+    def __init__(self, f, chunk_size: int) -> None:
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in inventory at offset {self.pos}")
+        self.pos += 1
+
+    def decode(self):
+        """Decode one complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A value ending exactly at the buffer edge may be truncated (e.g. a number).
+            if end < len(self.buffer) or not self._fill():
+                self.pos = end
+                return value
+
+
+def iter_inventory(config_path: Path, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the ``repositories`` entries of clone_summary.json one at a time.
+
+    The file is read in chunks and only one repository entry is decoded at
+    a time, so the whole document is never held in memory.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        stream.expect('{')
+        while stream.peek() not in ('}', ''):
+            key = stream.decode()
+            stream.expect(':')
+            if key == 'repositories' and stream.peek() == '[':
+                stream.expect('[')
+                while stream.peek() not in (']', ''):
+                    repo = stream.decode()
+                    if isinstance(repo, dict):
+                        yield repo
+                    if stream.peek() == ',':
+                        stream.expect(',')
+                stream.expect(']')
+            else:
+                stream.decode()
+            if stream.peek() == ',':
+                stream.expect(',')
+
+
+_INVENTORY_CACHE: dict = {}
+
+
+def load_inventory(config_path: Path) -> Tuple[dict, ...]:
+    """Return the repository entries of an inventory file, parsed once per process.
+
+    The result is cached keyed on the file's path, mtime and size, and is
+    shared between callers, so it must not be mutated.
+    """
+    stat = config_path.stat()
+    key = os.path.abspath(config_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _INVENTORY_CACHE.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, tuple(iter_inventory(config_path)))
+        _INVENTORY_CACHE[key] = cached
+    return cached[1]
 
 
 def get_project_directories(base_path: Path = Path('.')) -> List[Path]:
     """Return list of project directories using clone_summary.json."""
     config_path = base_path / 'clone_summary.json'
-    if not config_path.exists():
+    try:
+        repositories = load_inventory(config_path)
+    except FileNotFoundError:
+        return []
+    # One scandir of the workspace root replaces an exists()/is_dir() per repo.
+    try:
+        with os.scandir(base_path) as entries:
+            present = {entry.name for entry in entries if entry.is_dir()}
+    except OSError:
         return []
-    with config_path.open('r', encoding='utf-8') as f:
-        data = json.load(f)
     dirs: List[Path] = []
-    for repo in data.get('repositories', []):
+    for repo in repositories:
         name = repo.get('name')
-        if not name:
-            continue
-        path = base_path / name
-        if path.exists() and path.is_dir():
-            dirs.append(path)
+        if name and name in present:
+            dirs.append(base_path / name)
     return dirs
 
 
+def iter_project_entries(repo_path: Path) -> Iterator[os.DirEntry]:
+    """Yield entries under ``repo_path`` breadth-first, pruning SKIP_DIRS.
+
+    Directories are yielded as well so callers can react to names like
+    ``docs``; symlinked directories are not followed.
+    """
+    pending = deque([os.fspath(repo_path)])
+    while pending:
+        current = pending.popleft()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if entry.name in SKIP_DIRS:
+                            continue
+                        pending.append(entry.path)
+                    yield entry
+        except OSError:
+            continue
+
+
+def _classify_level(entries: List[os.DirEntry], weak: dict) -> str:
+    """Return the decisive type for one directory level, or '' if none.
+
+    Weak signals seen along the way are recorded in ``weak``.
+    """
+    decisive = ''
+    for entry in entries:
+        name = entry.name.lower()
+        project_type = _MANIFESTS.get(name)
+        if project_type and (not decisive or _PRIORITY[project_type] < _PRIORITY[decisive]):
+            decisive = project_type
+            continue
+        stem, suffix = os.path.splitext(name)
+        project_type = _WEAK_NAMES.get(name) or _WEAK_SUFFIXES.get(suffix) or _WEAK_NAMES.get(stem)
+        if project_type:
+            weak[project_type] = True
+    return decisive
+
+
 def detect_project_type(repo_path: Path) -> str:
-    """Detect the type of project based on files present."""
+    """Detect the type of project based on files present.
+
+    The tree is walked breadth-first without descending into SKIP_DIRS. The
+    first directory reached that contains a manifest (``pyproject.toml``,
+    ``package.json``, ...) decides the type and ends the walk; otherwise the
+    highest-priority weak signal (file suffixes, ``index.html``, ...) wins.
+    """
     if not repo_path.exists():
         return "Unknown"
 
-    files = list(repo_path.rglob("*"))
-    file_names = [f.name.lower() for f in files if f.is_file()]
-
-    if any(name in file_names for name in ['requirements.txt', 'setup.py', 'pyproject.toml', '__init__.py']):
-        return "Python"
-    if any(name in file_names for name in ['package.json', 'package-lock.json', 'yarn.lock']):
-        return "Node.js"
-    if any(name in file_names for name in ['composer.json', 'index.php', '.php']):
-        return "PHP"
-    if any(name in file_names for name in ['pom.xml', 'build.gradle', '.java']):
-        return "Java"
-    if any(name in file_names for name in ['index.html', 'index.htm', '.html', '.css', '.js']):
-        return "Web"
-    if any(name in file_names for name in ['.md', 'readme', 'docs']):
-        return "Documentation"
+    weak: dict = {}
+    level: List[os.DirEntry] = []
+    level_dir = os.fspath(repo_path)
+    for entry in iter_project_entries(repo_path):
+        parent = os.path.dirname(entry.path)
+        if parent != level_dir:
+            decisive = _classify_level(level, weak)
+            if decisive:
+                return decisive
+            level, level_dir = [], parent
+        level.append(entry)
+    decisive = _classify_level(level, weak)
+    if decisive:
+        return decisive
+
+    for project_type, _ in PROJECT_TYPES:
+        if project_type in weak:
+            return project_type
     return "Unknown"
+
+
+def classify_projects(
+    repo_paths: Iterable[Path], jobs: Optional[int] = None, ordered: bool = True
+) -> Iterator[Tuple[Path, str]]:
+    """Yield ``(path, project_type)`` for each path using a process pool.
+
+    Each ``detect_project_type`` call is an independent tree walk, so the
+    paths are fanned out across ``jobs`` worker processes (default: CPU
+    count). With ``ordered`` results follow the input order; otherwise they
+    are yielded as soon as each worker finishes. ``jobs=1`` classifies
+    in-process without starting a pool.
+    """
+    repo_paths = list(repo_paths)
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(repo_paths))
+    if jobs <= 1:
+        for path in repo_paths:
+            yield path, detect_project_type(path)
+        return
+
+    # Imported here so cheap commands don't pay for multiprocessing at startup.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if ordered:
+            yield from zip(repo_paths, executor.map(detect_project_type, repo_paths))
+            return
+        futures = {executor.submit(detect_project_type, path): path for path in repo_paths}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
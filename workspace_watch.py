@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Long-running watcher that keeps workspace project metadata hot.
+
+The daemon owns a WorkspaceIndex and keeps it current from filesystem
+events: inotify on Linux, periodic mtime polling everywhere else. Events are
+coalesced into bursts and only the directories they touched are rescanned.
+Scripts query the daemon over a Unix socket under the workspace root, so
+scanning projects becomes a lookup; when no daemon is running they fall back
+to refreshing the index themselves (see ``load_projects``).
+
+Usage: python workspace_watch.py [--poll] [--interval SECONDS] [--debounce SECONDS]
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+from workspace_index import WorkspaceIndex
+from workspace_utils import SKIP_DIRS
+
+SOCKET_FILENAME = '.workspace_watch.sock'
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyBackend:
+    """Recursive directory watches on top of the Linux inotify API."""
+
+    name = 'inotify'
+
+    def __init__(self, base_path: Path) -> None:
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.base_path = base_path
+        self.watches: Dict[int, tuple] = {}
+        self._add_watch(os.fspath(base_path), None, '')
+
+    @classmethod
+    def available(cls) -> bool:
+        return sys.platform.startswith('linux')
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def watch_project(self, name: str) -> None:
+        """Watch every directory of a project, pruning SKIP_DIRS."""
+        self._watch_subtree(name, '')
+
+    def _add_watch(self, directory: str, project: Optional[str], relpath: str) -> bool:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return False
+        self.watches[wd] = (project, relpath)
+        return True
+
+    def wait(self, timeout: Optional[float]) -> Optional[Dict[str, Set[str]]]:
+        """Block up to ``timeout`` and return touched directories per project.
+
+        ``None`` means the kernel queue overflowed and everything is suspect.
+        The workspace root itself is reported under the ``''`` project.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        dirty: Dict[str, Set[str]] = {}
+        if not readable:
+            return dirty
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return dirty
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if wd not in self.watches:
+                continue
+            project, relpath = self.watches[wd]
+            if mask & IN_IGNORED:
+                del self.watches[wd]
+                continue
+            if project is None:
+                dirty.setdefault('', set()).add(name)
+                continue
+            dirty.setdefault(project, set()).add(relpath)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and name not in SKIP_DIRS:
+                child = os.path.join(relpath, name) if relpath else name
+                self._watch_subtree(project, child)
+        return dirty
+
+    def _watch_subtree(self, project: str, relpath: str) -> None:
+        root = self.base_path / project
+        pending = [relpath]
+        while pending:
+            current = pending.pop()
+            directory = os.path.join(root, current)
+            if not self._add_watch(directory, project, current):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name not in SKIP_DIRS and entry.is_dir(follow_symlinks=False):
+                            pending.append(os.path.join(current, entry.name))
+            except OSError:
+                continue
+
+
+class PollingBackend:
+    """Fallback backend: report everything dirty once per interval.
+
+    The index refresh itself is mtime-based, so "everything" only costs a
+    ``stat`` per directory.
+    """
+
+    name = 'poll'
+
+    def __init__(self, base_path: Path, interval: float = 2.0) -> None:
+        self.base_path = base_path
+        self.interval = interval
+
+    def close(self) -> None:
+        pass
+
+    def watch_project(self, name: str) -> None:
+        pass
+
+    def wait(self, timeout: Optional[float]) -> Optional[Dict[str, Set[str]]]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline() or b'{}')
+        except ValueError:
+            request = {}
+        reply = self.server.watcher.handle_request(request)
+        self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+
+class WorkspaceWatcher:
+    """Keep a WorkspaceIndex current and serve its records over a socket."""
+
+    def __init__(
+        self,
+        base_path: Path = Path('.'),
+        poll: bool = False,
+        interval: float = 2.0,
+        debounce: float = 0.2,
+        max_delay: float = 2.0,
+        jobs: Optional[int] = None,
+    ) -> None:
+        self.base_path = Path(base_path).resolve()
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.jobs = jobs
+        self.index = None
+        if poll or not InotifyBackend.available():
+            self.backend = PollingBackend(self.base_path, interval)
+        else:
+            self.backend = InotifyBackend(self.base_path)
+        self.records: List[Dict] = []
+        self.refreshed_at = 0.0
+        self.server = None
+        self._stop = threading.Event()
+
+    def handle_request(self, request: Dict) -> Dict:
+        """Answer one client request from the in-memory snapshot."""
+        command = request.get('command', 'projects')
+        if command == 'ping':
+            return {'ok': True, 'backend': self.backend.name, 'refreshed_at': self.refreshed_at}
+        if command == 'projects':
+            records = self.records
+            return {
+                'ok': True,
+                'projects': [dict(record, path=os.fspath(record['path'])) for record in records],
+            }
+        return {'ok': False, 'error': f'unknown command: {command}'}
+
+    def serve(self) -> None:
+        """Start the socket server in a background thread."""
+        address = os.fspath(self.base_path / SOCKET_FILENAME)
+        if not hasattr(socket, 'AF_UNIX'):
+            logger.warning("Unix sockets are unavailable; metadata will not be served")
+            return
+        if os.path.exists(address):
+            if query_daemon(self.base_path, 'ping') is not None:
+                raise RuntimeError(f'a watcher is already serving {address}')
+            os.unlink(address)
+        self.server = socketserver.ThreadingUnixStreamServer(address, _RequestHandler)
+        self.server.daemon_threads = True
+        self.server.watcher = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"Serving workspace metadata on {address}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Watch until stopped, refreshing the index after each burst."""
+        # SQLite connections are tied to their thread, so open it here.
+        self.index = WorkspaceIndex(self.base_path, jobs=self.jobs)
+        self._full_refresh()
+        self.serve()
+        logger.info(f"Watching {len(self.records)} projects with {self.backend.name} backend")
+        try:
+            while not self._stop.is_set():
+                dirty = self.backend.wait(1.0)
+                if dirty == {}:
+                    continue
+                dirty = self._coalesce(dirty)
+                if dirty is None or self._root_changed(dirty.pop('', set())):
+                    self._full_refresh()
+                elif dirty:
+                    self._apply(dirty)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            try:
+                os.unlink(self.base_path / SOCKET_FILENAME)
+            except OSError:
+                pass
+            self.server = None
+        self.backend.close()
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def _coalesce(self, dirty: Optional[Dict[str, Set[str]]]) -> Optional[Dict[str, Set[str]]]:
+        """Keep collecting events until the burst has been quiet for ``debounce``."""
+        deadline = time.monotonic() + self.max_delay
+        while dirty is not None and time.monotonic() < deadline:
+            more = self.backend.wait(self.debounce)
+            if more is None:
+                return None
+            if not more:
+                break
+            for project, relpaths in more.items():
+                dirty.setdefault(project, set()).update(relpaths)
+        return dirty
+
+    def _root_changed(self, names: Set[str]) -> bool:
+        """True if a root-level event touched the inventory or a project directory.
+
+        Project directories include those of inventory projects not cloned
+        yet, so a fresh clone is picked up as soon as it appears. Other
+        root-level churn (the index file, this socket, generated summaries)
+        is ignored so a refresh cannot re-trigger itself.
+        """
+        if 'clone_summary.json' in names:
+            return True
+        if any(record['name'] in names for record in self.records):
+            return True
+        return not names.isdisjoint(self.index.inventory_names())
+
+    def _full_refresh(self) -> None:
+        self.records = self.index.refresh()
+        self.refreshed_at = time.time()
+        for record in self.records:
+            self.backend.watch_project(record['name'])
+
+    def _apply(self, dirty: Dict[str, Set[str]]) -> None:
+        self.records = self.index.refresh(dirty)
+        self.refreshed_at = time.time()
+        logger.info(f"Refreshed {', '.join(sorted(dirty))}")
+
+
+def query_daemon(base_path: Path = Path('.'), command: str = 'projects',
+                 timeout: float = 1.0) -> Optional[Dict]:
+    """Send one command to a running watcher; return None if none answers."""
+    address = Path(base_path) / SOCKET_FILENAME
+    if not hasattr(socket, 'AF_UNIX') or not address.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(os.fspath(address))
+            sock.sendall(json.dumps({'command': command}).encode('utf-8') + b'\n')
+            chunks = []
+            while not chunks or not chunks[-1].endswith(b'\n'):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        reply = json.loads(b''.join(chunks))
+    except (OSError, ValueError):
+        return None
+    return reply if reply.get('ok') else None
+
+
+def load_projects(base_path: Path = Path('.'), jobs: Optional[int] = None) -> List[Dict]:
+    """Return project records from the watcher, or refresh the index directly."""
+    base_path = Path(base_path)
+    reply = query_daemon(base_path)
+    if reply is not None:
+        return [dict(record, path=base_path / record['name']) for record in reply['projects']]
+    with WorkspaceIndex(base_path, jobs=jobs) as index:
+        return index.refresh()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Watch the workspace and serve project metadata')
+    parser.add_argument('--base', default='.', help='Workspace root')
+    parser.add_argument('--poll', action='store_true',
+                       help='Use mtime polling even where inotify is available')
+    parser.add_argument('--interval', type=float, default=2.0,
+                       help='Polling interval in seconds')
+    parser.add_argument('--debounce', type=float, default=0.2,
+                       help='Quiet period that ends an event burst, in seconds')
+    parser.add_argument('--jobs', type=int, default=None,
+                       help='Worker processes for project classification (default: CPU count)')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    watcher = WorkspaceWatcher(Path(args.base), poll=args.poll, interval=args.interval,
+                               debounce=args.debounce, jobs=args.jobs)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Watcher stopped")
+
+
+if __name__ == '__main__':
+    main()
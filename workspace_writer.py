@@ -0,0 +1,253 @@
+"""Write generated files only when their rendered content changes.
+
+Generators hand the full rendered text to ``OutputWriter.write``. The
+content is hashed and compared with what is on disk: a cached
+``(size, mtime_ns, digest)`` row answers without reading the file, otherwise
+a file of the same size is re-hashed. Identical output is skipped so mtimes
+and git trees stay untouched; changed output is written to a temporary file
+in the same directory and renamed over the target, so readers never see a
+half-written document.
+
+``BatchWriter`` queues such atomic writes and runs them on a bounded thread
+pool, flushing in batches and recording per-batch throughput. An
+``OutputWriter`` given a ``batch`` hands its changed files to it.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+
+from workspace_index import INDEX_FILENAME
+from workspace_manifest import hash_file
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS output_digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+# Permission bits for newly created files, as open() would apply them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def content_digest(data: bytes) -> str:
+    """BLAKE2b digest of ``data``, comparable with ``hash_file``."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes, fsync: bool = False, mode: Optional[int] = None) -> None:
+    """Replace ``path`` with ``data`` via a temporary file and rename.
+
+    The new file keeps the permissions of the file it replaces unless
+    ``mode`` is given.
+    """
+    path = Path(path)
+    if mode is None:
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class BatchWriter:
+    """Queues atomic file writes and executes them on a bounded thread pool.
+
+    ``submit`` returns immediately; files are on disk once ``flush`` returns.
+    At most ``max_pending`` writes are queued before a batch is flushed
+    automatically. Each flush appends ``{'files', 'bytes', 'seconds'}`` to
+    ``batches``.
+    """
+
+    def __init__(self, jobs: Optional[int] = None, fsync: bool = False, max_pending: int = 512) -> None:
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) * 4)
+        self.fsync = fsync
+        self.max_pending = max_pending
+        self.batches: List[Dict] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = []
+        self._pending_bytes = 0
+        self._started = 0.0
+
+    def __enter__(self) -> 'BatchWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def submit(self, path: Path, data, mode: Optional[int] = None) -> None:
+        """Queue ``data`` (str or bytes) to replace ``path``."""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.jobs)
+        if not self._pending:
+            self._started = time.perf_counter()
+        self._pending.append(self._executor.submit(atomic_write, Path(path), data, self.fsync, mode))
+        self._pending_bytes += len(data)
+        if len(self._pending) >= self.max_pending:
+            self.flush()
+
+    def flush(self) -> Optional[Dict]:
+        """Wait for every queued write; re-raise the first failure."""
+        if not self._pending:
+            return None
+        pending, self._pending = self._pending, []
+        error = None
+        for future in pending:
+            exc = future.exception()
+            if exc is not None and error is None:
+                error = exc
+        batch = {
+            'files': len(pending),
+            'bytes': self._pending_bytes,
+            'seconds': time.perf_counter() - self._started,
+        }
+        self._pending_bytes = 0
+        self.batches.append(batch)
+        if error is not None:
+            raise error
+        return batch
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def summary(self) -> str:
+        files = sum(batch['files'] for batch in self.batches)
+        size = sum(batch['bytes'] for batch in self.batches)
+        seconds = sum(batch['seconds'] for batch in self.batches)
+        rate = files / seconds if seconds else 0.0
+        return (f"{files} files ({size / 1024:.1f} KiB) in {len(self.batches)} batches, "
+                f"{seconds * 1000:.1f} ms, {rate:.0f} files/s")
+
+
+class OutputWriter:
+    """Writes generated documents, skipping those whose content is unchanged.
+
+    Pass ``conn`` to share an open index connection (e.g. a ManifestStore's)
+    instead of opening a second one; the caller then owns closing it. With a
+    ``batch`` writer, changed files are queued on it and only guaranteed to
+    be on disk after ``flush``. With a ``store`` (a workspace_store
+    ContentStore), files are linked to content-addressed blobs instead.
+    """
+
+    def __init__(self, base_path: Path = Path('.'), db_path: Optional[Path] = None,
+                 conn: Optional[sqlite3.Connection] = None, batch: Optional[BatchWriter] = None,
+                 store=None) -> None:
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / INDEX_FILENAME
+        self.owns_conn = conn is None
+        self.conn = sqlite3.connect(str(self.db_path)) if conn is None else conn
+        self.conn.executescript(_SCHEMA)
+        self.batch = batch
+        self.store = store
+        self.written = 0
+        self.skipped = 0
+        self._queued = []
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.commit()
+        if self.owns_conn:
+            self.conn.close()
+
+    def flush(self) -> None:
+        """Wait for queued writes and record the digests of the new files."""
+        if self.batch is None:
+            return
+        queued, self._queued = self._queued, []
+        self.batch.flush()
+        for key, path, digest in queued:
+            self._remember(key, os.stat(path), digest)
+
+    def _on_disk_digest(self, key: str, path: Path, stat: os.stat_result, size: int) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM output_digests WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[:2] == (stat.st_size, stat.st_mtime_ns):
+            return row[2]
+        if stat.st_size != size:
+            return None
+        try:
+            return hash_file(os.fspath(path), stat.st_size)
+        except OSError:
+            return None
+
+    def _remember(self, key: str, stat: os.stat_result, digest: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO output_digests (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, digest),
+        )
+
+    def write(self, path: Path, content: str, mode: Optional[int] = None) -> bool:
+        """Write ``content`` to ``path`` unless it already holds it.
+
+        Returns True if the file was written, False if it was skipped.
+        """
+        path = Path(path)
+        data = content.encode('utf-8')
+        digest = content_digest(data)
+        key = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stat = None
+        unchanged = stat is not None and self._on_disk_digest(key, path, stat, len(data)) == digest
+        if unchanged and (self.store is None or self.store.link_mode != 'hardlink'
+                          or self.store.is_linked(path, digest)):
+            if mode is not None and stat.st_mode & 0o7777 != mode:
+                os.chmod(path, mode)
+            self._remember(key, stat, digest)
+            if self.store is not None:
+                self.store.record(path, digest)
+            self.skipped += 1
+            return False
+
+        if self.store is not None:
+            self.store.write(path, data, digest)
+            self._remember(key, os.stat(path), digest)
+        elif self.batch is not None:
+            self.batch.submit(path, data, mode)
+            self._queued.append((key, path, digest))
+        else:
+            atomic_write(path, data, mode=mode)
+            self._remember(key, os.stat(path), digest)
+        self.written += 1
+        return True
+
+    def summary(self) -> str:
+        return f"wrote {self.written} files, skipped {self.skipped} unchanged"